@@ -1,36 +1,396 @@
-import redis.asyncio as redis
-from typing import Any, Dict, List, Callable, Optional, Set
+import asyncio
+import builtins
+import functools
 import json
 import logging
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+from contextvars import ContextVar
+from typing import Any
+
+import redis.asyncio as redis
+from redis.asyncio.cluster import ClusterNode, RedisCluster
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialBackoff
+from redis.exceptions import ConnectionError
+
+from ...observability.metrics import (
+    REDIS_COMMANDS,
+    REDIS_POOL_TIMEOUTS,
+    REDIS_POOL_WAIT_SECONDS,
+    REDIS_REPLICA_READS,
+)
+from ...observability.tracing import start_span
+from .config import RedisConfig
+from .sharding import HashRing
 
 logger = logging.getLogger(__name__)
 
+# Members copied per ZADD when merging a sorted set from the previous topology
+_MERGE_BATCH_SIZE = 1000
+
+
+def _round_trip(func: Callable) -> Callable:
+    """
+    Count each call of a RedisClient command as one Redis round trip
+    and trace it as a span.
+    """
+    counter = REDIS_COMMANDS.labels(func.__name__)
+    span_name = f"redis.{func.__name__}"
+
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        counter.inc()
+        attributes = {"key": args[0]} if args else {}
+        with start_span(span_name, **attributes):
+            return await func(self, *args, **kwargs)
+
+    return wrapper
+
+
+# Compare-and-delete, so a lock is only released by the holder that took it
+_DELETE_IF_EQUALS = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+# Get a key holding a reference and the key it refers to, named by formatting
+# the reference into ARGV[1]. Only valid where both keys live on one node.
+_GET_REFERENCED = """
+local reference = redis.call("GET", KEYS[1])
+if not reference then
+    return {false, false}
+end
+return {reference, redis.call("GET", string.format(ARGV[1], reference))}
+"""
+
+# Set a value and add a referrer to the set of those keeping it, in one step
+# so it can't be released in between. KEYS[2] shares KEYS[1]'s node.
+_SET_REFERENCED = """
+redis.call("SADD", KEYS[2], ARGV[2])
+return redis.call("SET", KEYS[1], ARGV[1])
+"""
+
+# Add a referrer to the set of those keeping a value
+_ADD_REFERRER = """
+return redis.call("SADD", KEYS[2], ARGV[1])
+"""
+
+# Remove a referrer, and delete the value along with its last one
+_RELEASE_REFERENCED = """
+redis.call("SREM", KEYS[2], ARGV[1])
+if redis.call("SCARD", KEYS[2]) == 0 then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+def _referrers_key(key: str) -> str:
+    """
+    Set of referrers keeping a value; hash-tagged with the value's key, so
+    both live on one node as long as that key has no hash tag of its own.
+    """
+    return f"referrers:{{{key}}}"
+
+
+# When the current task started waiting for a pool slot
+_slot_wait_started: ContextVar[float | None] = ContextVar(
+    "redis_slot_wait_started", default=None
+)
+
+
+class InstrumentedConnectionPool(redis.BlockingConnectionPool):
+    """Blocking connection pool that records how long commands wait for a connection."""
+
+    async def get_connection(self, *args, **kwargs):
+        token = _slot_wait_started.set(time.perf_counter())
+        try:
+            return await super().get_connection(*args, **kwargs)
+        except ConnectionError as e:
+            # Raised from a TimeoutError when no slot frees up within the
+            # pool timeout; connecting can fail with ConnectionError too
+            if isinstance(e.__cause__, TimeoutError):
+                REDIS_POOL_TIMEOUTS.inc()
+                self._observe_wait()
+            raise
+        finally:
+            _slot_wait_started.reset(token)
+
+    async def ensure_connection(self, connection) -> None:
+        # Called once a slot is taken, before connecting if need be
+        self._observe_wait()
+        await super().ensure_connection(connection)
+
+    @staticmethod
+    def _observe_wait() -> None:
+        started = _slot_wait_started.get()
+        if started is not None:
+            REDIS_POOL_WAIT_SECONDS.observe(time.perf_counter() - started)
+            _slot_wait_started.set(None)
+
+    @property
+    def name(self) -> str:
+        return f"{self.connection_kwargs.get('host')}:{self.connection_kwargs.get('port')}"
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "max_connections": self.max_connections,
+            "in_use": len(self._in_use_connections),
+            "idle": len(self._available_connections),
+        }
+
+
+def _cluster_node_stats(node: ClusterNode) -> dict[str, int]:
+    """Pool utilization of a cluster node; redis-py keeps a pool per node."""
+    return {
+        "max_connections": node.max_connections,
+        "in_use": len(node._connections) - len(node._free),
+        "idle": len(node._free),
+    }
+
+
 class RedisClient:
     """
     Simple async Redis client wrapper.
     Provides basic Redis operations without business logic.
     """
 
-    def __init__(self, redis_url: str):
+    def __init__(self, redis_url: str, config: RedisConfig | None = None):
         self.redis_url = redis_url
-        self._redis: Optional[redis.Redis] = None
+        self.config = config or RedisConfig(url=redis_url)
+        # Single node or cluster client; in sharded mode see _shards
+        self._redis: redis.Redis | None = None
+        self._shards: list[redis.Redis] = []
+        self._ring: HashRing | None = None
+        # Topology before a scale-out, read through on misses
+        self._previous: list[redis.Redis] = []
+        self._previous_ring: HashRing | None = None
+        # Sorted sets this worker has already merged from the previous topology
+        self._merged_sorted_sets: set[str] = set()
+        self._pools: list[InstrumentedConnectionPool] = []
+        self._scripts: dict[tuple, Any] = {}
+        # Read replicas, the subset currently fresh enough to read from, and
+        # keys this worker wrote recently mapped to when they may go to replicas
+        self._replicas: dict[str, redis.Redis] = {}
+        self._fresh_replicas: list[redis.Redis] = []
+        self._next_replica = 0
+        self._replicas_checked_at = 0.0
+        self._replica_check: asyncio.Task | None = None
+        self._recent_writes: OrderedDict[str, float] = OrderedDict()
+
+    def _connection_options(self) -> dict[str, Any]:
+        config = self.config
+        options: dict[str, Any] = {
+            "socket_timeout": config.socket_timeout_seconds,
+            "socket_connect_timeout": config.socket_connect_timeout_seconds,
+            "health_check_interval": config.health_check_interval_seconds,
+            "retry": Retry(
+                ExponentialBackoff(
+                    cap=config.retry_backoff_cap_seconds,
+                    base=config.retry_backoff_base_seconds,
+                ),
+                config.retry_attempts,
+            ),
+            "retry_on_error": [ConnectionError],
+            "retry_on_timeout": config.retry_on_timeout,
+            "protocol": 3 if config.resp3 else 2,
+        }
+        if config.password:
+            options["password"] = config.password
+        return options
+
+    def _create_pool(self, url: str | None = None) -> InstrumentedConnectionPool:
+        return InstrumentedConnectionPool.from_url(
+            url or self.redis_url,
+            max_connections=self.config.max_connections,
+            timeout=self.config.pool_timeout_seconds,
+            **self._connection_options(),
+        )
+
+    async def _connect_nodes(self, urls: list[str]) -> list[redis.Redis]:
+        """Connect to several nodes, closing them all if any fails."""
+        pools = [self._create_pool(url) for url in urls]
+        clients = [redis.Redis.from_pool(pool) for pool in pools]
+        results = await asyncio.gather(
+            *(client.ping() for client in clients), return_exceptions=True
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            await asyncio.gather(
+                *(client.aclose() for client in clients), return_exceptions=True
+            )
+            raise errors[0]
+        self._pools.extend(pools)
+        return clients
 
     async def connect(self) -> None:
         """Establish connection to Redis."""
         try:
-            self._redis = redis.from_url(self.redis_url)
-            await self._redis.ping()
-            logger.info("Successfully connected to Redis")
+            self._pools = []
+            if self.config.mode == "sharded":
+                self._shards = await self._connect_nodes(self.config.shard_urls)
+                self._ring = HashRing(self.config.shard_urls)
+            elif self.config.mode == "cluster":
+                client = RedisCluster.from_url(
+                    self.redis_url,
+                    max_connections=self.config.max_connections,
+                    **self._connection_options(),
+                )
+                await client.initialize()
+                self._redis = client
+            else:
+                self._redis = (await self._connect_nodes([self.redis_url]))[0]
+
+            if self.config.previous_urls:
+                self._previous = await self._connect_nodes(self.config.previous_urls)
+                self._previous_ring = HashRing(self.config.previous_urls)
+            if self.config.replica_urls:
+                await self._connect_replicas()
+            self._scripts = {}
+            logger.info(f"Successfully connected to Redis ({self.config.mode})")
         except Exception as e:
             logger.error(f"Failed to connect to Redis: {e}")
             raise
 
+    async def _connect_replicas(self) -> None:
+        """Connect the read replicas; ones that fail are skipped, not fatal."""
+        if self.config.mode != "single":
+            logger.warning(f"Redis read replicas are not used in {self.config.mode} mode")
+            return
+        self._replicas = {}
+        for url in self.config.replica_urls:
+            try:
+                self._replicas[url] = (await self._connect_nodes([url]))[0]
+            except Exception as e:
+                logger.warning(f"Skipping Redis replica {url}: {e}")
+        await self._check_replicas()
+
+    async def _check_replicas(self) -> None:
+        """Keep reading only from replicas whose link to the primary is up and recent."""
+        self._replicas_checked_at = time.monotonic()
+        urls = list(self._replicas)
+        infos = await asyncio.gather(
+            *(self._replicas[url].info("replication") for url in urls),
+            return_exceptions=True,
+        )
+        fresh = []
+        for url, info in zip(urls, infos, strict=True):
+            replica = self._replicas[url]
+            if isinstance(info, BaseException):
+                reason = str(info)
+            elif info.get("master_link_status") != "up":
+                reason = "link to primary is down"
+            elif info.get("master_last_io_seconds_ago", 0) > self.config.replica_max_lag_seconds:
+                reason = f"no contact with primary for {info['master_last_io_seconds_ago']}s"
+            else:
+                fresh.append(replica)
+                continue
+            if replica in self._fresh_replicas:
+                logger.warning(f"Not reading from Redis replica {url}: {reason}")
+        self._fresh_replicas = fresh
+
+    def _replica(self) -> redis.Redis | None:
+        """A fresh replica to read from, round-robin, or None."""
+        if (
+            time.monotonic() - self._replicas_checked_at
+            >= self.config.replica_check_interval_seconds
+            and (self._replica_check is None or self._replica_check.done())
+        ):
+            self._replica_check = asyncio.create_task(self._check_replicas())
+        if not self._fresh_replicas:
+            return None
+        self._next_replica = (self._next_replica + 1) % len(self._fresh_replicas)
+        return self._fresh_replicas[self._next_replica]
+
+    def _drop_replica(self, replica: redis.Redis, error: Exception) -> None:
+        """Stop reading from a failing replica until the next check."""
+        if replica in self._fresh_replicas:
+            self._fresh_replicas.remove(replica)
+            logger.warning(f"Redis replica read failed, using the primary: {error}")
+
+    def _wrote(self, *keys: str) -> None:
+        """Route reads of keys just written to the primary for a while."""
+        if not self._replicas:
+            return
+        now = time.monotonic()
+        for key in keys:
+            self._recent_writes[key] = now + self.config.read_your_writes_seconds
+            self._recent_writes.move_to_end(key)
+        # Entries are in deadline order, so the expired ones are at the front
+        while self._recent_writes and next(iter(self._recent_writes.values())) <= now:
+            self._recent_writes.popitem(last=False)
+
+    def _recently_written(self, key: str) -> bool:
+        deadline = self._recent_writes.get(key)
+        return deadline is not None and deadline > time.monotonic()
+
+    def is_connected(self) -> bool:
+        """Check if connect() has succeeded."""
+        return self._redis is not None or bool(self._shards)
+
+    def pool_stats(self) -> dict[str, Any] | None:
+        """
+        Connection pool utilization summed over nodes, with each node's own
+        under "nodes", or None before connect().
+        """
+        if isinstance(self._redis, RedisCluster):
+            nodes = {
+                node.name: _cluster_node_stats(node) for node in self._redis.get_nodes()
+            }
+        else:
+            nodes = {pool.name: pool.stats() for pool in self._pools}
+        if not nodes:
+            return None
+        stats = list(nodes.values())
+        return {
+            **{name: sum(s[name] for s in stats) for name in stats[0]},
+            "nodes": nodes,
+        }
+
     async def disconnect(self) -> None:
         """Close Redis connection."""
-        if self._redis:
-            await self._redis.close()
+        nodes = [*self._nodes(), *self._previous, *self._replicas.values()]
+        if self._replica_check is not None:
+            self._replica_check.cancel()
+        if nodes:
+            await asyncio.gather(*(node.aclose() for node in nodes), return_exceptions=True)
             logger.info("Redis connection closed")
 
+    def _node(self, key: str) -> redis.Redis:
+        """The client that owns a key."""
+        if self._ring is not None:
+            return self._shards[self._ring.shard_for(key)]
+        return self.redis
+
+    def _nodes(self) -> list[redis.Redis]:
+        if self._shards:
+            return self._shards
+        return [self._redis] if self._redis is not None else []
+
+    def _previous_node(self, key: str) -> redis.Redis | None:
+        """The pre-scale-out owner of a key, if it was a different node."""
+        if self._previous_ring is None:
+            return None
+        previous = self._previous_ring.shard_for(key)
+        current = (
+            self.config.shard_urls[self._ring.shard_for(key)]
+            if self._ring is not None
+            else self.redis_url
+        )
+        if self.config.previous_urls[previous] == current:
+            return None
+        return self._previous[previous]
+
+    def _script(self, node: redis.Redis, script: str) -> Any:
+        cache_key = (id(node), script)
+        if cache_key not in self._scripts:
+            self._scripts[cache_key] = node.register_script(script)
+        return self._scripts[cache_key]
+
     @property
     def redis(self) -> redis.Redis:
         """Get the Redis instance."""
@@ -38,56 +398,431 @@ class RedisClient:
             raise RuntimeError("Redis client not connected. Call connect() first.")
         return self._redis
 
+    async def _read(self, key: str) -> bytes | None:
+        """
+        Read a string key from a replica when allowed, falling back to its
+        owner (and then its previous owner).
+        """
+        result = None
+        if self._replicas:
+            replica = None if self._recently_written(key) else self._replica()
+            if self._recently_written(key):
+                route = "recent_write"
+            elif replica is None:
+                route = "unavailable"
+            else:
+                try:
+                    result = await replica.get(key)
+                except Exception as e:
+                    self._drop_replica(replica, e)
+                route = "replica" if result is not None else "replica_miss"
+            REDIS_REPLICA_READS.labels(route).inc()
+        if result is None:
+            result = await self._node(key).get(key)
+        if result is None and self._previous:
+            result = await self._read_through(key)
+        return result
+
+    async def _read_through(self, key: str) -> bytes | None:
+        """Copy a string key missing from its owner over from its previous owner."""
+        previous = self._previous_node(key)
+        if previous is None:
+            return None
+        value = await previous.get(key)
+        if value is not None:
+            ttl = await previous.pttl(key)
+            await self._node(key).set(key, value, px=ttl if ttl > 0 else None, nx=True)
+            logger.info(f"Moved key {key} from its previous Redis node")
+        return value
+
+    async def _sorted_set_through(self, key: str) -> None:
+        """
+        Merge a sorted set's members over from its previous owner, the first
+        time this worker touches it. Members already on the owner keep their
+        scores, so merging again from another worker changes nothing.
+        """
+        if not self._previous or key in self._merged_sorted_sets:
+            return
+        previous = self._previous_node(key)
+        if previous is None:
+            self._merged_sorted_sets.add(key)
+            return
+        node = self._node(key)
+        batch: dict[Any, float] = {}
+        moved = 0
+        async for member, score in previous.zscan_iter(key, count=_MERGE_BATCH_SIZE):
+            batch[member] = score
+            if len(batch) >= _MERGE_BATCH_SIZE:
+                moved += await node.zadd(key, batch, nx=True)
+                batch = {}
+        if batch:
+            moved += await node.zadd(key, batch, nx=True)
+        self._merged_sorted_sets.add(key)
+        if moved:
+            logger.info(f"Merged {moved} members of {key} from its previous Redis node")
+
+    @_round_trip
     async def ping(self) -> bool:
         """Test Redis connection."""
         try:
-            return await self.redis.ping()
+            nodes = self._nodes() or [self.redis]
+            return all(await asyncio.gather(*(node.ping() for node in nodes)))
         except Exception as e:
             logger.error(f"Redis ping failed: {e}")
             return False
 
     # String operations
-    async def get(self, key: str) -> Optional[str]:
+    @_round_trip
+    async def get(self, key: str) -> str | None:
         """Get string value by key."""
         try:
-            result = await self.redis.get(key)
+            result = await self._read(key)
             return result.decode() if result else None
         except Exception as e:
             logger.error(f"Failed to get key {key}: {e}")
             return None
 
+    @_round_trip
     async def set(
             self,
             key: str,
             value: str,
-            expire_seconds: Optional[int] = None
+            expire_seconds: int | None = None
     ) -> bool:
         """Set key-value pair with optional expiration."""
         try:
-            return await self.redis.set(key, value, ex=expire_seconds)
+            self._wrote(key)
+            return await self._node(key).set(key, value, ex=expire_seconds)
         except Exception as e:
             logger.error(f"Failed to set key {key}: {e}")
             return False
 
-    async def delete(self, key: str) -> bool:
-        """Delete key."""
+    @_round_trip
+    async def set_if_absent(self, key: str, value: str, expire_seconds: int) -> bool:
+        """Set a key only if it doesn't exist yet, e.g. to take a lock."""
         try:
-            result = await self.redis.delete(key)
-            return result > 0
+            self._wrote(key)
+            return bool(await self._node(key).set(key, value, ex=expire_seconds, nx=True))
+        except Exception as e:
+            logger.error(f"Failed to set key {key}: {e}")
+            return False
+
+    @_round_trip
+    async def delete_if_equals(self, key: str, value: str) -> bool:
+        """Delete a key only if it still holds value, e.g. to release a lock."""
+        try:
+            self._wrote(key)
+            return bool(await self._node(key).eval(_DELETE_IF_EQUALS, 1, key, value))
         except Exception as e:
             logger.error(f"Failed to delete key {key}: {e}")
             return False
 
+    @_round_trip
+    async def run_script(self, key: str, script: str, *args: Any) -> Any:
+        """
+        Run a single-key Lua script atomically. Scripts are sent once and
+        then called by SHA.
+        """
+        try:
+            self._wrote(key)
+            return await self._script(self._node(key), script)(keys=[key], args=args)
+        except Exception as e:
+            logger.error(f"Failed to run script on key {key}: {e}")
+            return None
+
+    async def _run_scripts(
+            self, script: str, calls: list[tuple[list[str], list[Any]]]
+    ) -> list[Any]:
+        """
+        Run a Lua script once per (keys, args), pipelined per node; in a
+        cluster, where pipelines can't load scripts, concurrently.
+        """
+        if isinstance(self._redis, RedisCluster):
+            return list(
+                await asyncio.gather(
+                    *(
+                        self._script(self.redis, script)(keys=keys, args=args)
+                        for keys, args in calls
+                    )
+                )
+            )
+
+        groups: dict[int, list[int]] = {}
+        for i, (keys, _) in enumerate(calls):
+            shard = self._ring.shard_for(keys[0]) if self._ring is not None else 0
+            groups.setdefault(shard, []).append(i)
+
+        async def run(shard: int, positions: list[int]) -> list[Any]:
+            node = self._shards[shard] if self._ring is not None else self.redis
+            pipe = node.pipeline(transaction=False)
+            for i in positions:
+                keys, args = calls[i]
+                await self._script(node, script)(keys=keys, args=args, client=pipe)
+            return await pipe.execute()
+
+        results: list[Any] = [None] * len(calls)
+        outputs = await asyncio.gather(
+            *(run(shard, positions) for shard, positions in groups.items())
+        )
+        for positions, output in zip(groups.values(), outputs, strict=True):
+            for i, result in zip(positions, output, strict=True):
+                results[i] = result
+        return results
+
+    @_round_trip
+    async def set_referenced(
+            self, mapping: dict[str, bytes | str], referrer: str
+    ) -> bool:
+        """
+        Set several values kept for as long as any of their referrers is,
+        adding referrer to each; see release_referenced. Keys must not have
+        a hash tag.
+        """
+        try:
+            self._wrote(*mapping)
+            results = await self._run_scripts(
+                _SET_REFERENCED,
+                [
+                    ([key, _referrers_key(key)], [value, referrer])
+                    for key, value in mapping.items()
+                ],
+            )
+            return all(results)
+        except Exception as e:
+            logger.error(f"Failed to set keys {list(mapping)}: {e}")
+            return False
+
+    @_round_trip
+    async def add_referrer(self, keys: list[str], referrer: str) -> bool:
+        """Add a referrer to values stored before their referrers were kept."""
+        try:
+            await self._run_scripts(
+                _ADD_REFERRER,
+                [([key, _referrers_key(key)], [referrer]) for key in keys],
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Failed to add referrer {referrer} to {keys}: {e}")
+            return False
+
+    @_round_trip
+    async def release_referenced(self, keys: list[str], referrer: str) -> int:
+        """
+        Remove a referrer from several values set with set_referenced, and
+        delete those it was the last referrer of.
+
+        Returns:
+            How many values were deleted
+        """
+        try:
+            self._wrote(*keys)
+            results = await self._run_scripts(
+                _RELEASE_REFERENCED,
+                [([key, _referrers_key(key)], [referrer]) for key in keys],
+            )
+            return sum(results)
+        except Exception as e:
+            logger.error(f"Failed to release {keys} from {referrer}: {e}")
+            return 0
+
+    @_round_trip
+    async def get_referenced(
+            self, key: str, target_format: str
+    ) -> tuple[bytes | None, bytes | None]:
+        """
+        Get a key holding a reference, and the key it refers to, named
+        target_format % reference. On a plain single node this is one round
+        trip (a Lua script); with shards, a cluster, replicas or a previous
+        topology the two keys may be on different nodes, so it takes two.
+        """
+        try:
+            if (
+                self._ring is None
+                and not isinstance(self._redis, RedisCluster)
+                and not self._replicas
+                and not self._previous
+            ):
+                reference, value = await self._script(self.redis, _GET_REFERENCED)(
+                    keys=[key], args=[target_format]
+                )
+                return reference, value
+            reference = await self._read(key)
+            if reference is None:
+                return None, None
+            return reference, await self._read(target_format % reference.decode())
+        except Exception as e:
+            logger.error(f"Failed to get key {key} and its reference: {e}")
+            return None, None
+
+    @_round_trip
+    async def get_bytes(self, key: str) -> bytes | None:
+        """Get raw value by key, without decoding."""
+        try:
+            return await self._read(key)
+        except Exception as e:
+            logger.error(f"Failed to get key {key}: {e}")
+            return None
+
+    @_round_trip
+    async def set_bytes(
+            self,
+            key: str,
+            value: bytes,
+            expire_seconds: int | None = None
+    ) -> bool:
+        """Set raw value with optional expiration."""
+        try:
+            self._wrote(key)
+            return await self._node(key).set(key, value, ex=expire_seconds)
+        except Exception as e:
+            logger.error(f"Failed to set key {key}: {e}")
+            return False
+
+    @_round_trip
+    async def mget_bytes(self, *keys: str) -> list[bytes | None]:
+        """Get raw values of several keys in one round trip."""
+        try:
+            values = (
+                await self._replica_mget(list(keys))
+                if self._replicas
+                else await self._mget(list(keys))
+            )
+            if self._previous:
+                missing = [i for i, value in enumerate(values) if value is None]
+                moved = await asyncio.gather(
+                    *(self._read_through(keys[i]) for i in missing)
+                )
+                for i, value in zip(missing, moved, strict=True):
+                    values[i] = value
+            return values
+        except Exception as e:
+            logger.error(f"Failed to get keys {keys}: {e}")
+            return [None] * len(keys)
+
+    async def _replica_mget(self, keys: list[str]) -> list[bytes | None]:
+        """
+        MGET from a replica, then the keys it missed or that were recently
+        written from the primary: one round trip when everything hits.
+        """
+        values: list[bytes | None] = [None] * len(keys)
+        on_replica = [i for i, key in enumerate(keys) if not self._recently_written(key)]
+        recent = len(keys) - len(on_replica)
+        replica = self._replica() if on_replica else None
+        if replica is not None:
+            try:
+                result = await replica.mget([keys[i] for i in on_replica])
+                for i, value in zip(on_replica, result, strict=True):
+                    values[i] = value
+            except Exception as e:
+                self._drop_replica(replica, e)
+
+        hits = sum(1 for value in values if value is not None)
+        REDIS_REPLICA_READS.labels("recent_write").inc(recent)
+        if replica is None:
+            REDIS_REPLICA_READS.labels("unavailable").inc(len(on_replica))
+        else:
+            REDIS_REPLICA_READS.labels("replica").inc(hits)
+            REDIS_REPLICA_READS.labels("replica_miss").inc(len(on_replica) - hits)
+
+        on_primary = [i for i, value in enumerate(values) if value is None]
+        if on_primary:
+            result = await self._mget([keys[i] for i in on_primary])
+            for i, value in zip(on_primary, result, strict=True):
+                values[i] = value
+        return values
+
+    async def _mget(self, keys: list[str]) -> list[bytes | None]:
+        if self._ring is not None:
+            groups: dict[int, list[int]] = {}
+            for i, key in enumerate(keys):
+                groups.setdefault(self._ring.shard_for(key), []).append(i)
+            values: list[bytes | None] = [None] * len(keys)
+            results = await asyncio.gather(
+                *(
+                    self._shards[shard].mget([keys[i] for i in positions])
+                    for shard, positions in groups.items()
+                )
+            )
+            for positions, result in zip(groups.values(), results, strict=True):
+                for i, value in zip(positions, result, strict=True):
+                    values[i] = value
+            return values
+        if isinstance(self.redis, RedisCluster):
+            # Split by slot; keys sharing a hash tag still go in one MGET
+            return await self.redis.mget_nonatomic(keys)
+        return list(await self.redis.mget(keys))
+
+    @_round_trip
+    async def mset_bytes(
+            self,
+            mapping: dict[str, bytes | str],
+            expire_seconds: int | None = None
+    ) -> bool:
+        """
+        Set several raw values in one round trip, with optional expiration
+        (MSET can't expire keys, so expiring values are pipelined SETs).
+        """
+        try:
+            self._wrote(*mapping)
+            if self._ring is not None:
+                groups: dict[int, dict[str, Any]] = {}
+                for key, value in mapping.items():
+                    groups.setdefault(self._ring.shard_for(key), {})[key] = value
+                results = await asyncio.gather(
+                    *(
+                        self._set_all(self._shards[i], group, expire_seconds)
+                        for i, group in groups.items()
+                    )
+                )
+                return all(results)
+            if isinstance(self.redis, RedisCluster) and expire_seconds is None:
+                return all(await self.redis.mset_nonatomic(mapping))
+            return await self._set_all(self.redis, mapping, expire_seconds)
+        except Exception as e:
+            logger.error(f"Failed to set keys {list(mapping)}: {e}")
+            return False
+
+    @staticmethod
+    async def _set_all(
+            node: Any, mapping: dict[str, Any], expire_seconds: int | None
+    ) -> bool:
+        if expire_seconds is None:
+            return await node.mset(mapping)
+        pipe = node.pipeline(transaction=False)
+        for key, value in mapping.items():
+            pipe.set(key, value, ex=expire_seconds)
+        return all(await pipe.execute())
+
+    @_round_trip
+    async def delete(self, *keys: str) -> bool:
+        """Delete keys; True if any of them existed."""
+        try:
+            self._wrote(*keys)
+            if self._ring is not None:
+                groups: dict[int, list[str]] = {}
+                for key in keys:
+                    groups.setdefault(self._ring.shard_for(key), []).append(key)
+                results = await asyncio.gather(
+                    *(self._shards[i].delete(*group) for i, group in groups.items())
+                )
+                return sum(results) > 0
+            result = await self.redis.delete(*keys)
+            return result > 0
+        except Exception as e:
+            logger.error(f"Failed to delete {', '.join(keys)}: {e}")
+            return False
+
+    @_round_trip
     async def exists(self, key: str) -> bool:
         """Check if key exists."""
         try:
-            return await self.redis.exists(key) > 0
+            return await self._node(key).exists(key) > 0
         except Exception as e:
             logger.error(f"Failed to check existence of key {key}: {e}")
             return False
 
     # JSON operations (convenience methods)
-    async def get_json(self, key: str) -> Optional[Dict]:
+    async def get_json(self, key: str) -> dict | None:
         """Get JSON value by key."""
         try:
             value = await self.get(key)
@@ -101,8 +836,8 @@ class RedisClient:
     async def set_json(
             self,
             key: str,
-            value: Dict,
-            expire_seconds: Optional[int] = None
+            value: dict,
+            expire_seconds: int | None = None
     ) -> bool:
         """Set JSON value with optional expiration."""
         try:
@@ -113,61 +848,68 @@ class RedisClient:
             return False
 
     # List operations
-    async def lpush(self, key: str, *values: str) -> Optional[int]:
+    @_round_trip
+    async def lpush(self, key: str, *values: str) -> int | None:
         """Push values to the left of a list."""
         try:
-            return await self.redis.lpush(key, *values)
+            return await self._node(key).lpush(key, *values)
         except Exception as e:
             logger.error(f"Failed to lpush to key {key}: {e}")
             return None
 
-    async def rpush(self, key: str, *values: str) -> Optional[int]:
+    @_round_trip
+    async def rpush(self, key: str, *values: str) -> int | None:
         """Push values to the right of a list."""
         try:
-            return await self.redis.rpush(key, *values)
+            return await self._node(key).rpush(key, *values)
         except Exception as e:
             logger.error(f"Failed to rpush to key {key}: {e}")
             return None
 
-    async def lrange(self, key: str, start: int = 0, end: int = -1) -> List[str]:
+    @_round_trip
+    async def lrange(self, key: str, start: int = 0, end: int = -1) -> list[str]:
         """Get list elements in range."""
         try:
-            result = await self.redis.lrange(key, start, end)
+            result = await self._node(key).lrange(key, start, end)
             return [item.decode() if isinstance(item, bytes) else item for item in result]
         except Exception as e:
             logger.error(f"Failed to lrange key {key}: {e}")
             return []
 
+    @_round_trip
     async def llen(self, key: str) -> int:
         """Get list length."""
         try:
-            return await self.redis.llen(key)
+            return await self._node(key).llen(key)
         except Exception as e:
             logger.error(f"Failed to get length of key {key}: {e}")
             return 0
 
     # Hash operations
-    async def hget(self, key: str, field: str) -> Optional[str]:
+    @_round_trip
+    async def hget(self, key: str, field: str) -> str | None:
         """Get hash field value."""
         try:
-            result = await self.redis.hget(key, field)
+            result = await self._node(key).hget(key, field)
             return result.decode() if result else None
         except Exception as e:
             logger.error(f"Failed to hget {field} from key {key}: {e}")
             return None
 
+    @_round_trip
     async def hset(self, key: str, field: str, value: str) -> bool:
         """Set hash field value."""
         try:
-            return await self.redis.hset(key, field, value) >= 0
+            return await self._node(key).hset(key, field, value) >= 0
         except Exception as e:
             logger.error(f"Failed to hset {field} in key {key}: {e}")
             return False
 
-    async def hgetall(self, key: str) -> Dict[str, str]:
+    @_round_trip
+    async def hgetall(self, key: str) -> dict[str, str]:
         """Get all hash fields and values."""
         try:
-            result = await self.redis.hgetall(key)
+            result = await self._node(key).hgetall(key)
             return {
                 k.decode() if isinstance(k, bytes) else k:
                     v.decode() if isinstance(v, bytes) else v
@@ -177,62 +919,156 @@ class RedisClient:
             logger.error(f"Failed to hgetall for key {key}: {e}")
             return {}
 
+    @_round_trip
     async def hdel(self, key: str, *fields: str) -> int:
         """Delete hash fields."""
         try:
-            return await self.redis.hdel(key, *fields)
+            return await self._node(key).hdel(key, *fields)
         except Exception as e:
             logger.error(f"Failed to hdel fields from key {key}: {e}")
             return 0
 
     # Set operations
+    @_round_trip
     async def sadd(self, key: str, *members: str) -> int:
         """Add members to a set."""
         try:
-            return await self.redis.sadd(key, *members)
+            return await self._node(key).sadd(key, *members)
         except Exception as e:
             logger.error(f"Failed to sadd to key {key}: {e}")
             return 0
 
-    async def smembers(self, key: str) -> Set[str]:
+    @_round_trip
+    async def smembers(self, key: str) -> builtins.set[str]:
         """Get all set members."""
         try:
-            result = await self.redis.smembers(key)
+            result = await self._node(key).smembers(key)
             return {item.decode() if isinstance(item, bytes) else item for item in result}
         except Exception as e:
             logger.error(f"Failed to smembers for key {key}: {e}")
             return set()
 
+    @_round_trip
     async def srem(self, key: str, *members: str) -> int:
         """Remove members from a set."""
         try:
-            return await self.redis.srem(key, *members)
+            return await self._node(key).srem(key, *members)
         except Exception as e:
             logger.error(f"Failed to srem from key {key}: {e}")
             return 0
 
+    # Sorted set operations
+    @_round_trip
+    async def zadd(self, key: str, mapping: dict[str, float], nx: bool = False) -> int:
+        """Add members with scores to a sorted set; with nx, only new members."""
+        try:
+            await self._sorted_set_through(key)
+            return await self._node(key).zadd(key, mapping, nx=nx)
+        except Exception as e:
+            logger.error(f"Failed to zadd to key {key}: {e}")
+            return 0
+
+    @_round_trip
+    async def zmscore(self, key: str, *members: str) -> list[float | None]:
+        """Get the scores of several sorted set members in one call."""
+        try:
+            await self._sorted_set_through(key)
+            return await self._node(key).zmscore(key, list(members))
+        except Exception as e:
+            logger.error(f"Failed to zmscore from key {key}: {e}")
+            return [None] * len(members)
+
+    @_round_trip
+    async def zrangebyscore(
+            self,
+            key: str,
+            min_score: float | str,
+            max_score: float | str,
+            limit: int | None = None
+    ) -> list[str]:
+        """Get sorted set members with scores in range, lowest first."""
+        try:
+            await self._sorted_set_through(key)
+            paging = {"start": 0, "num": limit} if limit is not None else {}
+            result = await self._node(key).zrangebyscore(
+                key, min_score, max_score, **paging
+            )
+            return [item.decode() if isinstance(item, bytes) else item for item in result]
+        except Exception as e:
+            logger.error(f"Failed to zrangebyscore for key {key}: {e}")
+            return []
+
+    @_round_trip
+    async def zrem(self, key: str, *members: str) -> int:
+        """Remove members from a sorted set."""
+        try:
+            await self._sorted_set_through(key)
+            return await self._node(key).zrem(key, *members)
+        except Exception as e:
+            logger.error(f"Failed to zrem from key {key}: {e}")
+            return 0
+
+    @_round_trip
+    async def zremrangebyscore(
+            self, key: str, min_score: float | str, max_score: float | str
+    ) -> int:
+        """Remove sorted set members with scores in range."""
+        try:
+            await self._sorted_set_through(key)
+            return await self._node(key).zremrangebyscore(key, min_score, max_score)
+        except Exception as e:
+            logger.error(f"Failed to zremrangebyscore for key {key}: {e}")
+            return 0
+
     # Utility operations
-    async def increment(self, key: str, amount: int = 1) -> Optional[int]:
+    @_round_trip
+    async def increment(self, key: str, amount: int = 1) -> int | None:
         """Increment a counter."""
         try:
-            return await self.redis.incrby(key, amount)
+            self._wrote(key)
+            return await self._node(key).incrby(key, amount)
         except Exception as e:
             logger.error(f"Failed to increment key {key}: {e}")
             return None
 
+    @_round_trip
     async def expire(self, key: str, seconds: int) -> bool:
         """Set expiration on existing key."""
         try:
-            return await self.redis.expire(key, seconds)
+            return await self._node(key).expire(key, seconds)
         except Exception as e:
             logger.error(f"Failed to set expiration on key {key}: {e}")
             return False
 
-    async def keys(self, pattern: str = "*") -> List[str]:
+    async def scan(self, pattern: str = "*", count: int = 1000) -> AsyncIterator[str]:
+        """
+        Iterate over keys matching pattern with SCAN on every node (every
+        primary in a cluster), a batch of about count keys per call, without
+        blocking Redis the way KEYS does.
+        """
+        try:
+            for node in self._nodes() or [self.redis]:
+                async for key in node.scan_iter(match=pattern, count=count):
+                    yield key.decode() if isinstance(key, bytes) else key
+        except Exception as e:
+            logger.error(f"Failed to scan keys with pattern {pattern}: {e}")
+
+    @_round_trip
+    async def keys(self, pattern: str = "*") -> list[str]:
         """Get keys matching pattern."""
         try:
-            keys = await self.redis.keys(pattern)
+            if isinstance(self._redis, RedisCluster):
+                result = await self.redis.keys(pattern, target_nodes=RedisCluster.PRIMARIES)
+                keys = (
+                    [key for node_keys in result.values() for key in node_keys]
+                    if isinstance(result, dict)
+                    else result
+                )
+            else:
+                nodes = self._nodes() or [self.redis]
+                results = await asyncio.gather(*(node.keys(pattern) for node in nodes))
+                keys = [key for node_keys in results for key in node_keys]
             return [key.decode() if isinstance(key, bytes) else key for key in keys]
         except Exception as e:
             logger.error(f"Failed to get keys with pattern {pattern}: {e}")
-            return []
\ No newline at end of file
+            return []
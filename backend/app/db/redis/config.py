@@ -3,27 +3,103 @@ import os
 from pydantic import BaseModel
 
 
+def _url_list(value: str) -> list[str]:
+    return [url.strip() for url in value.split(",") if url.strip()]
+
+
 class RedisConfig(BaseModel):
     """Redis connection configuration."""
 
     url: str = "redis://localhost:6379/0"
+    # "single", "cluster" (Redis Cluster at url) or "sharded" (client-side
+    # consistent hashing over shard_urls)
+    mode: str = "single"
+    shard_urls: list[str] = []
+    # Nodes before a scale-out (a single URL, or the old shard list): string
+    # keys missing from their new owner are read through from here and copied
+    # over, and sorted sets (negative caches, playlist read times) are merged
+    # in on first use. Rate limit buckets are not moved: clients whose bucket
+    # changes node start from a full one.
+    previous_urls: list[str] = []
+    # Read replicas of the primary at url, single mode only: with shards or a
+    # cluster they are ignored. String reads go to a replica unless it lags,
+    # or this worker wrote the key recently, or the replica misses; then they
+    # fall back to the primary.
+    replica_urls: list[str] = []
+    # Replicas whose link to the primary is down or has been silent for longer
+    # than this are skipped (the primary pings replicas every 10s by default)
+    replica_max_lag_seconds: float = 15.0
+    replica_check_interval_seconds: float = 5.0
+    # Keys written by this worker are read from the primary for this long.
+    # Tracked in process, so other workers may read the old value from a
+    # replica until it catches up (bounded by replica_max_lag_seconds).
+    read_your_writes_seconds: float = 2.0
     host: str = "localhost"
     port: int = 6379
     db: int = 0
     password: str | None = None
 
-    # Connection settings
-    max_connections: int = 10
+    # Connection pool; commands wait up to pool_timeout for a free connection
+    max_connections: int = 50
+    pool_timeout_seconds: float = 5.0
+    socket_timeout_seconds: float = 5.0
+    socket_connect_timeout_seconds: float = 2.0
+    # PING idle connections before reuse if unused for this long (0 = never)
+    health_check_interval_seconds: int = 30
+
+    # Retries of commands failing on connection errors, with exponential backoff
     retry_on_timeout: bool = True
+    retry_attempts: int = 3
+    retry_backoff_base_seconds: float = 0.05
+    retry_backoff_cap_seconds: float = 1.0
+
+    # Use the RESP3 protocol (Redis 6+)
+    resp3: bool = False
 
     @classmethod
     def from_env(cls) -> "RedisConfig":
         """Create configuration from environment variables."""
+        host = os.getenv("REDIS_HOST", "localhost")
+        port = int(os.getenv("REDIS_PORT", "6379"))
+        db = int(os.getenv("REDIS_DB", "0"))
         return cls(
-            url=os.getenv("REDIS_URL", "redis://localhost:6379/0"),
-            host=os.getenv("REDIS_HOST", "localhost"),
-            port=int(os.getenv("REDIS_PORT", "6379")),
-            db=int(os.getenv("REDIS_DB", "0")),
-            password=os.getenv("REDIS_PASSWORD"),
-            max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "10")),
+            url=os.getenv("REDIS_URL") or f"redis://{host}:{port}/{db}",
+            mode=os.getenv("REDIS_MODE", "single").lower(),
+            shard_urls=_url_list(os.getenv("REDIS_SHARD_URLS", "")),
+            previous_urls=_url_list(os.getenv("REDIS_PREVIOUS_URLS", "")),
+            replica_urls=_url_list(os.getenv("REDIS_REPLICA_URLS", "")),
+            replica_max_lag_seconds=float(
+                os.getenv("REDIS_REPLICA_MAX_LAG_SECONDS", "15.0")
+            ),
+            replica_check_interval_seconds=float(
+                os.getenv("REDIS_REPLICA_CHECK_INTERVAL_SECONDS", "5.0")
+            ),
+            read_your_writes_seconds=float(
+                os.getenv("REDIS_READ_YOUR_WRITES_SECONDS", "2.0")
+            ),
+            host=host,
+            port=port,
+            db=db,
+            password=os.getenv("REDIS_PASSWORD") or None,
+            max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "50")),
+            pool_timeout_seconds=float(os.getenv("REDIS_POOL_TIMEOUT_SECONDS", "5.0")),
+            socket_timeout_seconds=float(
+                os.getenv("REDIS_SOCKET_TIMEOUT_SECONDS", "5.0")
+            ),
+            socket_connect_timeout_seconds=float(
+                os.getenv("REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS", "2.0")
+            ),
+            health_check_interval_seconds=int(
+                os.getenv("REDIS_HEALTH_CHECK_INTERVAL_SECONDS", "30")
+            ),
+            retry_on_timeout=os.getenv("REDIS_RETRY_ON_TIMEOUT", "true").lower()
+            in ("1", "true", "yes"),
+            retry_attempts=int(os.getenv("REDIS_RETRY_ATTEMPTS", "3")),
+            retry_backoff_base_seconds=float(
+                os.getenv("REDIS_RETRY_BACKOFF_BASE_SECONDS", "0.05")
+            ),
+            retry_backoff_cap_seconds=float(
+                os.getenv("REDIS_RETRY_BACKOFF_CAP_SECONDS", "1.0")
+            ),
+            resp3=os.getenv("REDIS_RESP3", "false").lower() in ("1", "true", "yes"),
         )
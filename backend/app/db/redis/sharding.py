@@ -0,0 +1,47 @@
+import bisect
+import hashlib
+
+# Points per shard on the ring; more points spread keys more evenly
+VIRTUAL_NODES = 160
+
+
+def hash_tag(key: str) -> str:
+    """
+    The part of a key that decides its placement, following Redis Cluster
+    rules: the content of the first non-empty {...}, or else the whole key.
+    Keys sharing a tag live on the same shard (or cluster slot).
+    """
+    start = key.find("{")
+    if start != -1:
+        end = key.find("}", start + 1)
+        if end > start + 1:
+            return key[start + 1 : end]
+    return key
+
+
+def _point(value: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(value.encode(), digest_size=8).digest(), "big"
+    )
+
+
+class HashRing:
+    """
+    Consistent hashing of keys onto shards, identified by name (their URL),
+    so adding a shard only moves the keys that land on its points.
+    """
+
+    def __init__(self, shards: list[str]):
+        self.shards = list(shards)
+        points = sorted(
+            (_point(f"{shard}#{i}"), index)
+            for index, shard in enumerate(self.shards)
+            for i in range(VIRTUAL_NODES)
+        )
+        self._points = [point for point, _ in points]
+        self._owners = [index for _, index in points]
+
+    def shard_for(self, key: str) -> int:
+        """Index of the shard that owns a key."""
+        i = bisect.bisect(self._points, _point(hash_tag(key))) % len(self._points)
+        return self._owners[i]
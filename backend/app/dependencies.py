@@ -2,12 +2,30 @@ import logging
 from functools import lru_cache
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, Request
 
 from .db.redis import RedisClient, RedisConfig
 from .integrations.reccobeats import ReccoBeatsClient, ReccoBeatsConfig
-from .integrations.spotify import SpotifyClient, SpotifyConfig
-from .playlists import PlaylistRepo, PlaylistService
+from .integrations.spotify import RedisTokenStore, SpotifyClient, SpotifyConfig
+from .lifecycle import HealthConfig, HealthMonitor, StartupConfig
+from .observability.config import TracingConfig
+from .observability.metrics import (
+    HedgeStatsCollector,
+    RedisPoolStatsCollector,
+    register_collector,
+)
+from .playlists import (
+    AdmissionConfig,
+    AdmissionController,
+    ArchiveConfig,
+    CacheConfig,
+    EntityCache,
+    NegativeCache,
+    PlaylistArchive,
+    PlaylistRepo,
+    PlaylistService,
+)
+from .ratelimit import ClientRateLimit, RateLimitConfig, RateLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -15,9 +33,22 @@ logger = logging.getLogger(__name__)
 _redis_config = None
 _spotify_config = None
 _reccobeats_config = None
+_cache_config = None
+_admission_config = None
+_archive_config = None
+_tracing_config = None
+_startup_config = None
+_health_config = None
+_rate_limit_config = None
 _redis_client = None
 _spotify_client = None
 _reccobeats_client = None
+_negative_cache = None
+_entity_cache = None
+_playlist_archive = None
+_health_monitor = None
+_admission_controller = None
+_rate_limiter = None
 
 # Configuration dependencies
 def get_redis_config() -> RedisConfig:
@@ -44,6 +75,62 @@ def get_reccobeats_config() -> ReccoBeatsConfig:
     return _reccobeats_config
 
 
+def get_cache_config() -> CacheConfig:
+    """Get playlist cache configuration."""
+    global _cache_config
+    if _cache_config is None:
+        _cache_config = CacheConfig.from_env()
+    return _cache_config
+
+
+def get_admission_config() -> AdmissionConfig:
+    """Get generation admission control configuration."""
+    global _admission_config
+    if _admission_config is None:
+        _admission_config = AdmissionConfig.from_env()
+    return _admission_config
+
+
+def get_archive_config() -> ArchiveConfig:
+    """Get playlist archive configuration."""
+    global _archive_config
+    if _archive_config is None:
+        _archive_config = ArchiveConfig.from_env()
+    return _archive_config
+
+
+def get_rate_limit_config() -> RateLimitConfig:
+    """Get rate limiting configuration."""
+    global _rate_limit_config
+    if _rate_limit_config is None:
+        _rate_limit_config = RateLimitConfig.from_env()
+    return _rate_limit_config
+
+
+def get_tracing_config() -> TracingConfig:
+    """Get tracing configuration."""
+    global _tracing_config
+    if _tracing_config is None:
+        _tracing_config = TracingConfig.from_env()
+    return _tracing_config
+
+
+def get_startup_config() -> StartupConfig:
+    """Get application startup configuration."""
+    global _startup_config
+    if _startup_config is None:
+        _startup_config = StartupConfig.from_env()
+    return _startup_config
+
+
+def get_health_config() -> HealthConfig:
+    """Get health probe configuration."""
+    global _health_config
+    if _health_config is None:
+        _health_config = HealthConfig.from_env()
+    return _health_config
+
+
 # Client dependencies
 def get_redis_client(
         config: Annotated[RedisConfig, Depends(get_redis_config)],
@@ -51,17 +138,20 @@ def get_redis_client(
     """Get Redis client instance."""
     global _redis_client
     if _redis_client is None:
-        _redis_client = RedisClient(config.url)
+        _redis_client = RedisClient(config.url, config)
+        register_collector(RedisPoolStatsCollector(_redis_client.pool_stats))
     return _redis_client
 
 
 def get_spotify_client(
         config: Annotated[SpotifyConfig, Depends(get_spotify_config)],
+        redis_client: Annotated[RedisClient, Depends(get_redis_client)],
 ) -> SpotifyClient:
     """Get Spotify client instance."""
     global _spotify_client
     if _spotify_client is None:
-        _spotify_client = SpotifyClient(config)
+        token_store = RedisTokenStore(redis_client) if config.shared_token else None
+        _spotify_client = SpotifyClient(config, token_store)
     return _spotify_client
 
 
@@ -72,15 +162,110 @@ def get_reccobeats_client(
     global _reccobeats_client
     if _reccobeats_client is None:
         _reccobeats_client = ReccoBeatsClient(config)
+        register_collector(HedgeStatsCollector(_reccobeats_client.hedge_stats))
     return _reccobeats_client
 
 
+def get_negative_cache(
+        config: Annotated[CacheConfig, Depends(get_cache_config)],
+) -> NegativeCache:
+    """Get the process-wide negative result cache."""
+    global _negative_cache
+    if _negative_cache is None:
+        _negative_cache = NegativeCache(config)
+    return _negative_cache
+
+
+def get_entity_cache(
+        config: Annotated[CacheConfig, Depends(get_cache_config)],
+) -> EntityCache:
+    """Get the process-wide track and album entity cache."""
+    global _entity_cache
+    if _entity_cache is None:
+        _entity_cache = EntityCache(config.entity_cache_size)
+    return _entity_cache
+
+
+def get_playlist_archive(
+        config: Annotated[ArchiveConfig, Depends(get_archive_config)],
+) -> PlaylistArchive | None:
+    """Get the on-disk playlist archive, or None if archiving is disabled."""
+    global _playlist_archive
+    if _playlist_archive is None and config.enabled:
+        _playlist_archive = PlaylistArchive(config)
+    return _playlist_archive
+
+
+def get_health_monitor(
+        config: Annotated[HealthConfig, Depends(get_health_config)],
+) -> HealthMonitor:
+    """Get the process-wide health monitor."""
+    global _health_monitor
+    if _health_monitor is None:
+        _health_monitor = HealthMonitor(config)
+    return _health_monitor
+
+
+def get_admission_controller(
+        config: Annotated[AdmissionConfig, Depends(get_admission_config)],
+) -> AdmissionController:
+    """Get the per-worker generation admission controller."""
+    global _admission_controller
+    if _admission_controller is None:
+        _admission_controller = AdmissionController(config)
+    return _admission_controller
+
+
+def get_rate_limiter(
+        config: Annotated[RateLimitConfig, Depends(get_rate_limit_config)],
+        redis_client: Annotated[RedisClient, Depends(get_redis_client)],
+) -> RateLimiter:
+    """Get the rate limiter instance."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter(config, redis_client)
+    return _rate_limiter
+
+
+# Rate limit dependencies (charge the base cost of a request up front)
+async def limit_generate(
+        request: Request,
+        limiter: Annotated[RateLimiter, Depends(get_rate_limiter)],
+) -> ClientRateLimit:
+    """Charge a generation request as a cache hit; cold generations pay extra later."""
+    rate_limit = limiter.for_client("generate", request)
+    await rate_limit.charge_cache_hits(1)
+    return rate_limit
+
+
+async def limit_generate_batch(
+        request: Request,
+        limiter: Annotated[RateLimiter, Depends(get_rate_limiter)],
+) -> ClientRateLimit:
+    """Bind the batch limit; a batch is charged once its cached playlists are known."""
+    return limiter.for_client("batch", request)
+
+
+async def limit_read(
+        request: Request,
+        limiter: Annotated[RateLimiter, Depends(get_rate_limiter)],
+) -> ClientRateLimit:
+    """Charge a read request."""
+    rate_limit = limiter.for_client("read", request)
+    await rate_limit.charge(1)
+    return rate_limit
+
+
 # Repository dependencies
 def get_playlist_repo(
         redis_client: Annotated[RedisClient, Depends(get_redis_client)],
+        negative_cache: Annotated[NegativeCache, Depends(get_negative_cache)],
+        config: Annotated[CacheConfig, Depends(get_cache_config)],
+        entity_cache: Annotated[EntityCache, Depends(get_entity_cache)],
+        archive: Annotated[PlaylistArchive | None, Depends(get_playlist_archive)],
 ) -> PlaylistRepo:
     """Get Playlist repository instance."""
-    return PlaylistRepo(redis_client)
+    return PlaylistRepo(redis_client, negative_cache, config, entity_cache, archive)
 
 
 # Service dependencies
@@ -88,15 +273,21 @@ def get_playlist_service(
         spotify_client: Annotated[SpotifyClient, Depends(get_spotify_client)],
         reccobeats_client: Annotated[ReccoBeatsClient, Depends(get_reccobeats_client)],
         playlist_repo: Annotated[PlaylistRepo, Depends(get_playlist_repo)],
+        admission: Annotated[AdmissionController, Depends(get_admission_controller)],
 ) -> PlaylistService:
     """Get Playlist service instance."""
-    return PlaylistService(spotify_client, reccobeats_client, playlist_repo)
+    return PlaylistService(spotify_client, reccobeats_client, playlist_repo, admission)
 
 
 # Type aliases for easier imports
+CacheConfigDep = Annotated[CacheConfig, Depends(get_cache_config)]
 RedisClientDep = Annotated[RedisClient, Depends(get_redis_client)]
 RedisConfigDep = Annotated[RedisConfig, Depends(get_redis_config)]
 SpotifyClientDep = Annotated[SpotifyClient, Depends(get_spotify_client)]
 ReccoBeatsClientDep = Annotated[ReccoBeatsClient, Depends(get_reccobeats_client)]
 PlaylistRepoDep = Annotated[PlaylistRepo, Depends(get_playlist_repo)]
-PlaylistServiceDep = Annotated[PlaylistService, Depends(get_playlist_service)]
\ No newline at end of file
+PlaylistServiceDep = Annotated[PlaylistService, Depends(get_playlist_service)]
+HealthMonitorDep = Annotated[HealthMonitor, Depends(get_health_monitor)]
+GenerateRateLimitDep = Annotated[ClientRateLimit, Depends(limit_generate)]
+GenerateBatchRateLimitDep = Annotated[ClientRateLimit, Depends(limit_generate_batch)]
+ReadRateLimitDep = Annotated[ClientRateLimit, Depends(limit_read)]
\ No newline at end of file
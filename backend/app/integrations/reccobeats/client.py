@@ -1,13 +1,30 @@
+import contextvars
+import functools
 import http.client
 import json
 import logging
+import select
+import socket
+import threading
+import time
 import urllib.parse
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any
 
+from ...observability.metrics import observe_upstream
 from .config import ReccoBeatsConfig
+from .hedging import HedgeBudget, HedgeStats
 
 logger = logging.getLogger(__name__)
 
+# What a keep-alive connection the server closed while idle fails with
+_STALE_CONNECTION = (
+    http.client.RemoteDisconnected,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
 
 class ReccoBeatsClient:
     """
@@ -15,28 +32,259 @@ class ReccoBeatsClient:
     Handles track metadata and audio features fetching.
     """
 
+    ENDPOINTS = ("metadata", "audio_features")
+
     def __init__(self, config: ReccoBeatsConfig):
         self.config = config
         self._audio_features_cache: dict[str, Any] = {}
+        # One keep-alive connection per thread (caller thread or hedge worker)
+        self._local = threading.local()
+        self._hedge_budget = HedgeBudget(
+            config.hedge_budget_ratio, config.hedge_budget_burst
+        )
+        self._hedge_stats = {
+            endpoint: HedgeStats(config.hedge_window_size)
+            for endpoint in self.ENDPOINTS
+        }
+        # Only hedges run on the pool; primaries stay on the caller's thread
+        self._executor = (
+            ThreadPoolExecutor(
+                max_workers=config.hedge_max_workers,
+                thread_name_prefix="reccobeats-hedge",
+            )
+            if config.hedge_enabled
+            else None
+        )
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        """
+        Open a connection to the configured ReccoBeats host.
+        A base URL of the form http://host:port (e.g. a local stand-in) uses plain HTTP.
+        """
+        base_url = self.config.base_url
+        if base_url.startswith("http://"):
+            return http.client.HTTPConnection(
+                base_url.removeprefix("http://"), timeout=self.config.timeout
+            )
+        return http.client.HTTPSConnection(
+            base_url.removeprefix("https://"), timeout=self.config.timeout
+        )
+
+    def _connection(self) -> tuple[http.client.HTTPConnection, bool]:
+        """Get this thread's keep-alive connection and whether it was used before."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn, True
+        conn = self._new_connection()
+        self._local.conn = conn
+        return conn, False
+
+    def _drop_connection(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _http_get(
+        self,
+        path: str,
+        race: Callable[[http.client.HTTPConnection], tuple[Future | None, bool]]
+        | None = None,
+    ) -> tuple[int, bytes]:
+        """
+        Perform a GET on this thread's keep-alive connection. If `race` is
+        given, it is called once the request is sent and may race a hedge
+        against it (see `_race`).
+        """
+        for attempt in range(2):
+            conn, reused = self._connection()
+            hedge = None
+            try:
+                conn.request("GET", path)
+                if race is not None:
+                    hedge, hedge_won = race(conn)
+                    if hedge_won:
+                        # The unread response makes the connection unusable
+                        self._drop_connection()
+                        return hedge.result()
+                response = conn.getresponse()
+                return response.status, response.read()
+            except (http.client.HTTPException, OSError) as e:
+                self._drop_connection()
+                if hedge is not None:
+                    return hedge.result()
+                # Only a reused connection the server closed while idle is
+                # worth retrying; anything else, timeouts included, is final
+                if not (reused and attempt == 0 and isinstance(e, _STALE_CONNECTION)):
+                    raise
+        raise AssertionError("unreachable")
 
-    def fetch_metadata_batch(self, spotify_ids: list[str]) -> dict[str, Any]:
+    def _race(
+        self,
+        conn: http.client.HTTPConnection,
+        endpoint: str,
+        path: str,
+        delay: float,
+        context: contextvars.Context,
+    ) -> tuple[Future | None, bool]:
+        """
+        Wait for the response to a sent request to start arriving. If it
+        hasn't within `delay`, send a hedge from the pool and wait for
+        whichever comes first. Returns the hedge, if one was sent, and
+        whether it answered first.
+        """
+        stats = self._hedge_stats[endpoint]
+        if select.select([conn.sock], [], [], delay)[0]:
+            return None, False
+
+        if not self._hedge_budget.withdraw():
+            stats.incr("budget_exhausted")
+            return None, False
+
+        stats.incr("hedges_sent")
+        # Run the hedge in the caller's context so its span nests
+        hedge = self._executor.submit(context.run, self._timed_get, endpoint, path)
+        wake = self._wake_socket()
+        hedge.add_done_callback(lambda _: self._wake(wake))
+
+        deadline = time.monotonic() + self.config.timeout - delay
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("ReccoBeats request timed out")
+            readable, _, _ = select.select([conn.sock, wake[0]], [], [], remaining)
+            if wake[0] in readable:
+                # Drain wake-ups, including stale ones from earlier hedges
+                wake[0].recv(4096)
+                # A hedge that failed, server errors included, leaves the
+                # primary to answer
+                if (
+                    hedge.done()
+                    and hedge.exception() is None
+                    and hedge.result()[0] < 500
+                ):
+                    stats.incr("hedges_won")
+                    return hedge, True
+            if conn.sock in readable:
+                return hedge, False
+
+    def _wake_socket(self) -> tuple[socket.socket, socket.socket]:
+        """This thread's socket pair for being woken up by a finished hedge."""
+        wake = getattr(self._local, "wake", None)
+        if wake is None:
+            wake = socket.socketpair()
+            for sock in wake:
+                sock.setblocking(False)
+            self._local.wake = wake
+        return wake
+
+    @staticmethod
+    def _wake(wake: tuple[socket.socket, socket.socket]) -> None:
+        try:
+            wake[1].send(b"\0")
+        except BlockingIOError:
+            # Already full of wake-ups, so the waiter will wake anyway
+            pass
+
+    def _timed_get(
+        self,
+        endpoint: str,
+        path: str,
+        race: Callable[[http.client.HTTPConnection], tuple[Future | None, bool]]
+        | None = None,
+    ) -> tuple[int, bytes]:
+        """Perform a single attempt and record its latency."""
+        start = time.perf_counter()
+        try:
+            with observe_upstream("reccobeats", endpoint, path=path):
+                return self._http_get(path, race)
+        finally:
+            # An attempt the hedge beat is abandoned, so this undercounts it;
+            # it still took longer than the hedge delay, so the percentile
+            # that sets the delay is unaffected
+            self._hedge_stats[endpoint].attempt_latency.record(
+                time.perf_counter() - start
+            )
+
+    def _get(self, endpoint: str, path: str) -> tuple[int, bytes]:
+        """GET a ReccoBeats path, hedging the request if enabled."""
+        stats = self._hedge_stats[endpoint]
+        stats.incr("requests")
+        start = time.perf_counter()
+        try:
+            if self.config.hedge_enabled:
+                return self._hedged_get(endpoint, path)
+            return self._timed_get(endpoint, path)
+        finally:
+            stats.effective_latency.record(time.perf_counter() - start)
+
+    def _hedged_get(self, endpoint: str, path: str) -> tuple[int, bytes]:
+        """
+        Send the request on the caller's thread and, if it hasn't started
+        answering by the observed latency percentile, send a duplicate from
+        the hedge pool and return whichever answers first.
+        """
+        stats = self._hedge_stats[endpoint]
+        self._hedge_budget.deposit()
+
+        # Without enough samples the percentile is meaningless, so don't hedge yet
+        if len(stats.attempt_latency) < self.config.hedge_min_samples:
+            return self._timed_get(endpoint, path)
+
+        race = functools.partial(
+            self._race,
+            endpoint=endpoint,
+            path=path,
+            delay=stats.attempt_latency.percentile(self.config.hedge_percentile),
+            context=contextvars.copy_context(),
+        )
+        return self._timed_get(endpoint, path, race)
+
+    def hedge_stats(self) -> dict[str, Any]:
+        """
+        Get hedging counters and latency percentiles per endpoint.
+        Compare `attempt_latency` (un-hedged) with `effective_latency` (hedged)
+        to see the tail-latency improvement.
+        """
+        return {
+            "enabled": self.config.hedge_enabled,
+            "endpoints": {
+                endpoint: stats.to_dict()
+                for endpoint, stats in self._hedge_stats.items()
+            },
+        }
+
+    def ping(self) -> bool:
+        """
+        Check that the API is reachable. Any non-5xx response counts, since
+        the probe ID is not expected to exist.
+        """
+        try:
+            status, _ = self._http_get("/tracks/spotify/health-check")
+            return status < 500
+        except Exception as e:
+            logger.warning(f"ReccoBeats ping failed: {e}")
+            return False
+
+    def fetch_metadata_batch(
+        self, spotify_ids: list[str], not_found: set[str] | None = None
+    ) -> dict[str, Any]:
         """
         Fetch basic track metadata from ReccoBeats API for a batch of Spotify IDs.
         Returns a dictionary mapping original Spotify ID to its ReccoBeats ID and metadata.
+        If `not_found` is given, IDs ReccoBeats definitively doesn't know are added
+        to it (transient errors are not).
         """
         spotify_to_reccobeats_map = {}
         logger.info(f"Fetching ReccoBeats metadata for {len(spotify_ids)} Spotify IDs")
 
         try:
-            conn = http.client.HTTPSConnection(self.config.base_url)
-
             for spotify_id in spotify_ids:
                 url = f"/tracks/spotify/{urllib.parse.quote(spotify_id)}"
-                conn.request("GET", url)
-                response = conn.getresponse()
+                status, body = self._get("metadata", url)
 
-                if response.status == 200:
-                    data = json.loads(response.read().decode())
+                if status == 200:
+                    data = json.loads(body.decode())
                     if data.get("success") and data.get("track"):
                         track_data = data["track"]
                         reccobeats_id = track_data.get("id")
@@ -44,12 +292,15 @@ class ReccoBeatsClient:
                             "reccobeats_id": reccobeats_id,
                             "metadata": track_data,
                         }
+                    elif not_found is not None:
+                        not_found.add(spotify_id)
+                elif status == 404 and not_found is not None:
+                    not_found.add(spotify_id)
                 else:
                     logger.warning(
-                        f"ReccoBeats API returned status {response.status} for Spotify ID {spotify_id}"
+                        f"ReccoBeats API returned status {status} for Spotify ID {spotify_id}"
                     )
 
-            conn.close()
             logger.info(
                 f"Successfully mapped {len(spotify_to_reccobeats_map)}/{len(spotify_ids)} tracks"
             )
@@ -59,17 +310,19 @@ class ReccoBeatsClient:
 
         return spotify_to_reccobeats_map
 
-    def fetch_audio_features_batch(self, reccobeats_ids: list[str]) -> dict[str, Any]:
+    def fetch_audio_features_batch(
+        self, reccobeats_ids: list[str], not_found: set[str] | None = None
+    ) -> dict[str, Any]:
         """
         Fetch detailed audio features from ReccoBeats API for a batch of ReccoBeats IDs.
         Returns a dictionary mapping ReccoBeats ID to its audio features.
+        If `not_found` is given, IDs that definitively have no audio features are
+        added to it (transient errors are not).
         """
         features_map = {}
         logger.info(f"Fetching audio features for {len(reccobeats_ids)} ReccoBeats IDs")
 
         try:
-            conn = http.client.HTTPSConnection(self.config.base_url)
-
             for reccobeats_id in reccobeats_ids:
                 # Check cache first
                 if reccobeats_id in self._audio_features_cache:
@@ -79,22 +332,24 @@ class ReccoBeatsClient:
                     continue
 
                 url = f"/audio-features/{urllib.parse.quote(str(reccobeats_id))}"
-                conn.request("GET", url)
-                response = conn.getresponse()
+                status, body = self._get("audio_features", url)
 
-                if response.status == 200:
-                    data = json.loads(response.read().decode())
+                if status == 200:
+                    data = json.loads(body.decode())
                     if data.get("success") and data.get("audioFeatures"):
                         audio_features = data["audioFeatures"]
                         features_map[reccobeats_id] = audio_features
                         # Cache the result
                         self._audio_features_cache[reccobeats_id] = audio_features
+                    elif not_found is not None:
+                        not_found.add(reccobeats_id)
+                elif status == 404 and not_found is not None:
+                    not_found.add(reccobeats_id)
                 else:
                     logger.warning(
-                        f"ReccoBeats API returned status {response.status} for ID {reccobeats_id}"
+                        f"ReccoBeats API returned status {status} for ID {reccobeats_id}"
                     )
 
-            conn.close()
             logger.info(
                 f"Successfully fetched audio features for {len(features_map)}/{len(reccobeats_ids)} tracks"
             )
@@ -9,10 +9,30 @@ class ReccoBeatsConfig(BaseModel):
     base_url: str = "reccobeats.com"
     timeout: int = 30
 
+    # Hedged requests (opt-in): duplicate slow per-ID lookups after the observed
+    # latency percentile, bounded by a token-bucket budget.
+    hedge_enabled: bool = False
+    hedge_percentile: float = 95.0
+    hedge_budget_ratio: float = 0.05
+    hedge_budget_burst: int = 10
+    hedge_min_samples: int = 20
+    hedge_window_size: int = 512
+    hedge_max_workers: int = 8
+
     @classmethod
     def from_env(cls) -> "ReccoBeatsConfig":
         """Create configuration from environment variables."""
         return cls(
             base_url=os.getenv("RECCOBEATS_BASE_URL", "reccobeats.com"),
             timeout=int(os.getenv("RECCOBEATS_TIMEOUT", "30")),
+            hedge_enabled=os.getenv("RECCOBEATS_HEDGE_ENABLED", "false").lower()
+            in ("1", "true", "yes"),
+            hedge_percentile=float(os.getenv("RECCOBEATS_HEDGE_PERCENTILE", "95")),
+            hedge_budget_ratio=float(
+                os.getenv("RECCOBEATS_HEDGE_BUDGET_RATIO", "0.05")
+            ),
+            hedge_budget_burst=int(os.getenv("RECCOBEATS_HEDGE_BUDGET_BURST", "10")),
+            hedge_min_samples=int(os.getenv("RECCOBEATS_HEDGE_MIN_SAMPLES", "20")),
+            hedge_window_size=int(os.getenv("RECCOBEATS_HEDGE_WINDOW_SIZE", "512")),
+            hedge_max_workers=int(os.getenv("RECCOBEATS_HEDGE_MAX_WORKERS", "8")),
         )
@@ -0,0 +1,104 @@
+import threading
+import time
+from collections import deque
+
+
+class LatencyWindow:
+    """
+    Rolling window of recent request latencies.
+    Percentiles are recomputed lazily, at most once per batch of new samples.
+    """
+
+    def __init__(self, size: int = 512, recompute_every: int = 16):
+        self._samples: deque[float] = deque(maxlen=size)
+        self._recompute_every = recompute_every
+        self._sorted: list[float] = []
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        """Record a single latency sample in seconds."""
+        with self._lock:
+            self._samples.append(seconds)
+            self._pending += 1
+
+    def percentile(self, pct: float) -> float | None:
+        """Get the given percentile (0-100) of the window, or None if empty."""
+        with self._lock:
+            if not self._samples:
+                return None
+            if self._pending >= self._recompute_every or not self._sorted:
+                self._sorted = sorted(self._samples)
+                self._pending = 0
+            index = min(len(self._sorted) - 1, int(len(self._sorted) * pct / 100))
+            return self._sorted[index]
+
+    def snapshot(self) -> dict[str, float | None]:
+        """Get p50/p95/p99 of the current window."""
+        return {
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+class HedgeBudget:
+    """
+    Token bucket bounding the number of hedged requests.
+    Every primary request deposits `ratio` tokens and every hedge spends one,
+    so hedges stay at roughly `ratio` of total traffic with bursts up to `burst`.
+    """
+
+    def __init__(self, ratio: float, burst: int):
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = float(burst)
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        """Credit the budget for one primary request."""
+        with self._lock:
+            self._tokens = min(float(self.burst), self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Spend one token for a hedge. Returns False if the budget is exhausted."""
+        with self._lock:
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+
+class HedgeStats:
+    """Per-endpoint counters and latency windows for hedged requests."""
+
+    def __init__(self, window_size: int):
+        self.started_at = time.time()
+        self.requests = 0
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self.budget_exhausted = 0
+        # Latency of individual attempts, i.e. what an un-hedged request sees
+        self.attempt_latency = LatencyWindow(window_size)
+        # Latency the caller actually observed, with hedging applied
+        self.effective_latency = LatencyWindow(window_size)
+        self._lock = threading.Lock()
+
+    def incr(self, counter: str) -> None:
+        """Increment one of the counters by name."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def to_dict(self) -> dict:
+        """Export counters and latency percentiles."""
+        return {
+            "requests": self.requests,
+            "hedges_sent": self.hedges_sent,
+            "hedges_won": self.hedges_won,
+            "budget_exhausted": self.budget_exhausted,
+            "attempt_latency": self.attempt_latency.snapshot(),
+            "effective_latency": self.effective_latency.snapshot(),
+        }
@@ -4,5 +4,6 @@ Spotify API integration.
 
 from .client import SpotifyClient
 from .config import SpotifyConfig
+from .token_store import RedisTokenStore, SharedTokenManager
 
-__all__ = ["SpotifyClient", "SpotifyConfig"]
+__all__ = ["RedisTokenStore", "SharedTokenManager", "SpotifyClient", "SpotifyConfig"]
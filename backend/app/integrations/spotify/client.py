@@ -1,12 +1,19 @@
+import asyncio
 import base64
 import logging
+import math
 import os
+import random
+import time
 from typing import Any
 
 import spotipy
+from spotipy.cache_handler import MemoryCacheHandler
 from spotipy.oauth2 import SpotifyOAuth
 
+from ...observability.metrics import observe_upstream
 from .config import SpotifyConfig
+from .token_store import RedisTokenStore, SharedTokenManager
 
 logger = logging.getLogger(__name__)
 
@@ -17,27 +24,57 @@ class SpotifyClient:
     Handles authentication and basic Spotify API calls.
     """
 
-    def __init__(self, config: SpotifyConfig):
+    def __init__(
+        self, config: SpotifyConfig, token_store: RedisTokenStore | None = None
+    ):
         self.config = config
         self.sp: spotipy.Spotify | None = None
         self.user_id: str | None = None
-        self.auth_manager: SpotifyOAuth | None = None
+        self.auth_manager: SpotifyOAuth | SharedTokenManager | None = None
+        # Without a token store each worker keeps its own token in the cache file
+        self.token_store = token_store
+        self._reconnect_task: asyncio.Task | None = None
+        self._next_attempt_at = 0.0
 
     async def connect(self) -> bool:
         """Initialize Spotify connection and authenticate."""
+        if self.token_store is not None:
+            try:
+                if not isinstance(self.auth_manager, SharedTokenManager):
+                    self.auth_manager = SharedTokenManager(
+                        self.token_store,
+                        refresh_oauth=self._oauth(cache_handler=MemoryCacheHandler()),
+                        seed_oauth=self._oauth(cache_path=self.config.cache_path),
+                        refresh_margin_seconds=self.config.token_refresh_margin_seconds,
+                        lock_ttl_seconds=self.config.token_lock_ttl_seconds,
+                    )
+                if not await self.auth_manager.start():
+                    return False
+            except Exception as e:
+                logger.error(f"Failed to load shared Spotify token: {e}")
+                return False
+        else:
+            self.auth_manager = self._oauth(cache_path=self.config.cache_path)
+
+        # spotipy is blocking; keep the event loop free while it authenticates
+        return await asyncio.to_thread(self._connect)
+
+    def _oauth(self, **cache_options) -> SpotifyOAuth:
+        return SpotifyOAuth(
+            client_id=self.config.client_id,
+            client_secret=self.config.client_secret,
+            redirect_uri=self.config.redirect_uri,
+            scope=self.config.scopes,
+            **cache_options,
+        )
+
+    def _connect(self) -> bool:
         try:
-            self.auth_manager = SpotifyOAuth(
-                client_id=self.config.client_id,
-                client_secret=self.config.client_secret,
-                redirect_uri=self.config.redirect_uri,
-                scope=self.config.scopes,
-                cache_path=self.config.cache_path,
-            )
-
             self.sp = spotipy.Spotify(auth_manager=self.auth_manager)
 
             # Get current user
-            current_user_profile = self.sp.current_user()
+            with observe_upstream("spotify", "connect"):
+                current_user_profile = self.sp.current_user()
             self.user_id = current_user_profile["id"]
 
             logger.info(
@@ -55,6 +92,53 @@ class SpotifyClient:
         """Check if client is connected and authenticated."""
         return self.sp is not None and self.user_id is not None
 
+    def ensure_reconnecting(self) -> None:
+        """
+        Start the background reconnect loop if the client is disconnected and
+        it isn't already running. Callers never wait for it, so requests that
+        need Spotify fail fast while it's down.
+        """
+        if self.is_connected() or self.is_reconnecting():
+            return
+        self._reconnect_task = asyncio.create_task(self._reconnect_loop())
+
+    def is_reconnecting(self) -> bool:
+        """Check if the background reconnect loop is running."""
+        return self._reconnect_task is not None and not self._reconnect_task.done()
+
+    def retry_after_seconds(self) -> int:
+        """Seconds until the next reconnect attempt, for Retry-After headers."""
+        return max(1, math.ceil(self._next_attempt_at - time.monotonic()))
+
+    async def _reconnect_loop(self) -> None:
+        delay = self.config.reconnect_initial_backoff_seconds
+        attempt = 0
+        while not self.is_connected():
+            attempt += 1
+            if await self.connect():
+                logger.info(f"Spotify reconnected after {attempt} attempt(s)")
+                return
+
+            # Jitter keeps several workers from retrying in lockstep
+            sleep = random.uniform(delay / 2, delay)
+            self._next_attempt_at = time.monotonic() + sleep
+            logger.warning(
+                f"Spotify reconnect attempt {attempt} failed, retrying in {sleep:.1f}s"
+            )
+            await asyncio.sleep(sleep)
+            delay = min(delay * 2, self.config.reconnect_max_backoff_seconds)
+
+    async def close(self) -> None:
+        """Stop the background reconnect loop and token refresh."""
+        if self.is_reconnecting():
+            self._reconnect_task.cancel()
+            try:
+                await self._reconnect_task
+            except asyncio.CancelledError:
+                pass
+        if isinstance(self.auth_manager, SharedTokenManager):
+            await self.auth_manager.close()
+
     def search_tracks(
         self, query: str, limit: int = 50, offset: int = 0
     ) -> list[dict[str, Any]]:
@@ -63,7 +147,12 @@ class SpotifyClient:
             raise RuntimeError("Spotify client not connected")
 
         try:
-            results = self.sp.search(q=query, type="track", limit=limit, offset=offset)
+            with observe_upstream(
+                "spotify", "search_tracks", query=query, limit=limit, offset=offset
+            ):
+                results = self.sp.search(
+                    q=query, type="track", limit=limit, offset=offset
+                )
             return results["tracks"]["items"]
         except Exception as e:
             logger.error(f"Failed to search tracks: {e}")
@@ -82,7 +171,10 @@ class SpotifyClient:
 
             for i in range(0, len(track_ids), 100):
                 batch = track_ids[i : i + 100]
-                features = self.sp.audio_features(batch)
+                with observe_upstream(
+                    "spotify", "get_track_audio_features", batch_size=len(batch)
+                ):
+                    features = self.sp.audio_features(batch)
 
                 for j, feature in enumerate(features):
                     if feature:  # feature can be None if track not found
@@ -101,9 +193,10 @@ class SpotifyClient:
             raise RuntimeError("Spotify client not connected")
 
         try:
-            playlist = self.sp.user_playlist_create(
-                user=self.user_id, name=name, public=public, description=description
-            )
+            with observe_upstream("spotify", "create_playlist"):
+                playlist = self.sp.user_playlist_create(
+                    user=self.user_id, name=name, public=public, description=description
+                )
             logger.info(f"Created playlist: {playlist['name']} (ID: {playlist['id']})")
             return playlist
         except Exception as e:
@@ -119,7 +212,10 @@ class SpotifyClient:
             # Spotify API allows max 100 tracks per request
             for i in range(0, len(track_uris), 100):
                 batch = track_uris[i : i + 100]
-                self.sp.playlist_add_items(playlist_id, batch)
+                with observe_upstream(
+                    "spotify", "add_tracks_to_playlist", batch_size=len(batch)
+                ):
+                    self.sp.playlist_add_items(playlist_id, batch)
 
             logger.info(f"Added {len(track_uris)} tracks to playlist {playlist_id}")
             return True
@@ -141,7 +237,8 @@ class SpotifyClient:
                 image_data = img_file.read()
 
             image_data_base64 = base64.b64encode(image_data).decode("utf-8")
-            self.sp.playlist_upload_cover_image(playlist_id, image_data_base64)
+            with observe_upstream("spotify", "upload_playlist_cover"):
+                self.sp.playlist_upload_cover_image(playlist_id, image_data_base64)
 
             logger.info(f"Uploaded cover image for playlist {playlist_id}")
             return True
@@ -156,7 +253,8 @@ class SpotifyClient:
             raise RuntimeError("Spotify client not connected")
 
         try:
-            return self.sp.playlist(playlist_id)
+            with observe_upstream("spotify", "get_playlist"):
+                return self.sp.playlist(playlist_id)
         except Exception as e:
             logger.error(f"Failed to get playlist {playlist_id}: {e}")
             return None
@@ -11,6 +11,15 @@ class SpotifyConfig(BaseModel):
     redirect_uri: str = "http://localhost:8000/callback"
     cache_path: str = ".spotipy_cache.json"
     scopes: str = "playlist-modify-public ugc-image-upload user-read-private"
+    # Background reconnect backoff after authentication failures
+    reconnect_initial_backoff_seconds: float = 1.0
+    reconnect_max_backoff_seconds: float = 60.0
+    # Share the OAuth token between workers through Redis
+    shared_token: bool = True
+    # Refresh this long before the access token expires
+    token_refresh_margin_seconds: int = 300
+    # How long one worker may hold the refresh lock
+    token_lock_ttl_seconds: int = 30
 
     @classmethod
     def from_env(cls) -> "SpotifyConfig":
@@ -34,4 +43,18 @@ class SpotifyConfig(BaseModel):
                 "SPOTIFY_SCOPES",
                 "playlist-modify-public ugc-image-upload user-read-private",
             ),
+            reconnect_initial_backoff_seconds=float(
+                os.getenv("SPOTIFY_RECONNECT_INITIAL_BACKOFF_SECONDS", "1.0")
+            ),
+            reconnect_max_backoff_seconds=float(
+                os.getenv("SPOTIFY_RECONNECT_MAX_BACKOFF_SECONDS", "60.0")
+            ),
+            shared_token=os.getenv("SPOTIFY_SHARED_TOKEN", "true").lower()
+            in ("1", "true", "yes"),
+            token_refresh_margin_seconds=int(
+                os.getenv("SPOTIFY_TOKEN_REFRESH_MARGIN_SECONDS", "300")
+            ),
+            token_lock_ttl_seconds=int(
+                os.getenv("SPOTIFY_TOKEN_LOCK_TTL_SECONDS", "30")
+            ),
         )
@@ -0,0 +1,168 @@
+import asyncio
+import json
+import logging
+import secrets
+import time
+from typing import Any
+
+from spotipy.oauth2 import SpotifyOAuth, SpotifyOauthError
+
+from ...db.redis import RedisClient
+
+logger = logging.getLogger(__name__)
+
+TOKEN_KEY = "spotify:token"
+LOCK_KEY = "spotify:token:lock"
+
+# How long to wait for another worker's refresh before trying again
+_LOCK_WAIT_SECONDS = 0.5
+_RETRY_SECONDS = 10
+
+
+class RedisTokenStore:
+    """
+    Spotify OAuth token info shared by all workers through Redis, with a
+    lock so only one worker refreshes it at a time.
+    """
+
+    def __init__(self, redis_client: RedisClient):
+        self.redis_client = redis_client
+
+    async def load(self) -> dict[str, Any] | None:
+        """Get the shared token info, if any."""
+        return await self.redis_client.get_json(TOKEN_KEY)
+
+    async def save(self, token_info: dict[str, Any]) -> bool:
+        """Store token info for all workers."""
+        return await self.redis_client.set(TOKEN_KEY, json.dumps(token_info))
+
+    async def acquire_refresh_lock(self, ttl_seconds: int) -> str | None:
+        """Take the refresh lock; returns the holder token, or None if taken."""
+        holder = secrets.token_hex(8)
+        if await self.redis_client.set_if_absent(LOCK_KEY, holder, ttl_seconds):
+            return holder
+        return None
+
+    async def release_refresh_lock(self, holder: str) -> None:
+        await self.redis_client.delete_if_equals(LOCK_KEY, holder)
+
+
+class SharedTokenManager:
+    """
+    spotipy auth manager that serves the access token from memory.
+
+    A background task refreshes the token ahead of expiry: it first picks up
+    a token another worker already refreshed, and otherwise refreshes it
+    under the Redis lock and publishes it. API calls never touch Redis or
+    the local cache file.
+    """
+
+    def __init__(
+        self,
+        store: RedisTokenStore,
+        refresh_oauth: SpotifyOAuth,
+        seed_oauth: SpotifyOAuth,
+        refresh_margin_seconds: int = 300,
+        lock_ttl_seconds: int = 30,
+    ):
+        self.store = store
+        # Refreshes in memory only, so workers never race on a cache file
+        self.refresh_oauth = refresh_oauth
+        # Reads the local spotipy cache (or runs the authorization flow)
+        # when Redis has no token yet
+        self.seed_oauth = seed_oauth
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.lock_ttl_seconds = lock_ttl_seconds
+        self.token_info: dict[str, Any] | None = None
+        self._refresh_task: asyncio.Task | None = None
+
+    def get_access_token(self, as_dict: bool = False) -> str | dict[str, Any]:
+        """Current access token, as spotipy's auth manager interface expects."""
+        if self.token_info is None:
+            raise SpotifyOauthError("No Spotify token available")
+        return self.token_info if as_dict else self.token_info["access_token"]
+
+    async def start(self) -> bool:
+        """Load the shared token and start refreshing it in the background."""
+        if self.token_info is None:
+            token_info = await self.store.load()
+            if token_info is None:
+                token_info = await asyncio.to_thread(self._seed_token)
+                if token_info is None:
+                    return False
+                await self.store.save(token_info)
+                logger.info("Seeded shared Spotify token from the local cache")
+            self.token_info = token_info
+
+        await self._refresh_if_due()
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+        return True
+
+    async def close(self) -> None:
+        """Stop the background refresh task."""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+
+    def _seed_token(self) -> dict[str, Any] | None:
+        try:
+            self.seed_oauth.get_access_token(as_dict=False)
+            return self.seed_oauth.cache_handler.get_cached_token()
+        except Exception as e:
+            logger.error(f"Failed to get an initial Spotify token: {e}")
+            return None
+
+    def _is_due(self, token_info: dict[str, Any]) -> bool:
+        return token_info["expires_at"] - time.time() < self.refresh_margin_seconds
+
+    def _seconds_until_due(self) -> float:
+        return self.token_info["expires_at"] - self.refresh_margin_seconds - time.time()
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(max(self._seconds_until_due(), 1))
+            try:
+                await self._refresh_if_due()
+            except Exception as e:
+                logger.error(f"Failed to refresh Spotify token: {e}")
+                await asyncio.sleep(_RETRY_SECONDS)
+
+    async def _refresh_if_due(self) -> None:
+        if not self._is_due(self.token_info):
+            return
+
+        # Another worker may have refreshed it already
+        shared = await self.store.load()
+        if shared and not self._is_due(shared):
+            self.token_info = shared
+            return
+
+        holder = await self.store.acquire_refresh_lock(self.lock_ttl_seconds)
+        if holder is None:
+            # Another worker is refreshing; pick up its token when published
+            deadline = time.monotonic() + self.lock_ttl_seconds
+            while time.monotonic() < deadline:
+                await asyncio.sleep(_LOCK_WAIT_SECONDS)
+                shared = await self.store.load()
+                if shared and not self._is_due(shared):
+                    self.token_info = shared
+                    return
+            logger.warning(
+                "Timed out waiting for another worker's Spotify token refresh"
+            )
+            return
+
+        try:
+            refresh_token = (shared or self.token_info)["refresh_token"]
+            token_info = await asyncio.to_thread(
+                self.refresh_oauth.refresh_access_token, refresh_token
+            )
+            await self.store.save(token_info)
+            self.token_info = token_info
+            logger.info("Refreshed shared Spotify token")
+        finally:
+            await self.store.release_refresh_lock(holder)
@@ -0,0 +1,9 @@
+"""
+Application startup, readiness and health.
+"""
+
+from .config import HealthConfig, StartupConfig
+from .health import HealthMonitor
+from .startup import Startup
+
+__all__ = ["HealthConfig", "HealthMonitor", "Startup", "StartupConfig"]
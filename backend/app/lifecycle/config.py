@@ -0,0 +1,60 @@
+import os
+
+from pydantic import BaseModel
+
+
+class StartupConfig(BaseModel):
+    """Application startup configuration."""
+
+    # Per-step timeouts; steps run concurrently and retry in the background
+    redis_timeout_seconds: float = 2.0
+    spotify_timeout_seconds: float = 10.0
+    reccobeats_timeout_seconds: float = 5.0
+    # Backoff between Redis connection attempts until the first one succeeds
+    redis_retry_max_seconds: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> "StartupConfig":
+        """Create configuration from environment variables."""
+        return cls(
+            redis_timeout_seconds=float(
+                os.getenv("STARTUP_REDIS_TIMEOUT_SECONDS", "2.0")
+            ),
+            spotify_timeout_seconds=float(
+                os.getenv("STARTUP_SPOTIFY_TIMEOUT_SECONDS", "10.0")
+            ),
+            reccobeats_timeout_seconds=float(
+                os.getenv("STARTUP_RECCOBEATS_TIMEOUT_SECONDS", "5.0")
+            ),
+            redis_retry_max_seconds=float(
+                os.getenv("STARTUP_REDIS_RETRY_MAX_SECONDS", "30.0")
+            ),
+        )
+
+
+class HealthConfig(BaseModel):
+    """Background health probe configuration."""
+
+    # Seconds between probes of each dependency
+    redis_interval_seconds: float = 5.0
+    spotify_interval_seconds: float = 30.0
+    reccobeats_interval_seconds: float = 30.0
+    probe_timeout_seconds: float = 5.0
+
+    @classmethod
+    def from_env(cls) -> "HealthConfig":
+        """Create configuration from environment variables."""
+        return cls(
+            redis_interval_seconds=float(
+                os.getenv("HEALTH_REDIS_INTERVAL_SECONDS", "5.0")
+            ),
+            spotify_interval_seconds=float(
+                os.getenv("HEALTH_SPOTIFY_INTERVAL_SECONDS", "30.0")
+            ),
+            reccobeats_interval_seconds=float(
+                os.getenv("HEALTH_RECCOBEATS_INTERVAL_SECONDS", "30.0")
+            ),
+            probe_timeout_seconds=float(
+                os.getenv("HEALTH_PROBE_TIMEOUT_SECONDS", "5.0")
+            ),
+        )
@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from ..db.redis import RedisClient
+from ..integrations.reccobeats import ReccoBeatsClient
+from ..integrations.spotify import SpotifyClient
+from .config import HealthConfig
+
+logger = logging.getLogger(__name__)
+
+# A probe returns whether the dependency is healthy; raising counts as unhealthy
+Probe = Callable[[], Awaitable[bool]]
+
+
+@dataclass
+class ProbeState:
+    status: str = "unknown"
+    latency_ms: float | None = None
+    checked_at: float | None = None
+    error: str | None = None
+
+
+class HealthMonitor:
+    """
+    Probes each dependency from a background task on its own interval and
+    keeps the last result, so health endpoints answer from memory without
+    calling upstreams.
+    """
+
+    def __init__(self, config: HealthConfig):
+        self.config = config
+        self._probes: dict[str, tuple[Probe, float]] = {}
+        self._states: dict[str, ProbeState] = {}
+        self._tasks: list[asyncio.Task] = []
+
+    def register(self, name: str, probe: Probe, interval_seconds: float) -> None:
+        self._probes[name] = (probe, interval_seconds)
+        self._states[name] = ProbeState()
+
+    def watch_dependencies(
+        self,
+        redis_client: RedisClient,
+        spotify_client: SpotifyClient | None,
+        reccobeats_client: ReccoBeatsClient | None,
+    ) -> None:
+        """Register the standard probes for the app's dependencies."""
+
+        async def probe_redis() -> bool:
+            return redis_client.is_connected() and await redis_client.ping()
+
+        self.register("redis", probe_redis, self.config.redis_interval_seconds)
+
+        if spotify_client is not None:
+
+            async def probe_spotify() -> bool:
+                if not spotify_client.is_connected():
+                    spotify_client.ensure_reconnecting()
+                    raise RuntimeError("disconnected")
+                tracks = await asyncio.to_thread(
+                    spotify_client.search_tracks, "test", limit=1
+                )
+                return len(tracks) > 0
+
+            self.register(
+                "spotify", probe_spotify, self.config.spotify_interval_seconds
+            )
+
+        if reccobeats_client is not None:
+
+            async def probe_reccobeats() -> bool:
+                return await asyncio.to_thread(reccobeats_client.ping)
+
+            self.register(
+                "reccobeats", probe_reccobeats, self.config.reccobeats_interval_seconds
+            )
+
+    def start(self) -> None:
+        """Start one probe loop per registered dependency."""
+        for name in self._probes:
+            self._tasks.append(asyncio.create_task(self._probe_loop(name)))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def is_healthy(self, name: str) -> bool:
+        state = self._states.get(name)
+        return state is not None and state.status == "healthy"
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Last known state of each dependency, with probe latency and age."""
+        now = time.monotonic()
+        return {
+            name: {
+                "status": state.status,
+                "latency_ms": state.latency_ms,
+                "age_seconds": (
+                    round(now - state.checked_at, 1)
+                    if state.checked_at is not None
+                    else None
+                ),
+                "error": state.error,
+            }
+            for name, state in self._states.items()
+        }
+
+    async def _probe_loop(self, name: str) -> None:
+        _, interval = self._probes[name]
+        while True:
+            await self.probe(name)
+            await asyncio.sleep(interval)
+
+    async def probe(self, name: str) -> ProbeState:
+        """Run one probe now and record its result."""
+        probe, _ = self._probes[name]
+        start = time.monotonic()
+        try:
+            healthy = await asyncio.wait_for(probe(), self.config.probe_timeout_seconds)
+            error = None
+        except TimeoutError:
+            healthy, error = False, "timeout"
+        except Exception as e:
+            healthy, error = False, str(e)
+
+        state = ProbeState(
+            status="healthy" if healthy else "unhealthy",
+            latency_ms=round((time.monotonic() - start) * 1000, 1),
+            checked_at=time.monotonic(),
+            error=error,
+        )
+        previous = self._states[name].status
+        if state.status != previous and previous != "unknown":
+            logger.warning(f"Health of {name} changed: {previous} -> {state.status}")
+        self._states[name] = state
+        return state
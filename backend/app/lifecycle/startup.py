@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import time
+from typing import Any
+
+from ..db.redis import RedisClient
+from ..integrations.reccobeats import ReccoBeatsClient
+from ..integrations.spotify import SpotifyClient
+from .config import StartupConfig
+
+logger = logging.getLogger(__name__)
+
+
+class Startup:
+    """
+    Connects the app's dependencies concurrently, each with its own timeout.
+
+    Only Redis is awaited before serving, and only up to its timeout, since
+    that is all cached reads need. Spotify and ReccoBeats bind late in the
+    background; requests that need them degrade until they are up.
+    """
+
+    def __init__(
+        self,
+        config: StartupConfig,
+        redis_client: RedisClient,
+        spotify_client: SpotifyClient | None,
+        reccobeats_client: ReccoBeatsClient | None,
+    ):
+        self.config = config
+        self.redis_client = redis_client
+        self.spotify_client = spotify_client
+        self.reccobeats_client = reccobeats_client
+        self.steps: dict[str, dict[str, Any]] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._started_at = time.monotonic()
+
+    async def start(self) -> None:
+        """Start every step and wait (bounded) for Redis."""
+        self._started_at = time.monotonic()
+        self._run("redis", self._connect_redis())
+        if self.spotify_client is not None:
+            self._run("spotify", self._connect_spotify())
+        if self.reccobeats_client is not None:
+            self._run("reccobeats", self._check_reccobeats())
+
+        await asyncio.wait(
+            [self._tasks["redis"]], timeout=self.config.redis_timeout_seconds
+        )
+        logger.info(
+            f"Startup finished in {self._elapsed_ms():.0f}ms: "
+            + ", ".join(f"{name}={step['status']}" for name, step in self.steps.items())
+        )
+
+    async def stop(self) -> None:
+        """Cancel steps still running at shutdown."""
+        pending = [task for task in self._tasks.values() if not task.done()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    def is_ready(self) -> bool:
+        """Ready to serve once Redis is connected."""
+        return self.redis_client.is_connected()
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        return {name: dict(step) for name, step in self.steps.items()}
+
+    def _run(self, name: str, step) -> None:
+        self.steps[name] = {"status": "pending"}
+        self._tasks[name] = asyncio.create_task(step)
+
+    def _finish(self, name: str, status: str, **details: Any) -> None:
+        self.steps[name] = {
+            "status": status,
+            "elapsed_ms": round(self._elapsed_ms(), 1),
+            **details,
+        }
+
+    def _elapsed_ms(self) -> float:
+        return (time.monotonic() - self._started_at) * 1000
+
+    async def _connect_redis(self) -> None:
+        delay = 1.0
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                await asyncio.wait_for(
+                    self.redis_client.connect(), self.config.redis_timeout_seconds
+                )
+                self._finish("redis", "ok", attempts=attempt)
+                return
+            except Exception as e:
+                status = "timeout" if isinstance(e, TimeoutError) else "failed"
+                self._finish("redis", status, attempts=attempt)
+                logger.warning(
+                    f"Redis connection attempt {attempt} {status}, retrying in {delay:.0f}s"
+                )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.config.redis_retry_max_seconds)
+
+    async def _connect_spotify(self) -> None:
+        # The shared token lives in Redis, so give Redis its chance first
+        await asyncio.wait(
+            [self._tasks["redis"]], timeout=self.config.redis_timeout_seconds
+        )
+        try:
+            connected = await asyncio.wait_for(
+                self.spotify_client.connect(), self.config.spotify_timeout_seconds
+            )
+            status = "ok" if connected else "failed"
+        except TimeoutError:
+            connected, status = False, "timeout"
+        except Exception as e:
+            logger.error(f"Failed to initialize Spotify: {e}")
+            connected, status = False, "failed"
+
+        self._finish("spotify", status)
+        if not connected:
+            logger.warning(f"Spotify connection {status} - retrying in the background")
+            self.spotify_client.ensure_reconnecting()
+
+    async def _check_reccobeats(self) -> None:
+        try:
+            # Only testing connectivity; the result doesn't matter
+            await asyncio.wait_for(
+                asyncio.to_thread(
+                    self.reccobeats_client.fetch_metadata_batch, ["test_id"]
+                ),
+                self.config.reccobeats_timeout_seconds,
+            )
+            self._finish("reccobeats", "ok")
+        except TimeoutError:
+            self._finish("reccobeats", "timeout")
+            logger.warning("ReccoBeats connectivity check timed out")
+        except Exception as e:
+            self._finish("reccobeats", "failed")
+            logger.error(f"ReccoBeats connectivity check failed: {e}")
@@ -1,19 +1,35 @@
 import logging
-from os import getenv
 from contextlib import asynccontextmanager
+from os import getenv
 
 from dotenv import load_dotenv
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from .dependencies import (
+    get_archive_config,
+    get_cache_config,
+    get_entity_cache,
+    get_health_config,
+    get_health_monitor,
+    get_negative_cache,
+    get_playlist_archive,
+    get_playlist_repo,
     get_reccobeats_client,
     get_reccobeats_config,
     get_redis_client,
     get_redis_config,
     get_spotify_client,
     get_spotify_config,
+    get_startup_config,
+    get_tracing_config,
 )
+from .lifecycle import Startup
+from .observability.metrics import render_latest
+from .observability.tracing import TracingMiddleware, configure_tracing
+from .playlists import ArchiveSweeper
+from .ratelimit import CostExceedsBurst, RateLimited
 from .routes.playlist import router as playlist_router
 
 # Load environment variables
@@ -26,52 +42,72 @@ logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Application lifespan events."""
+    """
+    Application lifespan events.
+
+    Dependencies connect concurrently with individual timeouts; startup only
+    waits (briefly) for Redis so cached reads are served right away, and
+    Spotify and ReccoBeats bind in the background.
+    """
     logger.info("Starting up application...")
+    configure_tracing(get_tracing_config())
 
-    # Initialize Redis connection
-    try:
-        redis_config = get_redis_config()
-        redis_client = get_redis_client(redis_config)
-        await redis_client.connect()
-        logger.info("Redis connection established")
-        app.state.redis_client = redis_client
-    except Exception as e:
-        logger.error(f"Failed to initialize Redis: {e}")
-        app.state.redis_client = None
+    redis_client = get_redis_client(get_redis_config())
+    app.state.redis_client = redis_client
 
-    # Initialize Spotify connection
     try:
-        spotify_config = get_spotify_config()
-        spotify_client = get_spotify_client(spotify_config)
-        connected = await spotify_client.connect()
-        if connected:
-            logger.info("Spotify connection established")
-        else:
-            logger.warning("Spotify connection failed - check authentication")
-        app.state.spotify_client = spotify_client
+        spotify_client = get_spotify_client(get_spotify_config(), redis_client)
     except Exception as e:
         logger.error(f"Failed to initialize Spotify: {e}")
-        app.state.spotify_client = None
+        spotify_client = None
+    app.state.spotify_client = spotify_client
 
-    # Initialize ReccoBeats connection (test connectivity)
     try:
-        reccobeats_config = get_reccobeats_config()
-        reccobeats_client = get_reccobeats_client(reccobeats_config)
-        # Test with a simple metadata fetch (we don't need the result, just testing connectivity)
-        _ = reccobeats_client.fetch_metadata_batch(["test_id"])
-        logger.info("ReccoBeats connection tested successfully")
-        app.state.reccobeats_client = reccobeats_client
+        reccobeats_client = get_reccobeats_client(get_reccobeats_config())
     except Exception as e:
         logger.error(f"Failed to initialize ReccoBeats: {e}")
-        app.state.reccobeats_client = None
+        reccobeats_client = None
+    app.state.reccobeats_client = reccobeats_client
+
+    startup = Startup(
+        get_startup_config(), redis_client, spotify_client, reccobeats_client
+    )
+    app.state.startup = startup
+    await startup.start()
+
+    health_monitor = get_health_monitor(get_health_config())
+    health_monitor.watch_dependencies(redis_client, spotify_client, reccobeats_client)
+    health_monitor.start()
+    app.state.health_monitor = health_monitor
+
+    archive_config = get_archive_config()
+    archive_sweeper = None
+    if archive_config.enabled:
+        cache_config = get_cache_config()
+        archive_sweeper = ArchiveSweeper(
+            archive_config,
+            get_playlist_repo(
+                redis_client,
+                get_negative_cache(cache_config),
+                cache_config,
+                get_entity_cache(cache_config),
+                get_playlist_archive(archive_config),
+            ),
+        )
+        archive_sweeper.start()
 
     yield
 
     # Cleanup
     logger.info("Shutting down application...")
-    if hasattr(app.state, "redis_client") and app.state.redis_client:
-        await app.state.redis_client.disconnect()
+    if archive_sweeper is not None:
+        await archive_sweeper.stop()
+    await health_monitor.stop()
+    await startup.stop()
+    if getattr(app.state, "spotify_client", None):
+        await app.state.spotify_client.close()
+    if redis_client.is_connected():
+        await redis_client.disconnect()
         logger.info("Redis connection closed")
 
 
@@ -94,44 +130,83 @@ app.add_middleware(
 )
 
 
+# Root span per request; skipped entirely when tracing is off
+if get_tracing_config().exporter != "none":
+    app.add_middleware(TracingMiddleware)
+
+
+@app.exception_handler(RateLimited)
+async def rate_limited(request: Request, exc: RateLimited):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Rate limit exceeded. Please retry later."},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+@app.exception_handler(CostExceedsBurst)
+async def cost_exceeds_burst(request: Request, exc: CostExceedsBurst):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
 @app.get("/")
 async def root():
     return {"message": "Nice Things API"}
 
 
-@app.get("/health")
-async def health_check():
-    """Health check endpoint that includes service status."""
-    redis_status = False
-    spotify_status = False
-    reccobeats_status = False
+@app.get("/livez")
+async def liveness():
+    """Liveness probe: the process is up and serving requests."""
+    return {"status": "alive"}
 
-    try:
-        if hasattr(app.state, "redis_client") and app.state.redis_client:
-            redis_status = await app.state.redis_client.ping()
-    except Exception as e:
-        logger.warning(f"Redis health check failed: {e}")
 
-    try:
-        if hasattr(app.state, "spotify_client") and app.state.spotify_client:
-            spotify_status = app.state.spotify_client.is_connected()
-    except Exception as e:
-        logger.warning(f"Spotify health check failed: {e}")
+@app.get("/readyz")
+async def readiness(response: Response):
+    """
+    Readiness probe: ready once Redis is connected, since cached reads need
+    nothing else. Startup steps for upstreams are reported but don't gate it.
+    """
+    startup = getattr(app.state, "startup", None)
+    ready = startup is not None and startup.is_ready()
+    if not ready:
+        response.status_code = 503
+    return {
+        "status": "ready" if ready else "not ready",
+        "startup": startup.snapshot() if startup else {},
+    }
 
-    try:
-        if hasattr(app.state, "reccobeats_client") and app.state.reccobeats_client:
-            # Simple test - if client exists, consider it healthy
-            reccobeats_status = True
-    except Exception as e:
-        logger.warning(f"ReccoBeats health check failed: {e}")
+
+@app.get("/health")
+async def health_check():
+    """
+    Service status from the background health probes. Answers from memory,
+    with each dependency's last probe latency and age.
+    """
+    health_monitor = getattr(app.state, "health_monitor", None)
+    checks = health_monitor.snapshot() if health_monitor else {}
 
     return {
-        "status": "healthy",
-        "redis_connected": redis_status,
-        "spotify_connected": spotify_status,
-        "reccobeats_available": reccobeats_status,
+        "status": (
+            "healthy"
+            if checks and all(c["status"] == "healthy" for c in checks.values())
+            else "degraded"
+        ),
+        "redis_connected": checks.get("redis", {}).get("status") == "healthy",
+        "spotify_connected": checks.get("spotify", {}).get("status") == "healthy",
+        "reccobeats_available": checks.get("reccobeats", {}).get("status") == "healthy",
+        "checks": checks,
+        "redis_pool": app.state.redis_client.pool_stats()
+        if getattr(app.state, "redis_client", None)
+        else None,
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics endpoint."""
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
+
+
 # Include routers
 app.include_router(playlist_router, prefix="/api/v1")
@@ -0,0 +1,25 @@
+import os
+
+from pydantic import BaseModel
+
+
+class TracingConfig(BaseModel):
+    """Tracing configuration."""
+
+    # One of "none", "jsonl" or "otlp"
+    exporter: str = "none"
+    jsonl_path: str = "traces.jsonl"
+    otlp_endpoint: str = "http://localhost:4318"
+    service_name: str = "nice-things-api"
+    sample_ratio: float = 1.0
+
+    @classmethod
+    def from_env(cls) -> "TracingConfig":
+        """Create configuration from environment variables."""
+        return cls(
+            exporter=os.getenv("TRACING_EXPORTER", "none").lower(),
+            jsonl_path=os.getenv("TRACING_JSONL_PATH", "traces.jsonl"),
+            otlp_endpoint=os.getenv("TRACING_OTLP_ENDPOINT", "http://localhost:4318"),
+            service_name=os.getenv("TRACING_SERVICE_NAME", "nice-things-api"),
+            sample_ratio=float(os.getenv("TRACING_SAMPLE_RATIO", "1.0")),
+        )
@@ -0,0 +1,213 @@
+import os
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    disable_created_metrics,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from .tracing import start_span
+
+# The *_created series double the exposition size without adding much value
+disable_created_metrics()
+
+# Latency buckets spanning single Redis hits up to cold multi-minute generations
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+)
+
+GENERATION_STAGE_SECONDS = Histogram(
+    "playlist_generation_stage_seconds",
+    "Time spent in each stage of create_activity_playlist",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+GENERATIONS_IN_FLIGHT = Gauge(
+    "playlist_generations_in_flight",
+    "Playlist generations currently in progress",
+    multiprocess_mode="livesum",
+)
+GENERATIONS_QUEUED = Gauge(
+    "playlist_generations_queued",
+    "Cold playlist generations waiting for an admission slot",
+    multiprocess_mode="livesum",
+)
+GENERATIONS_REJECTED = Counter(
+    "playlist_generations_rejected_total",
+    "Cold playlist generations shed by admission control, by reason",
+    ["reason"],
+)
+CACHE_LOOKUPS = Counter(
+    "playlist_cache_lookups_total",
+    "PlaylistRepo cache lookups by namespace and result (hit, miss, negative)",
+    ["namespace", "result"],
+)
+UPSTREAM_CALLS = Counter(
+    "upstream_calls_total",
+    "Calls to upstream APIs by client, method and outcome",
+    ["client", "method", "outcome"],
+)
+UPSTREAM_SECONDS = Histogram(
+    "upstream_call_seconds",
+    "Latency of upstream API calls by client and method",
+    ["client", "method"],
+    buckets=LATENCY_BUCKETS,
+)
+REDIS_COMMANDS = Counter(
+    "redis_commands_total",
+    "Redis round trips issued by RedisClient, by command",
+    ["command"],
+)
+REDIS_REPLICA_READS = Counter(
+    "redis_replica_reads_total",
+    "Key reads when replicas are configured, by route (replica, replica_miss, "
+    "recent_write, unavailable); all but replica were served by the primary",
+    ["route"],
+)
+REDIS_POOL_WAIT_SECONDS = Histogram(
+    "redis_pool_wait_seconds",
+    "Time spent waiting for a connection from the Redis pool",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+REDIS_POOL_TIMEOUTS = Counter(
+    "redis_pool_timeouts_total",
+    "Redis commands that gave up waiting for a pool connection",
+)
+
+
+def record_cache_lookup(namespace: str, result: str, count: int = 1) -> None:
+    """Count cache lookups for a PlaylistRepo namespace."""
+    if count:
+        CACHE_LOOKUPS.labels(namespace, result).inc(count)
+
+
+@contextmanager
+def observe_upstream(client: str, method: str, **attributes: Any) -> Iterator[Any]:
+    """
+    Time an upstream call, count it as ok or error and trace it as a span
+    named `<client>.<method>` with the given attributes.
+    """
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        with start_span(f"{client}.{method}", **attributes) as span:
+            yield span
+        outcome = "ok"
+    finally:
+        UPSTREAM_SECONDS.labels(client, method).observe(time.perf_counter() - start)
+        UPSTREAM_CALLS.labels(client, method, outcome).inc()
+
+
+def observe_stage(stage: str):
+    """Context manager timing one stage of playlist generation."""
+    return GENERATION_STAGE_SECONDS.labels(stage).time()
+
+
+class HedgeStatsCollector:
+    """Exports ReccoBeats hedging stats (see ReccoBeatsClient.hedge_stats)."""
+
+    def __init__(self, stats_fn: Callable[[], dict[str, Any]]):
+        self._stats_fn = stats_fn
+
+    def collect(self):
+        stats = self._stats_fn()["endpoints"]
+        counters = {
+            name: CounterMetricFamily(
+                f"reccobeats_hedge_{name}",
+                f"ReccoBeats hedging {name}",
+                labels=["endpoint"],
+            )
+            for name in ("requests", "hedges_sent", "hedges_won", "budget_exhausted")
+        }
+        latency = GaugeMetricFamily(
+            "reccobeats_hedge_latency_seconds",
+            "Rolling-window latency percentiles, per attempt (un-hedged) and effective",
+            labels=["endpoint", "kind", "quantile"],
+        )
+        for endpoint, values in stats.items():
+            for name, family in counters.items():
+                family.add_metric([endpoint], values[name])
+            for kind in ("attempt_latency", "effective_latency"):
+                for quantile, value in values[kind].items():
+                    if value is not None:
+                        latency.add_metric([endpoint, kind, quantile], value)
+        yield from counters.values()
+        yield latency
+
+
+class RedisPoolStatsCollector:
+    """Exports Redis connection pool utilization (see RedisClient.pool_stats)."""
+
+    def __init__(self, stats_fn: Callable[[], dict[str, Any] | None]):
+        self._stats_fn = stats_fn
+
+    def collect(self):
+        stats = self._stats_fn()
+        if stats is None:
+            return
+        connections = GaugeMetricFamily(
+            "redis_pool_connections",
+            "Redis pool connections by state",
+            labels=["state"],
+        )
+        connections.add_metric(["in_use"], stats["in_use"])
+        connections.add_metric(["idle"], stats["idle"])
+        yield connections
+        node_connections = GaugeMetricFamily(
+            "redis_pool_node_connections",
+            "Redis pool connections by node and state",
+            labels=["node", "state"],
+        )
+        for node, node_stats in stats.get("nodes", {}).items():
+            node_connections.add_metric([node, "in_use"], node_stats["in_use"])
+            node_connections.add_metric([node, "idle"], node_stats["idle"])
+        yield node_connections
+        yield GaugeMetricFamily(
+            "redis_pool_max_connections",
+            "Redis pool size limit",
+            value=stats["max_connections"],
+        )
+
+
+def register_collector(collector) -> None:
+    """Register a custom collector with the default registry, once."""
+    try:
+        REGISTRY.register(collector)
+    except ValueError:
+        pass
+
+
+def render_latest() -> tuple[bytes, str]:
+    """
+    Render all metrics in the Prometheus text format.
+    With PROMETHEUS_MULTIPROC_DIR set, metrics are aggregated across workers.
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,308 @@
+import contextvars
+import functools
+import json
+import logging
+import queue
+import random
+import secrets
+import threading
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from .config import TracingConfig
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None = None
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+    sampled: bool = True
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": ((self.end_ns or self.start_ns) - self.start_ns) / 1e6,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    """Stand-in span used when tracing is off or the trace isn't sampled."""
+
+    sampled = False
+    trace_id = span_id = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, **attributes: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+# The span active in the current task/thread; asyncio tasks and
+# contextvars.copy_context() give concurrent work its own copy
+_current_span: contextvars.ContextVar[Span | _NoopSpan | None] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+class BatchExporter(ABC):
+    """
+    Base exporter that queues finished spans and flushes them in batches
+    from a background thread, so exporting never blocks the request path.
+    Spans are dropped if the queue is full.
+    """
+
+    def __init__(
+        self, max_queue: int = 10_000, batch_size: int = 512, interval: float = 1.0
+    ):
+        self._queue: queue.Queue[Span] = queue.Queue(maxsize=max_queue)
+        self._batch_size = batch_size
+        self._interval = interval
+        self._thread = threading.Thread(
+            target=self._run, name=type(self).__name__, daemon=True
+        )
+        self._thread.start()
+
+    def export(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            pass
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self._interval
+            while len(batch) < self._batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            try:
+                self.flush(batch)
+            except Exception as e:
+                logger.warning(f"Failed to export {len(batch)} spans: {e}")
+
+    @abstractmethod
+    def flush(self, spans: list[Span]) -> None:
+        """Export one batch of finished spans."""
+
+
+class JsonlExporter(BatchExporter):
+    """Appends one JSON object per span to a local file."""
+
+    def __init__(self, path: str, **kwargs):
+        self.path = path
+        super().__init__(**kwargs)
+
+    def flush(self, spans: list[Span]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps(span.to_dict(), default=str) + "\n")
+
+
+class OtlpHttpExporter(BatchExporter):
+    """
+    Sends spans to an OTLP/HTTP collector (JSON encoding), e.g. a local
+    OpenTelemetry Collector or Jaeger listening on :4318.
+    """
+
+    def __init__(self, endpoint: str, service_name: str, **kwargs):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.service_name = service_name
+        super().__init__(**kwargs)
+
+    @staticmethod
+    def _attribute(key: str, value: Any) -> dict[str, Any]:
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        return {"key": key, "value": typed}
+
+    def _encode(self, span: Span) -> dict[str, Any]:
+        encoded = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [self._attribute(k, v) for k, v in span.attributes.items()],
+            "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+        }
+        if span.parent_id:
+            encoded["parentSpanId"] = span.parent_id
+        return encoded
+
+    def flush(self, spans: list[Span]) -> None:
+        payload = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            self._attribute("service.name", self.service_name)
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "app.observability.tracing"},
+                            "spans": [self._encode(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(payload).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=5) as response:
+            response.read()
+
+
+class Tracer:
+    """Creates spans, samples traces at the root and hands finished spans to the exporter."""
+
+    def __init__(self, exporter: BatchExporter, sample_ratio: float = 1.0):
+        self.exporter = exporter
+        self.sample_ratio = sample_ratio
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span | _NoopSpan]:
+        parent = _current_span.get()
+        if parent is None:
+            if random.random() >= self.sample_ratio:
+                span = NOOP_SPAN
+            else:
+                span = Span(name, secrets.token_hex(16), secrets.token_hex(8))
+        elif not parent.sampled:
+            span = NOOP_SPAN
+        else:
+            span = Span(name, parent.trace_id, secrets.token_hex(8), parent.span_id)
+
+        span.set_attributes(**attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            if span.sampled:
+                span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            if span.sampled:
+                span.end_ns = time.time_ns()
+                self.exporter.export(span)
+
+
+_tracer: Tracer | None = None
+
+
+def configure_tracing(config: TracingConfig) -> None:
+    """Install the global tracer according to configuration."""
+    global _tracer
+    if config.exporter == "jsonl":
+        exporter = JsonlExporter(config.jsonl_path)
+    elif config.exporter == "otlp":
+        exporter = OtlpHttpExporter(config.otlp_endpoint, config.service_name)
+    else:
+        _tracer = None
+        return
+
+    _tracer = Tracer(exporter, config.sample_ratio)
+    logger.info(f"Tracing enabled with {config.exporter} exporter")
+
+
+@contextmanager
+def start_span(name: str, **attributes: Any) -> Iterator[Span | _NoopSpan]:
+    """Start a span as a child of the current one. A no-op when tracing is off."""
+    if _tracer is None:
+        yield NOOP_SPAN
+        return
+    with _tracer.span(name, **attributes) as span:
+        yield span
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware opening a root span for every HTTP request. The span ends
+    once the app has sent the last body chunk, so streamed responses are timed
+    in full. Only installed when an exporter is configured.
+    """
+
+    def __init__(self, app: Callable):
+        self.app = app
+
+    async def __call__(self, scope: dict[str, Any], receive: Callable, send: Callable):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method, path = scope["method"], scope["path"]
+        with start_span(f"{method} {path}", http_method=method, http_path=path) as span:
+
+            async def send_traced(message: dict[str, Any]) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http_status", message["status"])
+                await send(message)
+
+            await self.app(scope, receive, send_traced)
+
+
+def current_span() -> Span | _NoopSpan:
+    """Get the active span, or a no-op span if there is none."""
+    return _current_span.get() or NOOP_SPAN
+
+
+def traced(name: str) -> Callable:
+    """Decorator running an async function inside a span."""
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with start_span(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -2,9 +2,23 @@
 Playlist domain logic.
 """
 
-from .models import PlaylistRequest, PlaylistResponse, Track
+from .admission import AdmissionController, AdmissionRejected
+from .archive import PlaylistArchive
+from .config import AdmissionConfig, ArchiveConfig, CacheConfig
+from .entities import EntityCache
+from .models import (
+    PlaylistBatchRequest,
+    PlaylistBatchResponse,
+    PlaylistRequest,
+    PlaylistResponse,
+    PlaylistSummary,
+    Track,
+    TrackSummary,
+)
+from .negative_cache import NegativeCache
 from .repo import PlaylistRepo
 from .service import PlaylistService
+from .sweeper import ArchiveSweeper
 
 __all__ = [
     "PlaylistService",
@@ -12,4 +26,17 @@ __all__ = [
     "PlaylistRequest",
     "PlaylistResponse",
     "Track",
+    "PlaylistSummary",
+    "PlaylistBatchRequest",
+    "PlaylistBatchResponse",
+    "TrackSummary",
+    "CacheConfig",
+    "AdmissionConfig",
+    "AdmissionController",
+    "AdmissionRejected",
+    "NegativeCache",
+    "EntityCache",
+    "ArchiveConfig",
+    "PlaylistArchive",
+    "ArchiveSweeper",
 ]
@@ -0,0 +1,83 @@
+import asyncio
+import logging
+import math
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from ..observability.metrics import GENERATIONS_QUEUED, GENERATIONS_REJECTED
+from .config import AdmissionConfig
+
+logger = logging.getLogger(__name__)
+
+# Weight of the latest generation in the running average duration
+_DURATION_SMOOTHING = 0.2
+
+
+class AdmissionRejected(Exception):
+    """A cold generation was shed; carries the HTTP status and Retry-After."""
+
+    def __init__(self, status_code: int, retry_after: int, reason: str):
+        super().__init__(f"Generation rejected: {reason}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class AdmissionController:
+    """
+    Bounds the cold generations one worker runs at once.
+
+    Up to max_concurrent generations run; up to max_queue more wait for a
+    slot. Beyond that new generations are rejected straight away (429), and
+    ones that wait longer than the queue timeout give up (503), so a burst
+    sheds load instead of slowing every request down.
+    """
+
+    def __init__(self, config: AdmissionConfig):
+        self.config = config
+        self._slots = asyncio.Semaphore(config.max_concurrent)
+        self._waiting = 0
+        # Running average generation time, for Retry-After estimates
+        self._average_seconds = 5.0
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    def retry_after_seconds(self) -> int:
+        """Rough time until a slot frees up for a new arrival."""
+        batches = (self._waiting + 1) / self.config.max_concurrent
+        return max(1, math.ceil(batches * self._average_seconds))
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """Hold a generation slot for the duration of the block."""
+        if self._slots.locked() and self._waiting >= self.config.max_queue:
+            GENERATIONS_REJECTED.labels("queue_full").inc()
+            raise AdmissionRejected(429, self.retry_after_seconds(), "queue full")
+
+        self._waiting += 1
+        GENERATIONS_QUEUED.inc()
+        try:
+            await asyncio.wait_for(
+                self._slots.acquire(), self.config.queue_timeout_seconds
+            )
+        except TimeoutError:
+            GENERATIONS_REJECTED.labels("queue_timeout").inc()
+            raise AdmissionRejected(
+                503, self.retry_after_seconds(), "queue timeout"
+            ) from None
+        finally:
+            self._waiting -= 1
+            GENERATIONS_QUEUED.dec()
+
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self._slots.release()
+            elapsed = time.monotonic() - start
+            self._average_seconds += _DURATION_SMOOTHING * (
+                elapsed - self._average_seconds
+            )
@@ -0,0 +1,114 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+import zlib
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from .config import ArchiveConfig
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS playlists (
+    id TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    archived_at REAL NOT NULL,
+    last_read_at REAL,
+    recent_reads INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+
+class PlaylistArchive:
+    """
+    On-disk store for playlists moved out of Redis: one SQLite row per
+    playlist holding its zlib-compressed JSON. Reads are counted so that
+    playlists which become hot again can be moved back. SQLite calls run in
+    a thread so they don't block the event loop.
+    """
+
+    def __init__(self, config: ArchiveConfig):
+        self.config = config
+        with self._db() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(_SCHEMA)
+
+    @contextmanager
+    def _db(self) -> Iterator[sqlite3.Connection]:
+        db = sqlite3.connect(self.config.path, timeout=30)
+        try:
+            # Commits on success, rolls back on error
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    async def put_many(self, playlists: dict[str, dict[str, Any]]) -> None:
+        """Archive playlists by ID, replacing earlier copies."""
+        await asyncio.to_thread(self._put_many, playlists)
+
+    def _put_many(self, playlists: dict[str, dict[str, Any]]) -> None:
+        now = time.time()
+        rows = [
+            (playlist_id, zlib.compress(json.dumps(data).encode(), 9), now)
+            for playlist_id, data in playlists.items()
+        ]
+        with self._db() as db:
+            db.executemany(
+                "INSERT OR REPLACE INTO playlists (id, body, archived_at) VALUES (?, ?, ?)",
+                rows,
+            )
+
+    async def get_many(
+        self, playlist_ids: list[str]
+    ) -> dict[str, tuple[dict[str, Any], bool]]:
+        """
+        Read archived playlists and count the read.
+
+        Returns:
+            Dictionary mapping found playlist IDs to (playlist data, whether
+            it has been read often enough lately to move back to Redis)
+        """
+        if not playlist_ids:
+            return {}
+        return await asyncio.to_thread(self._get_many, playlist_ids)
+
+    def _get_many(
+        self, playlist_ids: list[str]
+    ) -> dict[str, tuple[dict[str, Any], bool]]:
+        now = time.time()
+        found = {}
+        with self._db() as db:
+            rows = db.execute(
+                "SELECT id, body, last_read_at, recent_reads FROM playlists "
+                f"WHERE id IN ({', '.join('?' * len(playlist_ids))})",
+                playlist_ids,
+            ).fetchall()
+            for playlist_id, body, last_read_at, reads in rows:
+                # Reads only count towards promotion while they keep coming
+                if (
+                    last_read_at is None
+                    or now - last_read_at > self.config.promote_window_seconds
+                ):
+                    reads = 0
+                reads += 1
+                db.execute(
+                    "UPDATE playlists SET last_read_at = ?, recent_reads = ? WHERE id = ?",
+                    (now, reads, playlist_id),
+                )
+                found[playlist_id] = (
+                    json.loads(zlib.decompress(body)),
+                    reads >= self.config.promote_reads,
+                )
+        return found
+
+    async def delete(self, playlist_id: str) -> None:
+        await asyncio.to_thread(self._delete, playlist_id)
+
+    def _delete(self, playlist_id: str) -> None:
+        with self._db() as db:
+            db.execute("DELETE FROM playlists WHERE id = ?", (playlist_id,))
@@ -0,0 +1,106 @@
+import os
+
+from pydantic import BaseModel
+
+
+class CacheConfig(BaseModel):
+    """Playlist cache configuration."""
+
+    # Negative caching of ReccoBeats misses (unknown IDs, missing audio features)
+    negative_ttl_seconds: int = 7 * 24 * 60 * 60
+    bloom_capacity: int = 100_000
+    bloom_error_rate: float = 0.01
+    bloom_rebuild_seconds: int = 300
+
+    # HTTP caching of stored playlists (browsers / shared caches such as a CDN)
+    playlist_max_age_seconds: int = 300
+    playlist_shared_max_age_seconds: int = 24 * 60 * 60
+
+    # Maximum number of IDs per batch read
+    batch_max_ids: int = 100
+
+    # Playlists are stored as track IDs plus shared track and album entities;
+    # rendered response bodies are a cache on top that expires when not in use
+    playlist_body_ttl_seconds: int = 24 * 60 * 60
+    # Track and album entities kept in memory per worker
+    entity_cache_size: int = 20_000
+
+    @classmethod
+    def from_env(cls) -> "CacheConfig":
+        """Create configuration from environment variables."""
+        return cls(
+            negative_ttl_seconds=int(
+                os.getenv("CACHE_NEGATIVE_TTL_SECONDS", str(7 * 24 * 60 * 60))
+            ),
+            bloom_capacity=int(os.getenv("CACHE_BLOOM_CAPACITY", "100000")),
+            bloom_error_rate=float(os.getenv("CACHE_BLOOM_ERROR_RATE", "0.01")),
+            bloom_rebuild_seconds=int(os.getenv("CACHE_BLOOM_REBUILD_SECONDS", "300")),
+            playlist_max_age_seconds=int(
+                os.getenv("CACHE_PLAYLIST_MAX_AGE_SECONDS", "300")
+            ),
+            playlist_shared_max_age_seconds=int(
+                os.getenv("CACHE_PLAYLIST_SHARED_MAX_AGE_SECONDS", str(24 * 60 * 60))
+            ),
+            batch_max_ids=int(os.getenv("CACHE_BATCH_MAX_IDS", "100")),
+            playlist_body_ttl_seconds=int(
+                os.getenv("CACHE_PLAYLIST_BODY_TTL_SECONDS", str(24 * 60 * 60))
+            ),
+            entity_cache_size=int(os.getenv("CACHE_ENTITY_CACHE_SIZE", "20000")),
+        )
+
+
+class AdmissionConfig(BaseModel):
+    """Per-worker admission control for cold playlist generations."""
+
+    # Generations running at once; cache hits don't take a slot
+    max_concurrent: int = 8
+    # Generations waiting for a slot before new ones are rejected with 429
+    max_queue: int = 16
+    # Longest wait for a slot before giving up with 503
+    queue_timeout_seconds: float = 10.0
+
+    @classmethod
+    def from_env(cls) -> "AdmissionConfig":
+        """Create configuration from environment variables."""
+        return cls(
+            max_concurrent=int(os.getenv("GENERATION_MAX_CONCURRENT", "8")),
+            max_queue=int(os.getenv("GENERATION_MAX_QUEUE", "16")),
+            queue_timeout_seconds=float(
+                os.getenv("GENERATION_QUEUE_TIMEOUT_SECONDS", "10.0")
+            ),
+        )
+
+
+class ArchiveConfig(BaseModel):
+    """Tiering of playlists nobody reads out of Redis into a local archive."""
+
+    enabled: bool = False
+    # SQLite database; every worker that serves reads needs access to it
+    path: str = "playlist_archive.sqlite3"
+    # Playlists not read for this long are moved out of Redis. Reads served
+    # from cached bodies aren't seen, so keep this well above the body TTL
+    idle_days: float = 30.0
+    sweep_interval_seconds: float = 60 * 60
+    sweep_batch_size: int = 200
+    # Archived playlists are served from the archive until read this many
+    # times with no more than the window between reads, then moved back
+    promote_reads: int = 2
+    promote_window_seconds: float = 7 * 24 * 60 * 60
+
+    @classmethod
+    def from_env(cls) -> "ArchiveConfig":
+        """Create configuration from environment variables."""
+        return cls(
+            enabled=os.getenv("ARCHIVE_ENABLED", "false").lower()
+            in ("1", "true", "yes"),
+            path=os.getenv("ARCHIVE_PATH", "playlist_archive.sqlite3"),
+            idle_days=float(os.getenv("ARCHIVE_IDLE_DAYS", "30")),
+            sweep_interval_seconds=float(
+                os.getenv("ARCHIVE_SWEEP_INTERVAL_SECONDS", str(60 * 60))
+            ),
+            sweep_batch_size=int(os.getenv("ARCHIVE_SWEEP_BATCH_SIZE", "200")),
+            promote_reads=int(os.getenv("ARCHIVE_PROMOTE_READS", "2")),
+            promote_window_seconds=float(
+                os.getenv("ARCHIVE_PROMOTE_WINDOW_SECONDS", str(7 * 24 * 60 * 60))
+            ),
+        )
@@ -0,0 +1,74 @@
+import gzip
+
+import brotli
+
+# Content codings stored for each playlist, in server preference order
+ENCODINGS = ("br", "gzip")
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """
+    Compress a response body with maximum effort; this runs once per
+    playlist at write time, not per request.
+    """
+    if encoding == "br":
+        return brotli.compress(body, mode=brotli.MODE_TEXT, quality=11)
+    if encoding == "gzip":
+        # Fixed mtime so the same body always compresses to the same bytes
+        return gzip.compress(body, compresslevel=9, mtime=0)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def encode_variants(
+    bodies: dict[str, bytes],
+) -> dict[tuple[str, str | None], bytes]:
+    """
+    Every stored variant of a playlist's views, keyed by (view, encoding)
+    with None for the uncompressed body. CPU-bound, so run it off the event
+    loop.
+    """
+    variants = {}
+    for view, body in bodies.items():
+        variants[view, None] = body
+        for encoding in ENCODINGS:
+            variants[view, encoding] = compress(body, encoding)
+    return variants
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """
+    Pick a stored content coding from an Accept-Encoding header, or None
+    for the uncompressed body.
+    """
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding.strip().lower()] = q
+
+    best, best_q = None, 0.0
+    for encoding in ENCODINGS:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def representation_etag(
+    etag: str, encoding: str | None, variant: str | None = None
+) -> str:
+    """
+    ETag of a representation (a view or field selection, possibly encoded),
+    derived from the ETag of the full uncompressed body.
+    """
+    suffix = "".join(f"-{part}" for part in (variant, encoding) if part)
+    return f'{etag[:-1]}{suffix}"' if suffix else etag
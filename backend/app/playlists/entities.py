@@ -0,0 +1,174 @@
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from typing import Any
+
+from ..db.redis import RedisClient
+from .models import PlaylistResponse
+
+logger = logging.getLogger(__name__)
+
+
+def track_key(track_id: str, version: str | None = None) -> str:
+    return f"track:{track_id}:{version}" if version else f"track:{track_id}"
+
+
+def album_key(album_id: str, version: str | None = None) -> str:
+    return f"album:{album_id}:{version}" if version else f"album:{album_id}"
+
+
+def entity_version(value: bytes) -> str:
+    """Digest of an entity's stored value, part of its key."""
+    return hashlib.blake2b(value, digest_size=8).hexdigest()
+
+
+class EntityCache:
+    """Bounded in-process LRU of track and album entities, by Redis key."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        entity = self._entries.get(key)
+        if entity is not None:
+            self._entries.move_to_end(key)
+        return entity
+
+    def put(self, key: str, entity: dict[str, Any]) -> None:
+        self._entries[key] = entity
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class EntityStore:
+    """
+    Tracks and albums stored once in Redis, keyed by Spotify ID and a digest
+    of their content, and shared by every playlist containing them. Metadata
+    that changes is stored as a new version beside the old one, so stored
+    playlists keep the exact content their ETag was computed from. Playlists
+    only keep ordered track keys and are hydrated in bulk, from memory first.
+    Each entity keeps the IDs of the stored playlists referring to it and is
+    deleted once none are left, e.g. after they're all archived.
+    """
+
+    def __init__(self, redis_client: RedisClient, cache: EntityCache):
+        self.redis_client = redis_client
+        self.cache = cache
+
+    def normalize(
+        self, playlist: PlaylistResponse, cache: bool = True
+    ) -> tuple[dict[str, Any], dict[str, bytes]]:
+        """
+        Split a playlist into its record (the playlist fields and ordered
+        track keys) and the stored values of its track and album entities,
+        which are kept in memory too unless cache is False.
+        """
+        record = playlist.model_dump(exclude={"tracks"})
+        record["trackKeys"] = []
+
+        entities = {}
+        for track in playlist.tracks:
+            entity = track.model_dump(exclude={"album"})
+            album_id = track.album.get("id")
+            if album_id:
+                value = json.dumps(track.album).encode()
+                key = album_key(album_id, entity_version(value))
+                entity["albumKey"] = key
+                if cache:
+                    self.cache.put(key, track.album)
+                entities[key] = value
+            else:
+                # Nothing to share it by, so the album stays embedded
+                entity["album"] = track.album
+            value = json.dumps(entity).encode()
+            key = track_key(track.id, entity_version(value))
+            if cache:
+                self.cache.put(key, entity)
+            entities[key] = value
+            record["trackKeys"].append(key)
+        return record, entities
+
+    async def store(self, playlist_id: str, entities: dict[str, bytes]) -> bool:
+        """Store a playlist's entities, referred to by it."""
+        return await self.redis_client.set_referenced(entities, playlist_id)
+
+    async def release(self, playlist_id: str, playlist: PlaylistResponse) -> int:
+        """
+        Remove a playlist no longer stored in Redis from the referrers of
+        its entities, deleting those no other playlist refers to.
+
+        Returns:
+            How many entities were deleted
+        """
+        _, entities = self.normalize(playlist, cache=False)
+        return await self.redis_client.release_referenced(list(entities), playlist_id)
+
+    async def adopt(self, playlist_id: str, keys: list[str]) -> bool:
+        """
+        Add a playlist stored before entities kept their referrers to the
+        referrers of its tracks, by key, and of their albums.
+        """
+        tracks = await self._load(list(set(keys)))
+        albums = {track["albumKey"] for track in tracks.values() if "albumKey" in track}
+        return await self.redis_client.add_referrer([*tracks, *albums], playlist_id)
+
+    async def hydrate(self, keys: list[str]) -> dict[str, dict[str, Any]]:
+        """
+        Full tracks, albums included, by track key: from memory, then with
+        one MGET for the missing tracks and one for their missing albums.
+        Tracks whose entities are gone are left out.
+        """
+        tracks = await self._load(list(set(keys)))
+        albums = await self._load(
+            list({_album_key_of(t) for t in tracks.values()} - {None})
+        )
+
+        hydrated = {}
+        for key, track in tracks.items():
+            track = dict(track)
+            album = _album_key_of(track)
+            track.pop("albumKey", None)
+            track.pop("albumId", None)
+            if album is not None:
+                if album not in albums:
+                    continue
+                track["album"] = albums[album]
+            hydrated[key] = track
+        return hydrated
+
+    async def _load(self, keys: list[str]) -> dict[str, dict[str, Any]]:
+        found = {}
+        missing = []
+        for key in keys:
+            entity = self.cache.get(key)
+            if entity is None:
+                missing.append(key)
+            else:
+                found[key] = entity
+
+        if missing:
+            values = await self.redis_client.mget_bytes(*missing)
+            for key, value in zip(missing, values, strict=True):
+                if value is not None:
+                    entity = json.loads(value)
+                    self.cache.put(key, entity)
+                    found[key] = entity
+            logger.info(
+                f"Loaded {len(found)}/{len(keys)} entities, {len(missing)} from Redis"
+            )
+        return found
+
+
+def _album_key_of(track: dict[str, Any]) -> str | None:
+    """The key of a track entity's album, also for entities stored unversioned."""
+    if "albumKey" in track:
+        return track["albumKey"]
+    if "albumId" in track:
+        return album_key(track["albumId"])
+    return None
@@ -0,0 +1,49 @@
+"""
+One-off migration of generated playlists stored whole under their parameter
+keys, from before those keys became pointers to stored playlists.
+
+    python -m app.playlists.migrate
+
+Safe to run while the app serves and to run again; reads convert the keys
+they touch lazily either way.
+"""
+
+import asyncio
+import logging
+
+from dotenv import load_dotenv
+
+from ..dependencies import (
+    get_archive_config,
+    get_cache_config,
+    get_entity_cache,
+    get_negative_cache,
+    get_playlist_archive,
+    get_playlist_repo,
+    get_redis_client,
+    get_redis_config,
+)
+
+
+async def main() -> None:
+    redis_client = get_redis_client(get_redis_config())
+    await redis_client.connect()
+    try:
+        cache_config = get_cache_config()
+        repo = get_playlist_repo(
+            redis_client,
+            get_negative_cache(cache_config),
+            cache_config,
+            get_entity_cache(cache_config),
+            get_playlist_archive(get_archive_config()),
+        )
+        await repo.migrate_generated_playlists()
+    finally:
+        await redis_client.disconnect()
+
+
+if __name__ == "__main__":
+    # Read the same .env as the app before any config is
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
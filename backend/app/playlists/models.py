@@ -13,6 +13,12 @@ class PlaylistRequest(BaseModel):
     duration: int = Field(30, ge=5, le=120, description="Playlist duration in minutes")
 
 
+class PlaylistBatchRequest(BaseModel):
+    """Request model for generating several playlists at once."""
+
+    requests: list[PlaylistRequest] = Field(..., min_length=1, max_length=25)
+
+
 class Track(BaseModel):
     """Track model for API responses."""
 
@@ -38,4 +44,37 @@ class PlaylistResponse(BaseModel):
     createdAt: str
     # NEW: Add activity and vibe to the response
     activity: str
-    vibe: str
\ No newline at end of file
+    vibe: str
+
+
+class TrackSummary(BaseModel):
+    """Slim track model for list and summary views, without the album object."""
+
+    id: str
+    name: str
+    artist: str
+    duration: int  # Duration in milliseconds
+    spotifyUrl: str
+    coverUrl: str | None = None  # Smallest album image
+
+
+class PlaylistSummary(BaseModel):
+    """Slim playlist model for list and summary views."""
+
+    id: str
+    name: str
+    description: str
+    spotifyUrl: str
+    imageUrl: str
+    tracks: list[TrackSummary]
+    duration: int  # Total playlist duration in minutes
+    createdAt: str
+    activity: str
+    vibe: str
+
+
+class PlaylistBatchResponse(BaseModel):
+    """Response model for batch playlist reads."""
+
+    playlists: list[PlaylistResponse | PlaylistSummary]
+    missing: list[str]  # Requested IDs that were not found
@@ -0,0 +1,174 @@
+import asyncio
+import hashlib
+import logging
+import math
+import time
+
+from ..db.redis import RedisClient
+from .config import CacheConfig
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings using double hashing."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity = max(1, capacity)
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item)
+        )
+
+    @property
+    def full(self) -> bool:
+        """Whether adding more items would push it past its error rate."""
+        return self.count >= self.capacity
+
+
+class NegativeCache:
+    """
+    Negative-result cache for IDs an upstream is known not to have.
+
+    The source of truth is one Redis sorted set per namespace, scored by expiry
+    time, so negatives are shared across workers and age out after the TTL.
+    An in-memory Bloom filter built from that set answers "definitely not
+    negative" without a Redis round trip; its hits are confirmed against the
+    set, so a false positive costs a lookup rather than a dropped track. It is
+    rebuilt periodically to drop expired IDs, and as soon as it fills up.
+    """
+
+    def __init__(self, config: CacheConfig):
+        self.config = config
+        self._filters: dict[str, BloomFilter] = {}
+        self._built_at: dict[str, float] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    @staticmethod
+    def _set_key(namespace: str) -> str:
+        return f"negative:{namespace}"
+
+    def _new_filter(self, expected: int) -> BloomFilter:
+        return BloomFilter(
+            max(self.config.bloom_capacity, 2 * expected), self.config.bloom_error_rate
+        )
+
+    async def maybe_rebuild(self, redis_client: RedisClient, namespace: str) -> None:
+        """Rebuild the namespace filter from Redis if it is missing or stale."""
+        built_at = self._built_at.get(namespace, 0.0)
+        if time.time() - built_at < self.config.bloom_rebuild_seconds:
+            return
+
+        lock = self._locks.setdefault(namespace, asyncio.Lock())
+        if lock.locked():
+            return
+        async with lock:
+            now = time.time()
+            key = self._set_key(namespace)
+            await redis_client.zremrangebyscore(key, "-inf", now)
+            members = await redis_client.zrangebyscore(key, now, "+inf")
+
+            bloom = self._new_filter(len(members))
+            for member in members:
+                bloom.add(member)
+            self._filters[namespace] = bloom
+            self._built_at[namespace] = now
+            logger.info(
+                f"Rebuilt negative cache filter for {namespace} with {len(members)} IDs"
+            )
+
+    async def partition(
+        self, redis_client: RedisClient, namespace: str, ids: list[str]
+    ) -> tuple[list[str], list[str]]:
+        """
+        Split IDs into (known negative, unknown). Filter hits are confirmed
+        with a single ZMSCORE on the negative set; misses need no round trip.
+        """
+        bloom = self._filters.get(namespace)
+        if bloom is None or bloom.count == 0:
+            return [], list(ids)
+
+        candidates, remaining = [], []
+        for item in ids:
+            (candidates if item in bloom else remaining).append(item)
+        if not candidates:
+            return [], remaining
+
+        now = time.time()
+        scores = await redis_client.zmscore(self._set_key(namespace), *candidates)
+        negative = []
+        for item, expires_at in zip(candidates, scores, strict=True):
+            if expires_at is not None and expires_at > now:
+                negative.append(item)
+            else:
+                # A false positive, or a negative that has since expired
+                remaining.append(item)
+        return negative, remaining
+
+    async def lookup(
+        self, redis_client: RedisClient, namespace: str, ids: list[str]
+    ) -> set[str]:
+        """
+        Check the Redis negative set for IDs the local filter hasn't seen yet,
+        e.g. misses recorded by another worker. Found IDs are added to the filter.
+        """
+        if not ids:
+            return set()
+
+        now = time.time()
+        scores = await redis_client.zmscore(self._set_key(namespace), *ids)
+        found = {
+            item
+            for item, expires_at in zip(ids, scores, strict=True)
+            if expires_at is not None and expires_at > now
+        }
+        await self._remember(redis_client, namespace, found)
+        return found
+
+    async def add(
+        self, redis_client: RedisClient, namespace: str, ids: set[str]
+    ) -> None:
+        """Record IDs as negative for the configured TTL."""
+        if not ids:
+            return
+
+        expires_at = time.time() + self.config.negative_ttl_seconds
+        await redis_client.zadd(
+            self._set_key(namespace), dict.fromkeys(ids, expires_at)
+        )
+        await self._remember(redis_client, namespace, ids)
+        logger.info(f"Cached {len(ids)} negative results for {namespace}")
+
+    async def _remember(
+        self, redis_client: RedisClient, namespace: str, ids: set[str]
+    ) -> None:
+        if not ids:
+            return
+        bloom = self._filters.get(namespace)
+        if bloom is None:
+            bloom = self._filters[namespace] = self._new_filter(0)
+        for item in ids:
+            if item not in bloom:
+                bloom.add(item)
+        if bloom.full:
+            # Past capacity the false-positive rate climbs, so resize now
+            self._built_at[namespace] = 0.0
+            await self.maybe_rebuild(redis_client, namespace)
@@ -0,0 +1,111 @@
+import hashlib
+import json
+from typing import Any
+
+from .models import PlaylistResponse, PlaylistSummary, Track, TrackSummary
+
+# Precomputed projections stored next to each playlist; "full" is the
+# complete PlaylistResponse
+VIEWS = ("full", "summary")
+
+
+class InvalidFieldsError(ValueError):
+    """Raised when a fields selection names unknown fields."""
+
+
+def cover_url(album: dict[str, Any]) -> str | None:
+    """URL of the smallest image of a Spotify album object."""
+    images = album.get("images") or []
+    # Spotify lists album images largest first
+    cover = min(images, key=lambda image: image.get("width") or 0, default=None)
+    return cover.get("url") if cover else None
+
+
+def summarize_playlist(playlist: PlaylistResponse) -> PlaylistSummary:
+    """Build the summary projection of a validated playlist."""
+    tracks = [
+        TrackSummary(
+            id=track.id,
+            name=track.name,
+            artist=track.artist,
+            duration=track.duration,
+            spotifyUrl=track.spotifyUrl,
+            coverUrl=cover_url(track.album),
+        )
+        for track in playlist.tracks
+    ]
+    return PlaylistSummary(**playlist.model_dump(exclude={"tracks"}), tracks=tracks)
+
+
+def render_views(playlist: PlaylistResponse) -> dict[str, bytes]:
+    """Render the response body of every view of a validated playlist."""
+    return {
+        "full": playlist.model_dump_json().encode(),
+        "summary": summarize_playlist(playlist).model_dump_json().encode(),
+    }
+
+
+def parse_fields(fields: str) -> tuple[list[str], list[str] | None]:
+    """
+    Parse a fields selection such as "id,name,tracks.name,tracks.artist" into
+    (playlist fields, track fields). Track fields are None when whole tracks
+    are selected or tracks aren't selected at all.
+    """
+    playlist_fields, track_fields = [], []
+    for field in filter(None, (f.strip() for f in fields.split(","))):
+        if field.startswith("tracks."):
+            track_fields.append(field.removeprefix("tracks."))
+        else:
+            playlist_fields.append(field)
+
+    known_track_fields = Track.model_fields.keys() | TrackSummary.model_fields.keys()
+    unknown = [f for f in playlist_fields if f not in PlaylistResponse.model_fields]
+    unknown += [f"tracks.{f}" for f in track_fields if f not in known_track_fields]
+    if unknown:
+        raise InvalidFieldsError(f"Unknown fields: {', '.join(unknown)}")
+    if not playlist_fields and not track_fields:
+        raise InvalidFieldsError("No fields selected")
+
+    if track_fields and "tracks" not in playlist_fields:
+        playlist_fields.append("tracks")
+    return playlist_fields, (track_fields or None)
+
+
+def source_view(playlist_fields: list[str], track_fields: list[str] | None) -> str:
+    """
+    The smallest stored view to project the selected fields from. Summary-only
+    track fields are derived when projecting from the full view.
+    """
+    if "tracks" in playlist_fields and track_fields is None:
+        return "full"
+    if track_fields and not set(track_fields) <= TrackSummary.model_fields.keys():
+        return "full"
+    return "summary"
+
+
+def project(
+    body: bytes, playlist_fields: list[str], track_fields: list[str] | None
+) -> bytes:
+    """Select fields from a serialized playlist."""
+    data = json.loads(body)
+    projected = {field: data[field] for field in playlist_fields if field in data}
+    if track_fields is not None:
+        projected["tracks"] = [
+            _project_track(track, track_fields) for track in data.get("tracks", [])
+        ]
+    return json.dumps(projected, separators=(",", ":")).encode()
+
+
+def _project_track(track: dict[str, Any], track_fields: list[str]) -> dict[str, Any]:
+    if "coverUrl" in track_fields and "album" in track:
+        # A full track has no coverUrl, so derive it as the summary view does
+        track = {**track, "coverUrl": cover_url(track["album"])}
+    return {field: track[field] for field in track_fields if field in track}
+
+
+def fields_variant(playlist_fields: list[str], track_fields: list[str] | None) -> str:
+    """Stable name of a fields selection, used to derive its ETag."""
+    selection = (
+        ",".join(sorted(playlist_fields)) + "|" + ",".join(sorted(track_fields or []))
+    )
+    return "f" + hashlib.blake2b(selection.encode(), digest_size=4).hexdigest()
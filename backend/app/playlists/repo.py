@@ -1,13 +1,33 @@
+import asyncio
 import hashlib
 import json
 import logging
+import time
 from collections.abc import Callable
 from typing import Any
 
 from ..db.redis import RedisClient
+from ..observability.metrics import record_cache_lookup
+from ..observability.tracing import current_span, traced
+from .archive import PlaylistArchive
+from .config import CacheConfig
+from .encoding import ENCODINGS, compress, encode_variants
+from .entities import EntityCache, EntityStore, track_key
+from .models import PlaylistResponse
+from .negative_cache import NegativeCache
+from .projections import VIEWS, render_views
 
 logger = logging.getLogger(__name__)
 
+# Sorted set of playlist IDs scored by when their bodies were last rendered,
+# i.e. roughly when they were last read, kept while archiving is enabled
+_LAST_READ_KEY = "playlist_last_read"
+# Set once playlists stored before reads were tracked have been added
+_LAST_READ_SEEDED_KEY = "playlist_last_read:seeded"
+# Set once the entities of records stored before entities kept their
+# referrers have been adopted by them
+_REFERRERS_SEEDED_KEY = "entity_referrers:seeded"
+
 
 class PlaylistRepo:
     """
@@ -15,8 +35,69 @@ class PlaylistRepo:
     Uses callback pattern to handle cache-miss scenarios.
     """
 
-    def __init__(self, redis_client: RedisClient):
+    def __init__(
+            self,
+            redis_client: RedisClient,
+            negative_cache: NegativeCache | None = None,
+            config: CacheConfig | None = None,
+            entity_cache: EntityCache | None = None,
+            archive: PlaylistArchive | None = None,
+    ):
         self.redis_client = redis_client
+        self.negative_cache = negative_cache
+        self.archive = archive
+        self.config = config or CacheConfig()
+        self.entities = EntityStore(
+            redis_client, entity_cache or EntityCache(self.config.entity_cache_size)
+        )
+
+    async def _filter_known_negatives(
+            self, namespace: str, ids: list[str]
+    ) -> list[str]:
+        """Drop IDs known to be negative for a namespace before any lookup."""
+        if self.negative_cache is None:
+            return ids
+
+        await self.negative_cache.maybe_rebuild(self.redis_client, namespace)
+        negative, remaining = await self.negative_cache.partition(
+            self.redis_client, namespace, ids
+        )
+        record_cache_lookup(namespace, "negative", len(negative))
+        current_span().set_attribute("negative_hits", len(negative))
+        if negative:
+            logger.info(
+                f"Negative cache short-circuited {len(negative)} {namespace} lookups"
+            )
+        return remaining
+
+    async def _fetch_missing(
+            self,
+            namespace: str,
+            missing_ids: list[str],
+            fetch_callback: Callable[[list[str], set[str]], dict[str, Any]],
+    ) -> dict[str, Any]:
+        """
+        Fetch cache misses via callback, skipping IDs another worker has already
+        recorded as negative, and record the callback's definitive misses.
+        Callbacks make blocking HTTP calls, so they run in a worker thread.
+        """
+        if self.negative_cache is not None:
+            known = await self.negative_cache.lookup(
+                self.redis_client, namespace, missing_ids
+            )
+            record_cache_lookup(namespace, "negative", len(known))
+            missing_ids = [i for i in missing_ids if i not in known]
+            if not missing_ids:
+                return {}
+
+        not_found: set[str] = set()
+        fresh_data = await asyncio.to_thread(fetch_callback, missing_ids, not_found)
+
+        if self.negative_cache is not None:
+            await self.negative_cache.add(
+                self.redis_client, namespace, not_found - fresh_data.keys()
+            )
+        return fresh_data
 
     def _generate_cache_key(self, prefix: str, **kwargs) -> str:
         """Generate a consistent cache key from parameters."""
@@ -25,12 +106,25 @@ class PlaylistRepo:
         params_hash = hashlib.md5(params_str.encode()).hexdigest()
         return f"{prefix}:{params_hash}"
 
+    @staticmethod
+    def playlist_etag(body: bytes) -> str:
+        """Strong HTTP entity tag for a serialized playlist."""
+        return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
     async def store_playlist_by_id(
             self, playlist_id: str, playlist_data: dict[str, Any]
     ) -> bool:
         """
         Store a playlist by its ID for direct retrieval.
 
+        The playlist is validated once here and stored as a small record of
+        its fields and ordered track IDs, with its tracks and albums stored
+        once as shared entities. The exact bytes of the API response, its
+        slim projections and precompressed variants are cached alongside
+        until they go unread for a while, so hot reads don't pay for
+        hydration, projection or compression, and the ETag is kept so
+        conditional requests don't load the body.
+
         Args:
             playlist_id: The playlist ID to use as key
             playlist_data: Complete playlist data
@@ -38,17 +132,104 @@ class PlaylistRepo:
         Returns:
             True if stored successfully
         """
-        cache_key = f"playlist_by_id:{playlist_id}"
-
         try:
-            success = await self.redis_client.set_json(cache_key, playlist_data)
+            playlist = PlaylistResponse(**playlist_data)
+            bodies = render_views(playlist)
+            success = await self._store_record(playlist_id, playlist, bodies)
             if success:
+                await self._cache_bodies(playlist_id, bodies)
                 logger.info(f"Stored playlist by ID: {playlist_id}")
             return success
         except Exception as e:
             logger.error(f"Failed to store playlist by ID {playlist_id}: {e}")
             return False
 
+    @staticmethod
+    def _record_key(playlist_id: str) -> str:
+        # The ID is a hash tag, so all keys of a playlist share one shard or
+        # cluster slot and are read together in a single MGET
+        return f"playlist_by_id:{{{playlist_id}}}"
+
+    @staticmethod
+    def _etag_key(playlist_id: str) -> str:
+        return f"playlist_by_id:{{{playlist_id}}}:etag"
+
+    @staticmethod
+    def _representation_key(
+            playlist_id: str, view: str = "full", encoding: str | None = None
+    ) -> str:
+        parts = [f"playlist_body:{{{playlist_id}}}"]
+        if view != "full":
+            parts.append(view)
+        if encoding:
+            parts.append(encoding)
+        return ":".join(parts)
+
+    @classmethod
+    def _representation_keys(cls, playlist_id: str) -> list[str]:
+        return [
+            cls._representation_key(playlist_id, view, encoding)
+            for view in VIEWS
+            for encoding in (None, *ENCODINGS)
+        ]
+
+    @staticmethod
+    def _legacy_playlist_key(playlist_id: str) -> str:
+        """Key of the full body as stored before keys were hash-tagged."""
+        return f"playlist_by_id:{playlist_id}"
+
+    @staticmethod
+    def _legacy_representation_keys(playlist_id: str) -> list[str]:
+        """Keys of the views and variants stored next to whole playlists."""
+        base = f"playlist_by_id:{{{playlist_id}}}"
+        keys = [f"{base}:{encoding}" for encoding in ENCODINGS]
+        for view in VIEWS:
+            if view != "full":
+                keys.append(f"{base}:{view}")
+                keys.extend(f"{base}:{view}:{encoding}" for encoding in ENCODINGS)
+        return keys
+
+    async def _store_record(
+            self, playlist_id: str, playlist: PlaylistResponse, bodies: dict[str, bytes]
+    ) -> bool:
+        record, entities = self.entities.normalize(playlist)
+        # Entities first, so a stored record never refers to missing ones
+        if not await self.entities.store(playlist_id, entities):
+            return False
+        return await self.redis_client.mset_bytes(
+            {
+                self._record_key(playlist_id): json.dumps(record),
+                self._etag_key(playlist_id): self.playlist_etag(bodies["full"]),
+            }
+        )
+
+    async def _cache_bodies(
+            self, playlist_id: str, bodies: dict[str, bytes]
+    ) -> dict[tuple[str, str | None], bytes]:
+        """
+        Compress a playlist's views off the event loop and cache every
+        variant.
+
+        Returns:
+            The variants, keyed by (view, encoding)
+        """
+        variants = await asyncio.to_thread(encode_variants, bodies)
+        await self.redis_client.mset_bytes(
+            {
+                self._representation_key(playlist_id, view, encoding): body
+                for (view, encoding), body in variants.items()
+            },
+            self.config.playlist_body_ttl_seconds,
+        )
+        if self.archive is not None:
+            await self.redis_client.zadd(_LAST_READ_KEY, {playlist_id: time.time()})
+        return variants
+
+    async def get_playlist_etag(self, playlist_id: str) -> str | None:
+        """Get the stored ETag of a playlist, if any."""
+        return await self.redis_client.get(self._etag_key(playlist_id))
+
+    @traced("repo.get_playlist_by_id")
     async def get_playlist_by_id(self, playlist_id: str) -> dict[str, Any] | None:
         """
         Get a playlist by its ID.
@@ -59,10 +240,19 @@ class PlaylistRepo:
         Returns:
             Playlist data if found, None otherwise
         """
-        cache_key = f"playlist_by_id:{playlist_id}"
-
         try:
-            playlist_data = await self.redis_client.get_json(cache_key)
+            playlist_data = await self.redis_client.get_json(
+                self._representation_key(playlist_id)
+            )
+            if playlist_data is None:
+                loaded = await self._load_playlists([playlist_id])
+                if playlist_id in loaded:
+                    playlist_data, source = loaded[playlist_id]
+                    await self._promote(playlist_id, playlist_data, source)
+            record_cache_lookup("playlist_by_id", "hit" if playlist_data else "miss")
+            current_span().set_attributes(
+                playlist_id=playlist_id, cache_hit=bool(playlist_data)
+            )
             if playlist_data:
                 logger.info(f"Found playlist by ID: {playlist_id}")
             return playlist_data
@@ -70,6 +260,302 @@ class PlaylistRepo:
             logger.error(f"Failed to get playlist by ID {playlist_id}: {e}")
             return None
 
+    @traced("repo.get_playlist_representation")
+    async def get_playlist_representation(
+            self, playlist_id: str, encoding: str | None = None, view: str = "full"
+    ) -> tuple[bytes | None, str | None]:
+        """
+        Get a playlist by its ID as a serialized response body.
+
+        Bodies that expired are rendered again from the playlist's record,
+        playlists stored whole before records existed are migrated on first
+        read, and archived playlists are read from the archive.
+
+        Args:
+            playlist_id: The playlist ID to retrieve
+            encoding: Content coding of the variant to return, or None for
+                the uncompressed body
+            view: Stored projection to return ("full" or "summary")
+
+        Returns:
+            (body, ETag of the full uncompressed body), or (None, None) if not found
+        """
+        body, etag = await self.redis_client.mget_bytes(
+            self._representation_key(playlist_id, view, encoding),
+            self._etag_key(playlist_id),
+        )
+        if body is None or etag is None:
+            loaded = await self._load_playlists([playlist_id])
+            if playlist_id in loaded:
+                playlist_data, source = loaded[playlist_id]
+                variants = await self._promote(playlist_id, playlist_data, source)
+                body = variants.get((view, encoding))
+                if body is None:
+                    # Not cached, so only the requested variant is compressed
+                    body = await asyncio.to_thread(
+                        compress, variants[view, None], encoding
+                    )
+                # A record renders to the body its stored ETag was computed from
+                if etag is None or source != "record":
+                    etag = self.playlist_etag(variants["full", None]).encode()
+
+        record_cache_lookup("playlist_by_id", "hit" if body else "miss")
+        current_span().set_attributes(
+            playlist_id=playlist_id,
+            view=view,
+            encoding=encoding or "identity",
+            cache_hit=bool(body),
+        )
+        if not body:
+            return None, None
+        logger.info(f"Found playlist by ID: {playlist_id}")
+        return body, etag.decode()
+
+    @traced("repo.get_playlist_representations")
+    async def get_playlist_representations(
+            self, playlist_ids: list[str], view: str = "full"
+    ) -> dict[str, bytes]:
+        """
+        Get several playlists as serialized response bodies in one round trip.
+
+        Args:
+            playlist_ids: The playlist IDs to retrieve
+            view: Stored projection to return ("full" or "summary")
+
+        Returns:
+            Dictionary mapping found playlist IDs to response bodies
+        """
+        bodies = await self.redis_client.mget_bytes(
+            *(self._representation_key(pid, view) for pid in playlist_ids)
+        )
+        found = {
+            pid: body for pid, body in zip(playlist_ids, bodies, strict=True) if body
+        }
+
+        # Playlists whose bodies expired are rendered again from their records,
+        # with their tracks hydrated together
+        unresolved = [pid for pid in playlist_ids if pid not in found]
+        if unresolved:
+            loaded = await self._load_playlists(unresolved)
+            for pid, (playlist_data, source) in loaded.items():
+                variants = await self._promote(pid, playlist_data, source)
+                found[pid] = variants[view, None]
+
+        record_cache_lookup("playlist_by_id", "hit", len(found))
+        record_cache_lookup("playlist_by_id", "miss", len(playlist_ids) - len(found))
+        current_span().set_attributes(
+            requested=len(playlist_ids), found=len(found), view=view
+        )
+        logger.info(f"Found {len(found)}/{len(playlist_ids)} playlists by ID")
+        return found
+
+    async def _load_playlists(
+            self, playlist_ids: list[str], include_archived: bool = True
+    ) -> dict[str, tuple[dict[str, Any], str]]:
+        """
+        Load playlists from their records, hydrating all their tracks at once,
+        and then from the archive.
+
+        Returns:
+            Dictionary mapping found playlist IDs to (playlist data, source):
+            "record"; "unversioned" if its record predates versioned entities;
+            "partial" if some of its entities are gone and only the tracks
+            left were loaded; "whole" if still stored whole and needing
+            migration to a record; "archived" if read from the archive; or
+            "restored" if read from the archive often enough to move back to
+            Redis
+        """
+        values = await self.redis_client.mget_bytes(
+            *(self._record_key(pid) for pid in playlist_ids),
+            *(self._legacy_playlist_key(pid) for pid in playlist_ids),
+        )
+        records = {}
+        loaded = {}
+        count = len(playlist_ids)
+        for pid, record, legacy in zip(
+            playlist_ids, values[:count], values[count:], strict=True
+        ):
+            stored = record or legacy
+            if stored is None:
+                continue
+            data = json.loads(stored)
+            if "trackKeys" in data:
+                records[pid] = (data.pop("trackKeys"), data, "record")
+            elif "trackIds" in data:
+                keys = [track_key(track_id) for track_id in data.pop("trackIds")]
+                records[pid] = (keys, data, "unversioned")
+            else:
+                loaded[pid] = (data, "whole")
+
+        if records:
+            tracks = await self.entities.hydrate(
+                [key for keys, _, _ in records.values() for key in keys]
+            )
+            for pid, (keys, record, source) in records.items():
+                record["tracks"] = [tracks[key] for key in keys if key in tracks]
+                if len(record["tracks"]) < len(keys):
+                    logger.error(
+                        f"Playlist {pid} is missing "
+                        f"{len(keys) - len(record['tracks'])} track entities"
+                    )
+                    source = "partial"
+                loaded[pid] = (record, source)
+
+        if self.archive is not None and include_archived:
+            archived = await self.archive.get_many(
+                [pid for pid in playlist_ids if pid not in loaded]
+            )
+            for pid, (data, hot) in archived.items():
+                loaded[pid] = (data, "restored" if hot else "archived")
+        return loaded
+
+    async def _promote(
+            self, playlist_id: str, playlist_data: dict[str, Any], source: str
+    ) -> dict[tuple[str, str | None], bytes]:
+        """
+        Render a loaded playlist and, unless it's only being read from the
+        archive or is missing tracks, cache its bodies again. Playlists still
+        stored whole are migrated to a record and shared entities, records
+        of unversioned entities are stored again with versioned ones, and
+        restored playlists are moved out of the archive.
+
+        Returns:
+            The rendered variants keyed by (view, encoding); only the
+            uncompressed ones unless the bodies were cached
+        """
+        playlist = PlaylistResponse(**playlist_data)
+        bodies = render_views(playlist)
+        if source in ("archived", "partial"):
+            # Cached, a partial body would outlive the missing tracks' return
+            return {(view, None): body for view, body in bodies.items()}
+
+        # A record's versioned entities render its stored body, so the
+        # stored ETag stands
+        if source != "record" and await self._store_record(
+            playlist_id, playlist, bodies
+        ):
+            if source == "whole":
+                logger.info(f"Migrated playlist {playlist_id} to a record")
+                await self.redis_client.delete(
+                    self._legacy_playlist_key(playlist_id),
+                    *self._legacy_representation_keys(playlist_id),
+                )
+            elif source == "unversioned":
+                logger.info(f"Versioned the entities of playlist {playlist_id}")
+            else:
+                logger.info(f"Restored playlist {playlist_id} from the archive")
+                await self.archive.delete(playlist_id)
+        return await self._cache_bodies(playlist_id, bodies)
+
+    async def seed_last_read(self) -> None:
+        """
+        Once, track playlists stored before reads were tracked as read now,
+        so they become eligible for archiving too.
+        """
+        if await self.redis_client.exists(_LAST_READ_SEEDED_KEY):
+            return
+
+        playlist_ids = set()
+        async for key in self.redis_client.scan("playlist_by_id:*"):
+            suffix = key.removeprefix("playlist_by_id:")
+            if suffix.startswith("{") and suffix.endswith("}"):
+                playlist_ids.add(suffix[1:-1])
+            elif "{" not in suffix and ":" not in suffix:
+                playlist_ids.add(suffix)
+
+        now = time.time()
+        ids = sorted(playlist_ids)
+        for i in range(0, len(ids), 1000):
+            await self.redis_client.zadd(
+                _LAST_READ_KEY, dict.fromkeys(ids[i : i + 1000], now), nx=True
+            )
+        await self.redis_client.set(_LAST_READ_SEEDED_KEY, "1")
+        logger.info(f"Tracking reads of {len(ids)} existing playlists for archiving")
+
+    async def seed_entity_references(self) -> None:
+        """
+        Once, add playlists stored before entities kept their referrers to
+        the referrers of their entities, so archiving others doesn't delete
+        entities they still use.
+        """
+        if await self.redis_client.exists(_REFERRERS_SEEDED_KEY):
+            return
+
+        record_keys = [
+            key
+            async for key in self.redis_client.scan("playlist_by_id:{*")
+            if key.endswith("}")
+        ]
+        adopted = 0
+        for i in range(0, len(record_keys), 1000):
+            batch = record_keys[i : i + 1000]
+            values = await self.redis_client.mget_bytes(*batch)
+            for key, value in zip(batch, values, strict=True):
+                record = json.loads(value) if value is not None else {}
+                if "trackKeys" in record:
+                    playlist_id = key.removeprefix("playlist_by_id:")[1:-1]
+                    await self.entities.adopt(playlist_id, record["trackKeys"])
+                    adopted += 1
+        await self.redis_client.set(_REFERRERS_SEEDED_KEY, "1")
+        logger.info(f"Added {adopted} existing playlists to their entities' referrers")
+
+    async def archive_idle_playlists(self, read_before: float, limit: int) -> int:
+        """
+        Move up to limit playlists last read before a timestamp out of Redis
+        and into the archive, and delete the entities no playlist left in
+        Redis refers to. Playlists missing entities are left in Redis and
+        treated as read now.
+
+        Returns:
+            How many idle playlists were handled: archived, already gone or
+            left in Redis
+        """
+        playlist_ids = await self.redis_client.zrangebyscore(
+            _LAST_READ_KEY, "-inf", read_before, limit
+        )
+        if not playlist_ids:
+            return 0
+
+        loaded = await self._load_playlists(playlist_ids, include_archived=False)
+        # Archiving would drop the missing tracks for good
+        partial = [pid for pid, (_, source) in loaded.items() if source == "partial"]
+        loaded = {
+            pid: value for pid, value in loaded.items() if value[1] != "partial"
+        }
+        if partial:
+            await self.redis_client.zadd(
+                _LAST_READ_KEY, dict.fromkeys(partial, time.time())
+            )
+        if loaded:
+            # Written to disk before anything is deleted from Redis
+            await self.archive.put_many(
+                {pid: playlist_data for pid, (playlist_data, _) in loaded.items()}
+            )
+            keys = []
+            for pid in loaded:
+                keys += [
+                    self._record_key(pid),
+                    self._etag_key(pid),
+                    self._legacy_playlist_key(pid),
+                    *self._legacy_representation_keys(pid),
+                    *self._representation_keys(pid),
+                ]
+            await self.redis_client.delete(*keys)
+            released = 0
+            for pid, (playlist_data, _) in loaded.items():
+                released += await self.entities.release(
+                    pid, PlaylistResponse(**playlist_data)
+                )
+            logger.info(
+                f"Archived {len(loaded)} idle playlists, deleting {released} "
+                f"entities no longer referred to"
+            )
+        done = [pid for pid in playlist_ids if pid not in partial]
+        if done:
+            await self.redis_client.zrem(_LAST_READ_KEY, *done)
+        return len(playlist_ids)
+
+    @traced("repo.get_or_fetch_spotify_tracks")
     async def get_or_fetch_spotify_tracks(
             self,
             query: str,
@@ -95,6 +581,12 @@ class PlaylistRepo:
 
         # Try to get from cache first
         cached_data = await self.redis_client.get_json(cache_key)
+        record_cache_lookup(
+            "spotify_search", "hit" if cached_data is not None else "miss"
+        )
+        current_span().set_attributes(
+            query=query, limit=limit, offset=offset, cache_hit=cached_data is not None
+        )
         if cached_data is not None:
             logger.info(
                 f"Cache hit for Spotify search: {query} (limit={limit}, offset={offset})"
@@ -107,7 +599,7 @@ class PlaylistRepo:
 
         # Cache miss - use callback to fetch data
         try:
-            fresh_data = fetch_callback()
+            fresh_data = await asyncio.to_thread(fetch_callback)
 
             # Store in cache (no expiration for persistent storage)
             await self.redis_client.set_json(cache_key, fresh_data)
@@ -119,6 +611,7 @@ class PlaylistRepo:
             logger.error(f"Failed to fetch Spotify tracks via callback: {e}")
             return []
 
+    @traced("repo.get_or_fetch_spotify_audio_features")
     async def get_or_fetch_spotify_audio_features(
             self,
             track_ids: list[str],
@@ -150,12 +643,19 @@ class PlaylistRepo:
             else:
                 missing_ids.append(track_id)
 
+        record_cache_lookup("spotify_audio_features", "hit", len(features_map))
+        record_cache_lookup("spotify_audio_features", "miss", len(missing_ids))
+        current_span().set_attributes(
+            batch_size=len(track_ids),
+            cache_hits=len(features_map),
+            cache_misses=len(missing_ids),
+        )
         if missing_ids:
             logger.info(f"Cache miss for {len(missing_ids)} Spotify audio features")
 
             # Fetch missing features via callback
             try:
-                fresh_features = fetch_callback()
+                fresh_features = await asyncio.to_thread(fetch_callback)
 
                 # Cache each individual feature set
                 for track_id, features in fresh_features.items():
@@ -179,15 +679,20 @@ class PlaylistRepo:
         )
         return features_map
 
+    @traced("repo.get_or_fetch_reccobeats_metadata")
     async def get_or_fetch_reccobeats_metadata(
-            self, spotify_ids: list[str], fetch_callback: Callable[[], dict[str, Any]]
+            self,
+            spotify_ids: list[str],
+            fetch_callback: Callable[[list[str], set[str]], dict[str, Any]],
     ) -> dict[str, Any]:
         """
         Get ReccoBeats metadata from cache or fetch using callback.
+        IDs ReccoBeats doesn't know are negatively cached.
 
         Args:
             spotify_ids: List of Spotify track IDs
-            fetch_callback: Function to call if cache miss
+            fetch_callback: Called with the missing IDs and a set to fill with
+                IDs ReccoBeats definitively doesn't know
 
         Returns:
             Dictionary mapping spotify_id to ReccoBeats data
@@ -195,8 +700,11 @@ class PlaylistRepo:
         metadata_map = {}
         missing_ids = []
 
-        # Check cache for each Spotify ID
-        for spotify_id in spotify_ids:
+        # Check cache for each Spotify ID not already known to be unmapped
+        lookup_ids = await self._filter_known_negatives(
+            "reccobeats_metadata", spotify_ids
+        )
+        for spotify_id in lookup_ids:
             cache_key = self._generate_cache_key(
                 "reccobeats_metadata", spotify_id=spotify_id
             )
@@ -207,6 +715,13 @@ class PlaylistRepo:
             else:
                 missing_ids.append(spotify_id)
 
+        record_cache_lookup("reccobeats_metadata", "hit", len(metadata_map))
+        record_cache_lookup("reccobeats_metadata", "miss", len(missing_ids))
+        current_span().set_attributes(
+            batch_size=len(spotify_ids),
+            cache_hits=len(metadata_map),
+            cache_misses=len(missing_ids),
+        )
         if missing_ids:
             logger.info(
                 f"Cache miss for {len(missing_ids)} ReccoBeats metadata entries"
@@ -214,7 +729,9 @@ class PlaylistRepo:
 
             # Fetch missing metadata via callback
             try:
-                fresh_metadata = fetch_callback()
+                fresh_metadata = await self._fetch_missing(
+                    "reccobeats_metadata", missing_ids, fetch_callback
+                )
 
                 # Cache each individual metadata entry
                 for spotify_id, metadata in fresh_metadata.items():
@@ -238,15 +755,20 @@ class PlaylistRepo:
         )
         return metadata_map
 
+    @traced("repo.get_or_fetch_reccobeats_audio_features")
     async def get_or_fetch_reccobeats_audio_features(
-            self, reccobeats_ids: list[str], fetch_callback: Callable[[], dict[str, Any]]
+            self,
+            reccobeats_ids: list[str],
+            fetch_callback: Callable[[list[str], set[str]], dict[str, Any]],
     ) -> dict[str, Any]:
         """
         Get ReccoBeats audio features from cache or fetch using callback.
+        IDs without audio features are negatively cached.
 
         Args:
             reccobeats_ids: List of ReccoBeats track IDs
-            fetch_callback: Function to call if cache miss
+            fetch_callback: Called with the missing IDs and a set to fill with
+                IDs that definitively have no audio features
 
         Returns:
             Dictionary mapping reccobeats_id to audio features
@@ -254,8 +776,11 @@ class PlaylistRepo:
         features_map = {}
         missing_ids = []
 
-        # Check cache for each ReccoBeats ID
-        for reccobeats_id in reccobeats_ids:
+        # Check cache for each ReccoBeats ID not already known to be featureless
+        lookup_ids = await self._filter_known_negatives(
+            "reccobeats_audio_features", reccobeats_ids
+        )
+        for reccobeats_id in lookup_ids:
             cache_key = self._generate_cache_key(
                 "reccobeats_audio_features", reccobeats_id=reccobeats_id
             )
@@ -266,12 +791,21 @@ class PlaylistRepo:
             else:
                 missing_ids.append(reccobeats_id)
 
+        record_cache_lookup("reccobeats_audio_features", "hit", len(features_map))
+        record_cache_lookup("reccobeats_audio_features", "miss", len(missing_ids))
+        current_span().set_attributes(
+            batch_size=len(reccobeats_ids),
+            cache_hits=len(features_map),
+            cache_misses=len(missing_ids),
+        )
         if missing_ids:
             logger.info(f"Cache miss for {len(missing_ids)} ReccoBeats audio features")
 
             # Fetch missing features via callback
             try:
-                fresh_features = fetch_callback()
+                fresh_features = await self._fetch_missing(
+                    "reccobeats_audio_features", missing_ids, fetch_callback
+                )
 
                 # Cache each individual feature set
                 for reccobeats_id, features in fresh_features.items():
@@ -297,34 +831,42 @@ class PlaylistRepo:
         )
         return features_map
 
+    def _generated_playlist_key(
+            self, activity: str, vibe: str, duration_minutes: int
+    ) -> str:
+        return self._generate_cache_key(
+            "generated_playlist",
+            activity=activity,
+            vibe=vibe,
+            duration_minutes=duration_minutes,
+        )
+
     async def store_generated_playlist(
             self,
             activity: str,
             vibe: str,
             duration_minutes: int,
-            playlist_data: dict[str, Any],
+            playlist_id: str,
     ) -> bool:
         """
-        Store a generated playlist for potential future reuse.
+        Record the playlist generated for these parameters for future reuse.
+
+        Only the playlist ID is stored; the playlist itself is the one stored
+        by store_playlist_by_id, which must be stored first.
 
         Args:
             activity: Activity type
             vibe: Vibe type
             duration_minutes: Target duration
-            playlist_data: Complete playlist response data
+            playlist_id: ID of the stored playlist
 
         Returns:
             True if stored successfully
         """
-        cache_key = self._generate_cache_key(
-            "generated_playlist",
-            activity=activity,
-            vibe=vibe,
-            duration_minutes=duration_minutes,
-        )
+        cache_key = self._generated_playlist_key(activity, vibe, duration_minutes)
 
         try:
-            success = await self.redis_client.set_json(cache_key, playlist_data)
+            success = await self.redis_client.set(cache_key, playlist_id)
             if success:
                 logger.info(
                     f"Stored generated playlist: {activity}-{vibe}-{duration_minutes}min"
@@ -334,12 +876,17 @@ class PlaylistRepo:
             logger.error(f"Failed to store generated playlist: {e}")
             return False
 
+    @traced("repo.get_generated_playlist")
     async def get_generated_playlist(
             self, activity: str, vibe: str, duration_minutes: int
     ) -> dict[str, Any] | None:
         """
         Get a previously generated playlist if it exists.
 
+        The parameter key and the playlist it points to are read together.
+        Keys still holding a whole playlist, as stored before they became
+        pointers, are rewritten as pointers on first read.
+
         Args:
             activity: Activity type
             vibe: Vibe type
@@ -348,15 +895,32 @@ class PlaylistRepo:
         Returns:
             Playlist data if found, None otherwise
         """
-        cache_key = self._generate_cache_key(
-            "generated_playlist",
-            activity=activity,
-            vibe=vibe,
-            duration_minutes=duration_minutes,
-        )
+        cache_key = self._generated_playlist_key(activity, vibe, duration_minutes)
 
         try:
-            cached_playlist = await self.redis_client.get_json(cache_key)
+            reference, body = await self.redis_client.get_referenced(
+                cache_key, self._representation_key("%s")
+            )
+            if reference is None:
+                cached_playlist = None
+            elif reference.startswith(b"{"):
+                cached_playlist = json.loads(reference)
+                await self._migrate_generated_playlist(cache_key, cached_playlist)
+            elif body is not None:
+                cached_playlist = json.loads(body)
+            else:
+                # The body expired; load the playlist from its record
+                cached_playlist = await self.get_playlist_by_id(reference.decode())
+
+            record_cache_lookup(
+                "generated_playlist", "hit" if cached_playlist else "miss"
+            )
+            current_span().set_attributes(
+                activity=activity,
+                vibe=vibe,
+                duration_minutes=duration_minutes,
+                cache_hit=bool(cached_playlist),
+            )
             if cached_playlist:
                 logger.info(
                     f"Found cached playlist: {activity}-{vibe}-{duration_minutes}min"
@@ -366,6 +930,49 @@ class PlaylistRepo:
             logger.error(f"Failed to get cached playlist: {e}")
             return None
 
+    async def _migrate_generated_playlist(
+            self, cache_key: str, playlist_data: dict[str, Any]
+    ) -> None:
+        """Replace a whole playlist stored under a parameter key with a pointer."""
+        playlist_id = playlist_data.get("id")
+        if not playlist_id:
+            return
+        if await self.get_playlist_etag(playlist_id) is None:
+            if not await self.store_playlist_by_id(playlist_id, playlist_data):
+                return
+        if await self.redis_client.set(cache_key, playlist_id):
+            logger.info(f"Migrated {cache_key} to a pointer to playlist {playlist_id}")
+
+    async def migrate_generated_playlists(self, batch_size: int = 1000) -> int:
+        """
+        Rewrite every parameter key still holding a whole playlist as a
+        pointer, scanning for them in batches. Reads do the same lazily;
+        this converts the keys that are not read.
+
+        Returns:
+            Number of keys found holding a whole playlist
+        """
+        migrated = 0
+        batch = []
+        async for key in self.redis_client.scan("generated_playlist:*", batch_size):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                migrated += await self._migrate_generated_playlists(batch)
+                batch = []
+        if batch:
+            migrated += await self._migrate_generated_playlists(batch)
+        logger.info(f"Migrated {migrated} generated playlists to pointers")
+        return migrated
+
+    async def _migrate_generated_playlists(self, cache_keys: list[str]) -> int:
+        values = await self.redis_client.mget_bytes(*cache_keys)
+        migrated = 0
+        for cache_key, value in zip(cache_keys, values, strict=True):
+            if value is not None and value.startswith(b"{"):
+                await self._migrate_generated_playlist(cache_key, json.loads(value))
+                migrated += 1
+        return migrated
+
     async def clear_cache(self, pattern: str = "*") -> int:
         """
         Clear cached data matching pattern.
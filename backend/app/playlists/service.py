@@ -1,15 +1,37 @@
+import asyncio
 import logging
 import os
 import random
-from typing import Any
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack, asynccontextmanager, nullcontext
+from typing import Any, Protocol
 
 from ..integrations.reccobeats import ReccoBeatsClient
 from ..integrations.spotify import SpotifyClient
+from ..observability.metrics import GENERATIONS_IN_FLIGHT, observe_stage
+from .admission import AdmissionController, AdmissionRejected
 from .repo import PlaylistRepo
 
 logger = logging.getLogger(__name__)
 
 
+class ColdGenerationGate(Protocol):
+    """
+    Checked with a number of cold generations before they start, e.g. a rate
+    limit, and told when they are shed before running.
+    """
+
+    async def charge_cold_generations(self, count: int) -> int | None:
+        """Returns None to go ahead, or a Retry-After in seconds to reject them."""
+
+    async def refund_cold_generations(self, count: int) -> None:
+        """Called when generations that passed the gate are shed."""
+
+
+# Marks the end of a batch generation's results
+_BATCH_DONE = object()
+
+
 class PlaylistService:
     """
     Service for creating and managing playlists.
@@ -21,13 +43,44 @@ class PlaylistService:
         spotify_client: SpotifyClient,
         reccobeats_client: ReccoBeatsClient,
         playlist_repo: PlaylistRepo,
+        admission: AdmissionController | None = None,
     ):
         self.spotify_client = spotify_client
         self.reccobeats_client = reccobeats_client
         self.playlist_repo = playlist_repo
+        # Bounds concurrent cold generations; cache hits never wait for it
+        self.admission = admission
+
+    def _admitted(self):
+        return self.admission.admit() if self.admission else nullcontext()
+
+    @asynccontextmanager
+    async def _gated(
+        self, gate: ColdGenerationGate | None, count: int
+    ) -> AsyncIterator[None]:
+        """
+        Pass cold generations through the gate, then hold a generation slot
+        for them. If admission sheds them, the gate's charge is refunded.
+        """
+        if gate is not None:
+            retry_after = await gate.charge_cold_generations(count)
+            if retry_after is not None:
+                raise AdmissionRejected(429, retry_after, "rate limited")
+        async with AsyncExitStack() as stack:
+            try:
+                await stack.enter_async_context(self._admitted())
+            except AdmissionRejected:
+                if gate is not None:
+                    await gate.refund_cold_generations(count)
+                raise
+            yield
 
     async def create_activity_playlist(
-        self, activity: str, vibe: str, duration_minutes: int = 30
+        self,
+        activity: str,
+        vibe: str,
+        duration_minutes: int = 30,
+        cold_gate: ColdGenerationGate | None = None,
     ) -> dict[str, Any]:
         """
         Create a playlist based on activity, vibe, and duration.
@@ -36,53 +89,263 @@ class PlaylistService:
             activity: The activity type (e.g., "yoga", "studying", "cleaning")
             vibe: The desired vibe (e.g., "chill", "upbeat")
             duration_minutes: Target playlist duration in minutes
+            cold_gate: Checked before generating a playlist that isn't cached
 
         Returns:
             Dictionary containing playlist data and metadata
+
+        Raises:
+            AdmissionRejected: when a cold generation is shed under load
+                or refused by the cold gate
         """
-        if not self.spotify_client.is_connected():
-            return {
-                "error": "Spotify service not authenticated. Cannot create playlist."
-            }
+        with GENERATIONS_IN_FLIGHT.track_inprogress():
+            return await self._create_activity_playlist(
+                activity, vibe, duration_minutes, cold_gate
+            )
+
+    async def find_generated_playlists(
+        self, requests: list[tuple[str, str, int]]
+    ) -> dict[tuple[str, str, int], dict[str, Any]]:
+        """
+        Look up previously generated playlists for a batch, once per
+        distinct request.
+
+        Returns:
+            Dictionary mapping requests with a generated playlist to it
+        """
+        found = {}
+        for request in dict.fromkeys(requests):
+            with observe_stage("cache_lookup"):
+                cached_playlist = await self.playlist_repo.get_generated_playlist(
+                    *request
+                )
+            if cached_playlist:
+                found[request] = cached_playlist
+        return found
+
+    async def create_activity_playlists(
+        self,
+        requests: list[tuple[str, str, int]],
+        total_fetch_limit: int = 400,
+        cold_gate: ColdGenerationGate | None = None,
+        cached: dict[tuple[str, str, int], dict[str, Any]] | None = None,
+    ) -> AsyncIterator[tuple[int, dict[str, Any]]]:
+        """
+        Create several playlists, sharing upstream work between them.
 
+        Searches run once for the union of every request's queries and
+        ReccoBeats lookups run once for the union of candidate tracks; then
+        selection and publishing run per request. Identical requests are
+        generated once.
+
+        Args:
+            requests: (activity, vibe, duration_minutes) per playlist
+            total_fetch_limit: Tracks to search for per activity/vibe pair
+            cold_gate: Checked once for all requests that aren't cached
+            cached: Result of find_generated_playlists for these requests,
+                if already looked up
+
+        Yields:
+            (request index, playlist data or error) as each one finishes,
+            previously generated playlists first, even while Spotify is down
+        """
+        with GENERATIONS_IN_FLIGHT.track_inprogress():
+            logger.info(f"Creating {len(requests)} playlists in one batch")
+            if cached is None:
+                cached = await self.find_generated_playlists(requests)
+
+            # Identical requests share a single generation
+            indices_by_request: dict[tuple[str, str, int], list[int]] = {}
+            for index, request in enumerate(requests):
+                indices_by_request.setdefault(request, []).append(index)
+
+            pending = []
+            for request, indices in indices_by_request.items():
+                if request in cached:
+                    for index in indices:
+                        yield index, cached[request]
+                else:
+                    pending.append(request)
+
+            if not pending:
+                return
+
+            if not self.spotify_client.is_connected():
+                for request in pending:
+                    for index in indices_by_request[request]:
+                        yield index, {
+                            "error": "Spotify service not authenticated. Cannot create playlist."
+                        }
+                return
+
+            try:
+                async for item in self._generate_batch_admitted(
+                    pending, indices_by_request, total_fetch_limit, cold_gate
+                ):
+                    yield item
+            except AdmissionRejected as e:
+                for request in pending:
+                    for index in indices_by_request[request]:
+                        yield index, {
+                            "error": f"Too many playlists requested, retry in {e.retry_after}s"
+                        }
+
+    async def _generate_batch_admitted(
+        self,
+        pending: list[tuple[str, str, int]],
+        indices_by_request: dict[tuple[str, str, int], list[int]],
+        total_fetch_limit: int,
+        cold_gate: ColdGenerationGate | None,
+    ) -> AsyncIterator[tuple[int, dict[str, Any]]]:
+        """
+        Run _generate_batch in a task holding a generation slot, handing its
+        results over through a queue, so a client reading the stream slowly
+        never holds the slot.
+        """
+        results: asyncio.Queue = asyncio.Queue()
+
+        async def generate() -> None:
+            try:
+                async with self._gated(cold_gate, len(pending)):
+                    async for item in self._generate_batch(
+                        pending, indices_by_request, total_fetch_limit
+                    ):
+                        results.put_nowait(item)
+            except Exception as e:
+                results.put_nowait(e)
+            finally:
+                results.put_nowait(_BATCH_DONE)
+
+        task = asyncio.create_task(generate())
+        try:
+            while (item := await results.get()) is not _BATCH_DONE:
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Stops the generation if the client went away
+            task.cancel()
+
+    async def _generate_batch(
+        self,
+        pending: list[tuple[str, str, int]],
+        indices_by_request: dict[tuple[str, str, int], list[int]],
+        total_fetch_limit: int,
+    ) -> AsyncIterator[tuple[int, dict[str, Any]]]:
+        """Cold path of create_activity_playlists for uncached requests."""
+        # Each distinct query runs once, whichever requests share it
+        search_results: dict[tuple[str, int], list[dict[str, Any]]] = {}
+        candidates_by_pair = {}
+        for activity, vibe, _ in pending:
+            if (activity, vibe) not in candidates_by_pair:
+                candidates_by_pair[(activity, vibe)] = await self._search_candidates(
+                    activity, vibe, total_fetch_limit, search_results
+                )
+
+        # One ReccoBeats lookup for the union of all candidate tracks
+        all_tracks = list(
+            {
+                track["id"]: track
+                for tracks in candidates_by_pair.values()
+                for track in tracks
+            }.values()
+        )
+        features = (
+            await self._fetch_audio_features(all_tracks) if all_tracks else ({}, {})
+        )
+
+        for request in pending:
+            activity, vibe, duration_minutes = request
+            try:
+                selected_tracks = await self._choose_tracks(
+                    candidates_by_pair[(activity, vibe)],
+                    vibe,
+                    duration_minutes,
+                    features,
+                )
+                if selected_tracks:
+                    result = await self._finalize_playlist(
+                        activity, vibe, duration_minutes, selected_tracks
+                    )
+                else:
+                    logger.warning(
+                        f"No tracks found for {activity}/{vibe}/{duration_minutes}min"
+                    )
+                    result = {"error": "No suitable tracks found"}
+            except Exception as e:
+                logger.error(f"Failed to create batch playlist for {request}: {e}")
+                result = {"error": "Failed to create playlist"}
+
+            for index in indices_by_request[request]:
+                yield index, result
+
+    async def _create_activity_playlist(
+        self,
+        activity: str,
+        vibe: str,
+        duration_minutes: int,
+        cold_gate: ColdGenerationGate | None = None,
+    ) -> dict[str, Any]:
         logger.info(
             f"Creating playlist for {activity} with {vibe} vibe, {duration_minutes} minutes"
         )
 
-        # Check if we have a cached complete playlist for these exact parameters
-        cached_playlist = await self.playlist_repo.get_generated_playlist(
-            activity, vibe, duration_minutes
-        )
+        # Check if we have a cached complete playlist for these exact parameters.
+        # This needs no upstream, so it's served even while Spotify is down
+        with observe_stage("cache_lookup"):
+            cached_playlist = await self.playlist_repo.get_generated_playlist(
+                activity, vibe, duration_minutes
+            )
         if cached_playlist:
             logger.info("Returning cached complete playlist")
             return cached_playlist
 
-        # Search for tracks using repo (which handles caching)
-        tracks = await self._search_tracks_by_criteria(
-            activity=activity,
-            vibe=vibe,
-            duration_minutes=duration_minutes,
-            total_fetch_limit=400,
-        )
+        if not self.spotify_client.is_connected():
+            return {
+                "error": "Spotify service not authenticated. Cannot create playlist."
+            }
 
-        if not tracks:
-            logger.warning("No tracks found after search and filtering")
-            return {"error": "No suitable tracks found"}
+        async with self._gated(cold_gate, 1):
+            # Search for tracks using repo (which handles caching)
+            tracks = await self._search_tracks_by_criteria(
+                activity=activity,
+                vibe=vibe,
+                duration_minutes=duration_minutes,
+                total_fetch_limit=400,
+            )
 
+            if not tracks:
+                logger.warning("No tracks found after search and filtering")
+                return {"error": "No suitable tracks found"}
+
+            return await self._finalize_playlist(
+                activity, vibe, duration_minutes, tracks
+            )
+
+    async def _finalize_playlist(
+        self,
+        activity: str,
+        vibe: str,
+        duration_minutes: int,
+        tracks: list[dict[str, Any]],
+    ) -> dict[str, Any]:
+        """Publish selected tracks as a Spotify playlist and cache the result."""
         # Format tracks for response
-        formatted_tracks = self._format_tracks_for_response(tracks)
+        with observe_stage("selection"):
+            formatted_tracks = self._format_tracks_for_response(tracks)
 
         if not formatted_tracks:
             logger.warning("No tracks remained after formatting")
             return {"error": "No suitable tracks with complete data found"}
 
         # Create Spotify playlist
-        playlist_result = self._create_spotify_playlist(
-            activity=activity,
-            vibe=vibe,
-            tracks=formatted_tracks,
-            duration_minutes=duration_minutes,
-        )
+        with observe_stage("publish"):
+            playlist_result = self._create_spotify_playlist(
+                activity=activity,
+                vibe=vibe,
+                tracks=formatted_tracks,
+                duration_minutes=duration_minutes,
+            )
 
         if not playlist_result:
             return {"error": "Failed to create playlist on Spotify"}
@@ -121,18 +384,20 @@ class PlaylistService:
         }
 
         # Cache the complete playlist for future requests
-        await self.playlist_repo.store_generated_playlist(
-            activity, vibe, duration_minutes, final_playlist_data
-        )
-
-        playlist_id = final_playlist_data.get("id")
-        logger.info(f"Attempting to store playlist with ID: {playlist_id}")
-        logger.debug(f"Playlist data being stored (first 100 chars): {str(final_playlist_data)[:100]}...")
-        if playlist_id:
-            await self.playlist_repo.store_playlist_by_id(playlist_id, final_playlist_data)
-            logger.info(f"Successfully called store_playlist_by_id for ID: {playlist_id}")
-        else:
-            logger.info(f"Failed store_playlist_by_id for ID: {playlist_id}")
+        with observe_stage("store"):
+            playlist_id = final_playlist_data.get("id")
+            logger.info(f"Attempting to store playlist with ID: {playlist_id}")
+            logger.debug(f"Playlist data being stored (first 100 chars): {str(final_playlist_data)[:100]}...")
+            if playlist_id and await self.playlist_repo.store_playlist_by_id(
+                playlist_id, final_playlist_data
+            ):
+                logger.info(f"Successfully called store_playlist_by_id for ID: {playlist_id}")
+                # The parameters only point at the playlist stored by ID
+                await self.playlist_repo.store_generated_playlist(
+                    activity, vibe, duration_minutes, playlist_id
+                )
+            else:
+                logger.info(f"Failed store_playlist_by_id for ID: {playlist_id}")
 
         return final_playlist_data
 
@@ -144,29 +409,58 @@ class PlaylistService:
         total_fetch_limit: int = 400,
     ) -> list[dict[str, Any]]:
         """Search for tracks matching the given criteria using cached calls."""
+        candidates = await self._search_candidates(activity, vibe, total_fetch_limit)
+        return await self._choose_tracks(candidates, vibe, duration_minutes)
+
+    async def _search_candidates(
+        self,
+        activity: str,
+        vibe: str,
+        total_fetch_limit: int,
+        search_results: dict[tuple[str, int], list[dict[str, Any]]] | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Search for candidate tracks for an activity and vibe, without duplicates.
+        Searches already in `search_results`, keyed by (query, limit), are
+        reused and new ones are added to it.
+        """
         # Generate search queries based on activity and vibe
-        search_queries = self._generate_search_queries(activity, vibe)
+        with observe_stage("query_generation"):
+            search_queries = self._generate_search_queries(activity, vibe)
 
-        all_tracks = []
+        if search_results is None:
+            search_results = {}
         tracks_per_query = total_fetch_limit // len(search_queries)
 
-        for query in search_queries:
-            tracks = await self._fetch_tracks_for_query(query, limit=tracks_per_query)
-            all_tracks.extend(tracks)
+        all_tracks = []
+        with observe_stage("search"):
+            for query in search_queries:
+                key = (query, tracks_per_query)
+                if key not in search_results:
+                    search_results[key] = await self._fetch_tracks_for_query(
+                        query, limit=tracks_per_query
+                    )
+                all_tracks.extend(search_results[key])
 
         # Remove duplicates based on track ID
         unique_tracks = {track["id"]: track for track in all_tracks if track.get("id")}
-        tracks_list = list(unique_tracks.values())
+        return list(unique_tracks.values())
 
-        # Get audio features from ReccoBeats using repo
-        filtered_tracks = await self._filter_tracks_by_audio_features(tracks_list, vibe)
-
-        # Select tracks to match target duration
-        selected_tracks = self._select_tracks_for_duration(
-            filtered_tracks, duration_minutes
+    async def _choose_tracks(
+        self,
+        tracks: list[dict[str, Any]],
+        vibe: str,
+        duration_minutes: int,
+        features: tuple[dict[str, Any], dict[str, Any]] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Filter candidate tracks by vibe and select them to fill the duration."""
+        filtered_tracks = await self._filter_tracks_by_audio_features(
+            tracks, vibe, features
         )
 
-        return selected_tracks
+        # Select tracks to match target duration
+        with observe_stage("selection"):
+            return self._select_tracks_for_duration(filtered_tracks, duration_minutes)
 
     def _generate_search_queries(self, activity: str, vibe: str) -> list[str]:
         """Generate search queries based on activity and vibe."""
@@ -363,22 +657,51 @@ class PlaylistService:
             return []
 
     async def _filter_tracks_by_audio_features(
-        self, tracks: list[dict[str, Any]], vibe: str
+        self,
+        tracks: list[dict[str, Any]],
+        vibe: str,
+        features: tuple[dict[str, Any], dict[str, Any]] | None = None,
     ) -> list[dict[str, Any]]:
-        """Filter tracks based on audio features from ReccoBeats using repo caching."""
+        """
+        Filter tracks based on audio features from ReccoBeats using repo caching.
+        `features` is what _fetch_audio_features returned for these tracks (or
+        more), if already fetched.
+        """
         if not tracks:
             return []
 
+        reccobeats_metadata, audio_features_map = (
+            features or await self._fetch_audio_features(tracks)
+        )
+        if not any(
+            reccobeats_metadata.get(track.get("id"), {}).get("reccobeats_id")
+            for track in tracks
+        ):
+            logger.warning("No ReccoBeats IDs found for audio features")
+            return tracks  # Return original tracks if no audio features available
+
+        return self._apply_vibe_filter(
+            tracks, vibe, reccobeats_metadata, audio_features_map
+        )
+
+    async def _fetch_audio_features(
+        self, tracks: list[dict[str, Any]]
+    ) -> tuple[dict[str, dict[str, Any]], dict[str, dict[str, Any]]]:
+        """
+        Get ReccoBeats metadata and audio features for tracks using repo caching.
+
+        Returns:
+            (metadata by Spotify ID, audio features by ReccoBeats ID)
+        """
         # Get Spotify IDs
         spotify_ids = [track["id"] for track in tracks if track.get("id")]
 
         # Get ReccoBeats metadata using repo with callback
-        reccobeats_metadata = await self.playlist_repo.get_or_fetch_reccobeats_metadata(
-            spotify_ids=spotify_ids,
-            fetch_callback=lambda: self.reccobeats_client.fetch_metadata_batch(
-                spotify_ids
-            ),
-        )
+        with observe_stage("metadata"):
+            reccobeats_metadata = await self.playlist_repo.get_or_fetch_reccobeats_metadata(
+                spotify_ids=spotify_ids,
+                fetch_callback=self.reccobeats_client.fetch_metadata_batch,
+            )
 
         # Extract ReccoBeats IDs for audio features
         reccobeats_ids = [
@@ -388,18 +711,25 @@ class PlaylistService:
         ]
 
         if not reccobeats_ids:
-            logger.warning("No ReccoBeats IDs found for audio features")
-            return tracks  # Return original tracks if no audio features available
+            return reccobeats_metadata, {}
 
         # Get audio features using repo with callback
-        audio_features_map = await self.playlist_repo.get_or_fetch_reccobeats_audio_features(
-            reccobeats_ids=reccobeats_ids,
-            fetch_callback=lambda: self.reccobeats_client.fetch_audio_features_batch(
-                reccobeats_ids
-            ),
-        )
+        with observe_stage("features"):
+            audio_features_map = await self.playlist_repo.get_or_fetch_reccobeats_audio_features(
+                reccobeats_ids=reccobeats_ids,
+                fetch_callback=self.reccobeats_client.fetch_audio_features_batch,
+            )
+
+        return reccobeats_metadata, audio_features_map
 
-        # Filter based on vibe
+    def _apply_vibe_filter(
+        self,
+        tracks: list[dict[str, Any]],
+        vibe: str,
+        reccobeats_metadata: dict[str, dict[str, Any]],
+        audio_features_map: dict[str, dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Keep tracks whose audio features match the vibe."""
         filtered_tracks = []
         for track in tracks:
             track_id = track.get("id")
@@ -592,3 +922,46 @@ class PlaylistService:
             Playlist data if found, None otherwise
         """
         return await self.playlist_repo.get_playlist_by_id(playlist_id)
+
+    async def get_playlist_representation(
+        self, playlist_id: str, encoding: str | None = None, view: str = "full"
+    ) -> tuple[bytes | None, str | None]:
+        """
+        Get a playlist by its ID as the serialized JSON response body,
+        validated when it was stored, optionally precompressed.
+
+        Args:
+            playlist_id: The playlist ID to retrieve
+            encoding: Stored content coding to return ("br", "gzip") or None
+            view: Stored projection to return ("full" or "summary")
+
+        Returns:
+            (body, ETag of the full uncompressed body), or (None, None) if not found
+        """
+        return await self.playlist_repo.get_playlist_representation(
+            playlist_id, encoding, view
+        )
+
+    async def get_playlists(
+        self, playlist_ids: list[str], view: str = "full"
+    ) -> tuple[list[bytes], list[str]]:
+        """
+        Get several playlists by ID as serialized JSON response bodies.
+
+        Args:
+            playlist_ids: The playlist IDs to retrieve
+            view: Stored projection to return ("full" or "summary")
+
+        Returns:
+            (bodies of found playlists in request order, missing IDs)
+        """
+        found = await self.playlist_repo.get_playlist_representations(
+            playlist_ids, view
+        )
+        bodies = [found[pid] for pid in playlist_ids if pid in found]
+        missing = [pid for pid in playlist_ids if pid not in found]
+        return bodies, missing
+
+    async def get_playlist_etag(self, playlist_id: str) -> str | None:
+        """Get the ETag stored with a playlist, without loading it."""
+        return await self.playlist_repo.get_playlist_etag(playlist_id)
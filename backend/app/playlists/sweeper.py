@@ -0,0 +1,70 @@
+import asyncio
+import logging
+import time
+
+from .config import ArchiveConfig
+from .repo import PlaylistRepo
+
+logger = logging.getLogger(__name__)
+
+# Taken for a sweep interval by the worker that sweeps
+_SWEEP_LOCK_KEY = "playlist_archive:sweep"
+# How often to check whether Redis is up before the first sweep
+_CONNECT_POLL_SECONDS = 5
+
+
+class ArchiveSweeper:
+    """
+    Moves playlists not read for idle_days out of Redis into the archive, in
+    batches, from a background task. Workers race for a lock each interval so
+    only one of them sweeps.
+    """
+
+    def __init__(self, config: ArchiveConfig, repo: PlaylistRepo):
+        self.config = config
+        self.repo = repo
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._sweep_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _sweep_loop(self) -> None:
+        while not self.repo.redis_client.is_connected():
+            await asyncio.sleep(_CONNECT_POLL_SECONDS)
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error(f"Archive sweep failed: {e}")
+            await asyncio.sleep(self.config.sweep_interval_seconds)
+
+    async def sweep(self) -> int:
+        """
+        Archive idle playlists, unless another worker already swept this
+        interval. Returns how many idle playlists were handled.
+        """
+        if not await self.repo.redis_client.set_if_absent(
+            _SWEEP_LOCK_KEY, "1", max(1, int(self.config.sweep_interval_seconds))
+        ):
+            return 0
+
+        await self.repo.seed_last_read()
+        await self.repo.seed_entity_references()
+        read_before = time.time() - self.config.idle_days * 24 * 60 * 60
+        total = 0
+        while True:
+            handled = await self.repo.archive_idle_playlists(
+                read_before, self.config.sweep_batch_size
+            )
+            total += handled
+            if handled < self.config.sweep_batch_size:
+                break
+        if total:
+            logger.info(f"Archive sweep handled {total} idle playlists")
+        return total
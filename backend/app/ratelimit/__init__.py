@@ -0,0 +1,14 @@
+"""
+Per-client rate limiting backed by Redis.
+"""
+
+from .config import RateLimitConfig
+from .limiter import ClientRateLimit, CostExceedsBurst, RateLimited, RateLimiter
+
+__all__ = [
+    "ClientRateLimit",
+    "CostExceedsBurst",
+    "RateLimitConfig",
+    "RateLimited",
+    "RateLimiter",
+]
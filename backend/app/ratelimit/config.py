@@ -0,0 +1,74 @@
+import os
+
+from pydantic import BaseModel
+
+
+class EndpointLimit(BaseModel):
+    """Sustained rate and burst, in cost units."""
+
+    per_minute: int
+    burst: int
+
+
+class RateLimitConfig(BaseModel):
+    """Per-client rate limiting configuration."""
+
+    enabled: bool = True
+    # Use the first X-Forwarded-For address as the client IP. Off by default
+    # because clients can forge the header; behind a proxy or load balancer
+    # it must be turned on, or every client shares the proxy's IP and its
+    # single read and generate budget
+    trust_forwarded_for: bool = False
+    # X-API-Key values that get their own limit; other clients are limited by IP
+    api_keys: list[str] = []
+
+    # Limits per endpoint group. A single charge above an endpoint's burst
+    # can never pass and is rejected outright
+    generate: EndpointLimit = EndpointLimit(per_minute=60, burst=20)
+    read: EndpointLimit = EndpointLimit(per_minute=600, burst=100)
+    # Batch generations, charged once per batch for all of its playlists.
+    # The burst covers a full batch of 25 cold generations
+    batch: EndpointLimit = EndpointLimit(per_minute=60, burst=100)
+
+    # Generation cost: cache hits are cheap, cold generations spend upstream quota
+    cache_hit_cost: int = 1
+    cold_generation_cost: int = 10
+    # Cold generations in a batch share searches and audio feature lookups,
+    # so each one spends less upstream quota than on its own
+    batch_cold_generation_cost: int = 4
+
+    @classmethod
+    def from_env(cls) -> "RateLimitConfig":
+        """Create configuration from environment variables."""
+        return cls(
+            enabled=os.getenv("RATE_LIMIT_ENABLED", "true").lower()
+            in ("1", "true", "yes"),
+            trust_forwarded_for=os.getenv(
+                "RATE_LIMIT_TRUST_FORWARDED_FOR", "false"
+            ).lower()
+            in ("1", "true", "yes"),
+            api_keys=[
+                key.strip()
+                for key in os.getenv("RATE_LIMIT_API_KEYS", "").split(",")
+                if key.strip()
+            ],
+            generate=EndpointLimit(
+                per_minute=int(os.getenv("RATE_LIMIT_GENERATE_PER_MINUTE", "60")),
+                burst=int(os.getenv("RATE_LIMIT_GENERATE_BURST", "20")),
+            ),
+            read=EndpointLimit(
+                per_minute=int(os.getenv("RATE_LIMIT_READ_PER_MINUTE", "600")),
+                burst=int(os.getenv("RATE_LIMIT_READ_BURST", "100")),
+            ),
+            batch=EndpointLimit(
+                per_minute=int(os.getenv("RATE_LIMIT_BATCH_PER_MINUTE", "60")),
+                burst=int(os.getenv("RATE_LIMIT_BATCH_BURST", "100")),
+            ),
+            cache_hit_cost=int(os.getenv("RATE_LIMIT_CACHE_HIT_COST", "1")),
+            cold_generation_cost=int(
+                os.getenv("RATE_LIMIT_COLD_GENERATION_COST", "10")
+            ),
+            batch_cold_generation_cost=int(
+                os.getenv("RATE_LIMIT_BATCH_COLD_GENERATION_COST", "4")
+            ),
+        )
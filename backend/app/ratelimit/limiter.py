@@ -0,0 +1,217 @@
+import hashlib
+import logging
+import math
+
+from fastapi import Request
+
+from ..db.redis import RedisClient
+from .config import RateLimitConfig
+
+logger = logging.getLogger(__name__)
+
+# GCRA: the key holds the client's theoretical arrival time (TAT) in ms.
+# A request of `cost` units pushes the TAT out by cost * interval and is
+# allowed while the TAT stays within `tolerance` (the burst) of now. Redis
+# time is used so every worker shares one clock.
+_GCRA = """
+local time = redis.call("TIME")
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+
+local tat = tonumber(redis.call("GET", KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval * cost
+local allow_at = new_tat - tolerance
+if allow_at > now then
+    return {0, allow_at - now}
+end
+redis.call("SET", KEYS[1], new_tat, "PX", math.max(1, new_tat - now))
+return {1, 0}
+"""
+
+
+class RateLimited(Exception):
+    """A client exceeded its rate limit; answered with 429 and Retry-After."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Rate limited, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+# Gives cost units back by pulling the TAT in again, no earlier than now
+_GCRA_REFUND = """
+local time = redis.call("TIME")
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local cost = tonumber(ARGV[2])
+
+local tat = tonumber(redis.call("GET", KEYS[1]))
+if not tat then
+    return 0
+end
+local new_tat = tat - interval * cost
+if new_tat <= now then
+    redis.call("DEL", KEYS[1])
+else
+    redis.call("SET", KEYS[1], new_tat, "PX", new_tat - now)
+end
+return 1
+"""
+
+
+class CostExceedsBurst(Exception):
+    """A single charge costs more than a full bucket, so it could never pass."""
+
+    def __init__(self, cost: int, burst: int):
+        super().__init__(
+            f"Request costs {cost} rate limit units, more than the burst of {burst}"
+        )
+        self.cost = cost
+        self.burst = burst
+
+
+class RateLimiter:
+    """
+    Per-client GCRA rate limiting, evaluated atomically in Redis so limits
+    hold across workers. Clients are identified by a configured API key or
+    else by IP. If Redis is unavailable requests are let through.
+    """
+
+    def __init__(self, config: RateLimitConfig, redis_client: RedisClient):
+        self.config = config
+        self.redis_client = redis_client
+        self._api_keys = set(config.api_keys)
+
+    def client_id(self, request: Request) -> str:
+        api_key = request.headers.get("x-api-key")
+        if api_key and api_key in self._api_keys:
+            return "key:" + hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+        forwarded_for = request.headers.get("x-forwarded-for")
+        if self.config.trust_forwarded_for and forwarded_for:
+            return "ip:" + forwarded_for.split(",")[0].strip()
+        return "ip:" + (request.client.host if request.client else "unknown")
+
+    def for_client(self, endpoint: str, request: Request) -> "ClientRateLimit":
+        return ClientRateLimit(self, endpoint, self.client_id(request))
+
+    async def try_charge(self, endpoint: str, client: str, cost: int) -> int | None:
+        """
+        Charge cost units to a client's bucket for an endpoint group.
+        Returns None if allowed, or the seconds to wait if rejected.
+
+        Raises:
+            CostExceedsBurst: if cost is more than the bucket ever holds
+        """
+        if not self.config.enabled or cost <= 0:
+            return None
+
+        limit = getattr(self.config, endpoint)
+        if cost > limit.burst:
+            raise CostExceedsBurst(cost, limit.burst)
+        interval_ms = 60_000 / limit.per_minute
+        result = await self.redis_client.run_script(
+            f"ratelimit:{endpoint}:{client}",
+            _GCRA,
+            interval_ms,
+            interval_ms * limit.burst,
+            cost,
+        )
+        if result is None:
+            return None
+
+        allowed, wait_ms = int(result[0]), float(result[1])
+        if allowed:
+            return None
+        logger.info(f"Rate limited {client} on {endpoint} for {wait_ms:.0f}ms")
+        return max(1, math.ceil(wait_ms / 1000))
+
+    async def refund(self, endpoint: str, client: str, cost: int) -> None:
+        """Give back cost units charged for work that was never done."""
+        if not self.config.enabled or cost <= 0:
+            return
+        limit = getattr(self.config, endpoint)
+        await self.redis_client.run_script(
+            f"ratelimit:{endpoint}:{client}",
+            _GCRA_REFUND,
+            60_000 / limit.per_minute,
+            cost,
+        )
+
+
+class ClientRateLimit:
+    """A RateLimiter bound to one client and endpoint group."""
+
+    def __init__(self, limiter: RateLimiter, endpoint: str, client: str):
+        self.limiter = limiter
+        self.endpoint = endpoint
+        self.client = client
+
+    async def try_charge(self, cost: int) -> int | None:
+        return await self.limiter.try_charge(self.endpoint, self.client, cost)
+
+    async def charge(self, cost: int) -> None:
+        """Charge cost units, raising RateLimited if over the limit."""
+        retry_after = await self.try_charge(cost)
+        if retry_after is not None:
+            raise RateLimited(retry_after)
+
+    async def charge_cache_hits(self, count: int) -> None:
+        """Charge generations at the cache-hit cost, raising RateLimited if over."""
+        await self.charge(count * self.limiter.config.cache_hit_cost)
+
+    async def refund(self, cost: int) -> None:
+        await self.limiter.refund(self.endpoint, self.client, cost)
+
+    async def charge_batch(self, cached: int, cold: int) -> None:
+        """
+        Charge a batch for its cached playlists and the cold generations it
+        needs, raising RateLimited if over the limit.
+        """
+        config = self.limiter.config
+        await self.charge(
+            cached * config.cache_hit_cost + cold * config.batch_cold_generation_cost
+        )
+
+    async def charge_cold_generations(self, count: int) -> int | None:
+        """
+        Charge the extra cost of cold generations on top of the cache-hit
+        cost already paid; returns the seconds to wait if rejected.
+        """
+        config = self.limiter.config
+        return await self.try_charge(
+            count * (config.cold_generation_cost - config.cache_hit_cost)
+        )
+
+    async def refund_cold_generations(self, count: int) -> None:
+        """Give back the extra cost of cold generations that were shed."""
+        config = self.limiter.config
+        await self.refund(count * (config.cold_generation_cost - config.cache_hit_cost))
+
+    def prepaid_batch(self) -> "PrepaidBatch":
+        """A cold generation gate for a batch already charged with charge_batch."""
+        return PrepaidBatch(self)
+
+
+class PrepaidBatch:
+    """
+    Cold generation gate for a batch whose cold generations were charged up
+    front: lets them through, and refunds them down to the cache-hit cost if
+    they are shed.
+    """
+
+    def __init__(self, rate_limit: ClientRateLimit):
+        self.rate_limit = rate_limit
+
+    async def charge_cold_generations(self, count: int) -> int | None:
+        return None
+
+    async def refund_cold_generations(self, count: int) -> None:
+        config = self.rate_limit.limiter.config
+        await self.rate_limit.refund(
+            count * (config.batch_cold_generation_cost - config.cache_hit_cost)
+        )
@@ -1,35 +1,72 @@
+import json
 import logging
+from typing import Annotated, Literal
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 
-from ..dependencies import PlaylistServiceDep, SpotifyClientDep
-from ..playlists import PlaylistRequest, PlaylistResponse
+from ..dependencies import (
+    CacheConfigDep,
+    GenerateBatchRateLimitDep,
+    GenerateRateLimitDep,
+    HealthMonitorDep,
+    PlaylistServiceDep,
+    ReadRateLimitDep,
+    SpotifyClientDep,
+    limit_read,
+)
+from ..integrations.spotify import SpotifyClient
+from ..playlists import (
+    AdmissionRejected,
+    PlaylistBatchRequest,
+    PlaylistBatchResponse,
+    PlaylistRequest,
+    PlaylistResponse,
+)
+from ..playlists.encoding import negotiate_encoding, representation_etag
+from ..playlists.projections import (
+    InvalidFieldsError,
+    fields_variant,
+    parse_fields,
+    project,
+    source_view,
+)
+from ..ratelimit import CostExceedsBurst
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _spotify_unavailable(spotify_client: SpotifyClient) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Spotify service unavailable. Please check authentication.",
+        headers={"Retry-After": str(spotify_client.retry_after_seconds())},
+    )
+
+
 @router.post("/generate-playlist", response_model=PlaylistResponse)
 async def generate_playlist(
         request: PlaylistRequest,
         playlist_service: PlaylistServiceDep,
         spotify_client: SpotifyClientDep,
+        rate_limit: GenerateRateLimitDep,
 ):
     """
     Generate a Spotify playlist based on activity, vibe, and duration.
+
+    Previously generated playlists are served from cache even while Spotify
+    is unavailable; only new generations need a Spotify connection. New
+    generations are admission-controlled and rejected with 429 or 503 and
+    Retry-After when the worker is saturated. They also cost more of the
+    client's rate limit than cached ones.
     """
     logger.info(
         f"Received playlist request: {request.activity}, {request.vibe}, {request.duration}min"
     )
 
-    # Ensure Spotify client is connected
-    if not spotify_client.is_connected():
-        connected = await spotify_client.connect()
-        if not connected:
-            raise HTTPException(
-                status_code=503,
-                detail="Spotify service unavailable. Please check authentication.",
-            )
+    # Reconnect in the background rather than blocking this request
+    spotify_client.ensure_reconnecting()
 
     try:
         # Generate playlist using the service - service handles all the logic and formatting
@@ -37,9 +74,12 @@ async def generate_playlist(
             activity=request.activity,
             vibe=request.vibe,
             duration_minutes=request.duration,
+            cold_gate=rate_limit,
         )
 
         # Check for errors from service
+        if "error" in playlist_data and not spotify_client.is_connected():
+            raise _spotify_unavailable(spotify_client)
         if "error" in playlist_data:
             logger.error(f"Playlist generation error: {playlist_data['error']}")
             raise HTTPException(status_code=404, detail=playlist_data["error"])
@@ -50,7 +90,18 @@ async def generate_playlist(
         )
         return PlaylistResponse(**playlist_data)
 
-    except HTTPException:
+    except AdmissionRejected as e:
+        logger.warning(f"Playlist generation shed: {e.reason}")
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=(
+                "Rate limit exceeded. Please retry later."
+                if e.reason == "rate limited"
+                else "Too many playlists being generated. Please retry later."
+            ),
+            headers={"Retry-After": str(e.retry_after)},
+        ) from e
+    except (HTTPException, CostExceedsBurst):
         raise
     except Exception as e:
         logger.error(f"Unexpected error generating playlist: {e}")
@@ -59,29 +110,148 @@ async def generate_playlist(
         ) from e
 
 
-@router.get("/playlist/{playlist_id}", response_model=PlaylistResponse)
+@router.post(
+    "/generate-playlists",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def generate_playlists(
+        batch: PlaylistBatchRequest,
+        playlist_service: PlaylistServiceDep,
+        spotify_client: SpotifyClientDep,
+        rate_limit: GenerateBatchRateLimitDep,
+):
+    """
+    Generate several playlists at once, sharing searches and audio feature
+    lookups between them.
+
+    The batch is charged to its own rate limit before anything is streamed:
+    each previously generated playlist as a cache hit and each distinct new
+    one as a (discounted) cold generation, so an exhausted limit is answered
+    with 429 and Retry-After.
+
+    Results are streamed as newline-delimited JSON as each playlist finishes,
+    one `{"index": i, "playlist": {...}}` or `{"index": i, "error": "..."}`
+    line per request, where `index` is the request's position in the batch.
+    """
+    logger.info(f"Received batch playlist request for {len(batch.requests)} playlists")
+
+    # Reconnect in the background; cached playlists are still streamed
+    spotify_client.ensure_reconnecting()
+
+    requests = [(r.activity, r.vibe, r.duration) for r in batch.requests]
+    cached = await playlist_service.find_generated_playlists(requests)
+    cold = len(set(requests) - cached.keys())
+    await rate_limit.charge_batch(len(requests) - cold, cold)
+
+    async def stream():
+        async for index, playlist_data in playlist_service.create_activity_playlists(
+            requests, cold_gate=rate_limit.prepaid_batch(), cached=cached
+        ):
+            if "error" in playlist_data:
+                line = json.dumps({"index": index, "error": playlist_data["error"]})
+            else:
+                try:
+                    playlist = PlaylistResponse(**playlist_data).model_dump_json()
+                    line = f'{{"index":{index},"playlist":{playlist}}}'
+                except Exception as e:
+                    logger.error(f"Invalid batch playlist at index {index}: {e}")
+                    line = json.dumps(
+                        {"index": index, "error": "Invalid playlist data"}
+                    )
+            yield line + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)."""
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+@router.get(
+    "/playlist/{playlist_id}",
+    response_model=PlaylistResponse,
+    dependencies=[Depends(limit_read)],
+)
 async def get_playlist_by_id(
         playlist_id: str,
         playlist_service: PlaylistServiceDep,
+        cache_config: CacheConfigDep,
+        view: Annotated[
+            Literal["full", "summary"],
+            Query(description="summary omits album objects and keeps a cover per track"),
+        ] = "full",
+        fields: Annotated[
+            str | None,
+            Query(
+                description="Comma-separated fields to return, e.g. name,tracks.name; overrides view"
+            ),
+        ] = None,
+        if_none_match: Annotated[str | None, Header()] = None,
+        accept_encoding: Annotated[str | None, Header()] = None,
 ):
     """
     Get a playlist by its ID from cache.
+
+    Playlists are stored as validated response bodies with slim projections
+    and precompressed variants, so they are returned as-is without decoding,
+    re-validation or compression. A fields selection is projected from the
+    smallest stored view that covers it. Stored playlists don't change, so
+    responses carry an ETag and Cache-Control, and conditional requests are
+    answered with 304 from the stored ETag alone.
     """
     logger.info(f"Received request for playlist ID: {playlist_id}")
 
+    variant = None if view == "full" else view
+    if fields:
+        try:
+            playlist_fields, track_fields = parse_fields(fields)
+        except InvalidFieldsError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        view = source_view(playlist_fields, track_fields)
+        variant = fields_variant(playlist_fields, track_fields)
+
+    # Field selections are projected per request and sent uncompressed
+    encoding = None if fields else negotiate_encoding(accept_encoding)
+    headers = {
+        "Cache-Control": (
+            f"public, max-age={cache_config.playlist_max_age_seconds}, "
+            f"s-maxage={cache_config.playlist_shared_max_age_seconds}"
+        ),
+        "Vary": "Accept-Encoding",
+    }
+
     try:
+        if if_none_match:
+            etag = await playlist_service.get_playlist_etag(playlist_id)
+            if etag:
+                etag = representation_etag(etag, encoding, variant)
+                if _etag_matches(if_none_match, etag):
+                    logger.info(f"Playlist not modified: {playlist_id}")
+                    return Response(status_code=304, headers={**headers, "ETag": etag})
+
         # Try to get playlist from cache by ID
-        playlist_data = await playlist_service.get_playlist_by_id(playlist_id)
+        body, etag = await playlist_service.get_playlist_representation(
+            playlist_id, encoding, view
+        )
 
-        if not playlist_data:
+        if not body:
             logger.warning(f"Playlist not found: {playlist_id}")
             raise HTTPException(
                 status_code=404,
                 detail=f"Playlist with ID {playlist_id} not found"
             )
 
+        if fields:
+            body = project(body, playlist_fields, track_fields)
+        headers["ETag"] = representation_etag(etag, encoding, variant)
+        if encoding:
+            headers["Content-Encoding"] = encoding
+
         logger.info(f"Successfully retrieved playlist: {playlist_id}")
-        return PlaylistResponse(**playlist_data)
+        return Response(content=body, media_type="application/json", headers=headers)
 
     except HTTPException:
         raise
@@ -93,23 +263,88 @@ async def get_playlist_by_id(
         ) from e
 
 
-@router.get("/health")
-async def playlist_health(spotify_client: SpotifyClientDep):
-    """Health check for playlist service."""
+@router.get("/playlists", response_model=PlaylistBatchResponse)
+async def get_playlists(
+    playlist_service: PlaylistServiceDep,
+    cache_config: CacheConfigDep,
+    rate_limit: ReadRateLimitDep,
+    ids: Annotated[
+        list[str],
+        Query(description="Playlist IDs, comma-separated and/or repeated"),
+    ],
+    view: Annotated[
+        Literal["full", "summary"],
+        Query(description="summary omits album objects and keeps a cover per track"),
+    ] = "full",
+    fields: Annotated[
+        str | None,
+        Query(
+            description="Comma-separated fields to return for each playlist, e.g. name,tracks.name; overrides view"
+        ),
+    ] = None,
+):
+    """
+    Get several playlists by ID in one request, e.g. for a list of saved
+    playlists. Found playlists are returned in request order; unknown IDs
+    are listed under `missing`. A fields selection applies to every playlist.
+    """
+    # Deduplicate while keeping request order
+    playlist_ids = list(
+        dict.fromkeys(
+            pid.strip() for item in ids for pid in item.split(",") if pid.strip()
+        )
+    )
+    if not playlist_ids:
+        raise HTTPException(status_code=400, detail="No playlist IDs given")
+    if len(playlist_ids) > cache_config.batch_max_ids:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {cache_config.batch_max_ids} playlist IDs per request",
+        )
+
+    if fields:
+        try:
+            playlist_fields, track_fields = parse_fields(fields)
+        except InvalidFieldsError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        view = source_view(playlist_fields, track_fields)
+
+    logger.info(f"Received batch request for {len(playlist_ids)} playlists")
+
+    # Each ID counts as a read; the first was charged already
+    await rate_limit.charge(len(playlist_ids) - 1)
+
     try:
-        if not spotify_client.is_connected():
-            connected = await spotify_client.connect()
-            if not connected:
-                return {"status": "unhealthy", "spotify": "disconnected"}
-
-        # Simple test search
-        test_tracks = spotify_client.search_tracks("test", limit=1)
-
-        return {
-            "status": "healthy",
-            "spotify": "connected",
-            "test_search": len(test_tracks) > 0,
-        }
+        bodies, missing = await playlist_service.get_playlists(playlist_ids, view)
     except Exception as e:
-        logger.error(f"Playlist health check failed: {e}")
-        return {"status": "unhealthy", "error": str(e)}
\ No newline at end of file
+        logger.error(f"Unexpected error retrieving playlists: {e}")
+        raise HTTPException(
+            status_code=500, detail="Internal server error while retrieving playlists"
+        ) from e
+
+    if fields:
+        bodies = [project(body, playlist_fields, track_fields) for body in bodies]
+    # Stored bodies are already serialized, so splice them in without decoding
+    content = b"".join(
+        [
+            b'{"playlists":[',
+            b",".join(bodies),
+            b'],"missing":',
+            json.dumps(missing).encode(),
+            b"}",
+        ]
+    )
+    return Response(content=content, media_type="application/json")
+
+
+@router.get("/health")
+async def playlist_health(health_monitor: HealthMonitorDep):
+    """
+    Health check for playlist service, from the last background probe of
+    Spotify rather than a live request.
+    """
+    spotify = health_monitor.snapshot().get("spotify", {"status": "unknown"})
+    return {
+        "status": spotify["status"],
+        "spotify": spotify,
+    }
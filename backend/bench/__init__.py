@@ -0,0 +1,3 @@
+"""
+Benchmarks and load tests against local upstream stand-ins.
+"""
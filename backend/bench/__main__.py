@@ -0,0 +1,278 @@
+"""
+Benchmark CLI.
+
+    python -m bench service [--mode service|api|both] [--scenarios cold,warm,...]
+    python -m bench load [--mix zipf|share-burst|cold-start] [--concurrency 1,4,16]
+        [--serve-local N | --urls http://host:port,...] [--scale]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+
+from .fakes import FaultProfile
+from .stats import compare, format_table, latency_summary, load_json, save_json
+
+COMPARE_KEYS = [
+    "p50_ms",
+    "p95_ms",
+    "p99_ms",
+    "spotify_calls_per_op",
+    "reccobeats_calls_per_op",
+    "redis_round_trips_per_op",
+]
+
+
+def _fault_args(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_argument_group("upstream stand-ins")
+    group.add_argument("--spotify-latency-ms", type=float, default=30.0)
+    group.add_argument("--reccobeats-latency-ms", type=float, default=15.0)
+    group.add_argument("--jitter-ms", type=float, default=10.0)
+    group.add_argument("--tail-probability", type=float, default=0.02)
+    group.add_argument("--tail-latency-ms", type=float, default=300.0)
+    group.add_argument("--error-rate", type=float, default=0.0)
+    group.add_argument("--seed", type=int, default=42)
+    group.add_argument(
+        "--redis-url",
+        default=None,
+        help="Real Redis to use (its database is FLUSHED); defaults to fakeredis",
+    )
+    group.add_argument("--hedge", action="store_true", help="Enable ReccoBeats hedging")
+
+
+def _faults(args: argparse.Namespace, latency_ms: float) -> FaultProfile:
+    return FaultProfile(
+        latency_ms=latency_ms,
+        jitter_ms=args.jitter_ms,
+        tail_probability=args.tail_probability,
+        tail_latency_ms=args.tail_latency_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+
+
+async def _service_command(args: argparse.Namespace) -> int:
+    from .environment import BenchEnvironment
+    from .service import SCENARIOS, ApiTarget, ServiceTarget, run_scenario
+
+    env = await BenchEnvironment(
+        spotify_faults=_faults(args, args.spotify_latency_ms),
+        reccobeats_faults=_faults(args, args.reccobeats_latency_ms),
+        redis_url=args.redis_url,
+        hedge=args.hedge,
+    ).start()
+
+    modes = ["service", "api"] if args.mode == "both" else [args.mode]
+    scenarios = args.scenarios.split(",") if args.scenarios else list(SCENARIOS)
+    results = []
+    try:
+        for mode in modes:
+            target = ServiceTarget(env) if mode == "service" else ApiTarget(env)
+            try:
+                for scenario in scenarios:
+                    iterations = args.iterations * (
+                        10 if scenario in ("warm", "read") else 1
+                    )
+                    result = await run_scenario(env, target, scenario, iterations)
+                    result.update(latency_summary(result.pop("latencies")))
+                    results.append(result)
+            finally:
+                await target.close()
+    finally:
+        await env.close()
+
+    baseline = {}
+    if args.baseline:
+        baseline = {
+            (r["mode"], r["scenario"]): r for r in load_json(args.baseline)["results"]
+        }
+        for result in results:
+            previous = baseline.get((result["mode"], result["scenario"]))
+            if previous:
+                deltas = compare(result, previous, COMPARE_KEYS)
+                result["vs_baseline"] = " ".join(
+                    f"{k.split('_')[0]}:{v}" for k, v in deltas.items()
+                )
+
+    columns = ["mode", "scenario", "iterations", "errors", *COMPARE_KEYS]
+    if baseline:
+        columns.append("vs_baseline")
+    print(format_table(results, columns))
+
+    if args.output:
+        save_json(args.output, {"results": results, "args": vars(args)})
+        print(f"\nResults written to {args.output}")
+    return 0
+
+
+async def _load_command(args: argparse.Namespace) -> int:
+    from .fakes import FakeReccoBeats, FakeSpotify
+    from .load import LocalWorkers, Workload, find_saturation, prepare, run_step, sweep
+
+    upstreams, workers = [], None
+    if args.serve_local:
+        spotify = FakeSpotify(_faults(args, args.spotify_latency_ms)).start()
+        reccobeats = FakeReccoBeats(_faults(args, args.reccobeats_latency_ms)).start()
+        upstreams = [spotify, reccobeats]
+        workers = LocalWorkers(
+            args.serve_local,
+            spotify.base_url,
+            reccobeats.base_url,
+            args.redis_url,
+            args.port,
+            quiet=not args.verbose,
+        )
+        if args.serve_local > 1 and not args.redis_url:
+            print(
+                "Workers have separate fakeredis instances; reads of playlists generated "
+                "by another worker will 404. Pass --redis-url to share a cache.",
+                file=sys.stderr,
+            )
+        urls = workers.urls
+    else:
+        urls = args.urls.split(",")
+
+    # With --scale, run the sweep against 1..N targets to check scaling
+    target_counts = range(1, len(urls) + 1) if args.scale else [len(urls)]
+    rows = []
+    try:
+        if workers:
+            await workers.wait_ready()
+        for count in target_counts:
+            workload = Workload(
+                args.mix, zipf_s=args.zipf_s, read_ratio=args.read_ratio, seed=args.seed
+            )
+            await prepare(urls[:count], workload, args.timeout)
+            step_rows = []
+            for concurrency in sweep(args.concurrency):
+                # Keep the load per target constant when scaling out
+                concurrency *= count if args.scale else 1
+                result = await run_step(
+                    urls[:count], workload, concurrency, args.duration, args.timeout
+                )
+                row = result.summary()
+                step_rows.append(row)
+                print(
+                    f"targets={count} concurrency={concurrency}: {row['rps']} req/s, "
+                    f"p99 {row['p99_ms']} ms, errors {row['error_rate']}",
+                    flush=True,
+                )
+            saturation = find_saturation(step_rows)
+            for row in step_rows:
+                row["saturated"] = "*" if row is saturation else ""
+            rows.extend(step_rows)
+    finally:
+        if workers:
+            workers.stop()
+        for upstream in upstreams:
+            upstream.stop()
+
+    columns = [
+        "targets",
+        "concurrency",
+        "requests",
+        "rps",
+        "error_rate",
+        "p50_ms",
+        "p95_ms",
+        "p99_ms",
+        "generate_p99_ms",
+        "read_p99_ms",
+        "saturated",
+    ]
+    print()
+    print(format_table(rows, columns))
+    print("\n* last step before throughput flattened while p99 kept climbing")
+
+    if args.scale:
+        # Efficiency: best throughput with N targets relative to N x one target
+        best = {}
+        for row in rows:
+            best[row["targets"]] = max(best.get(row["targets"], 0), row["rps"])
+        single = best.get(1) or 0
+        scaling = [
+            {
+                "targets": n,
+                "best_rps": rps,
+                "efficiency": f"{rps / (n * single) * 100:.0f}%" if single else "-",
+            }
+            for n, rps in best.items()
+        ]
+        print()
+        print(format_table(scaling, ["targets", "best_rps", "efficiency"]))
+
+    if args.output:
+        save_json(args.output, {"results": rows, "args": vars(args)})
+        print(f"\nResults written to {args.output}")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench", description=__doc__)
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show app logs")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    service = commands.add_parser(
+        "service",
+        help="PlaylistService / API latency for cold, warm and partial-warm caches",
+    )
+    service.add_argument("--mode", choices=["service", "api", "both"], default="both")
+    service.add_argument(
+        "--scenarios", help="Comma-separated subset of cold,warm,partial-warm,read"
+    )
+    service.add_argument("--iterations", type=int, default=10)
+    service.add_argument("--output", help="Write results as JSON")
+    service.add_argument("--baseline", help="Compare against a previous --output file")
+    _fault_args(service)
+
+    load = commands.add_parser(
+        "load", help="Concurrency sweep against running API workers"
+    )
+    load.add_argument(
+        "--mix", choices=["zipf", "share-burst", "cold-start"], default="zipf"
+    )
+    load.add_argument(
+        "--concurrency", default="1,2,4,8,16,32", help="Comma-separated sweep"
+    )
+    load.add_argument("--duration", type=float, default=10.0, help="Seconds per step")
+    load.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout")
+    load.add_argument(
+        "--zipf-s", type=float, default=1.1, help="Zipf exponent of the zipf mix"
+    )
+    load.add_argument(
+        "--read-ratio", type=float, default=0.5, help="Share of reads in the zipf mix"
+    )
+    load.add_argument("--output", help="Write results as JSON")
+    load.add_argument(
+        "--scale", action="store_true", help="Repeat the sweep with 1..N targets"
+    )
+    targets = load.add_mutually_exclusive_group(required=True)
+    targets.add_argument(
+        "--urls", help="Comma-separated base URLs of running API workers"
+    )
+    targets.add_argument(
+        "--serve-local",
+        type=int,
+        metavar="N",
+        help="Start N single-worker uvicorn processes against local stand-ins",
+    )
+    load.add_argument(
+        "--port", type=int, default=18000, help="First port for --serve-local"
+    )
+    _fault_args(load)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    if not args.verbose:
+        logging.disable(logging.WARNING)
+
+    if args.command == "service":
+        return asyncio.run(_service_command(args))
+    if args.command == "load":
+        return asyncio.run(_load_command(args))
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
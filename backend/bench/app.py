@@ -0,0 +1,51 @@
+"""
+The API app wired to benchmark stand-ins, for load testing real uvicorn workers.
+
+    BENCH_SPOTIFY_URL=... BENCH_RECCOBEATS_URL=... [BENCH_REDIS_URL=...] \\
+        uvicorn bench.app:app
+
+Without BENCH_REDIS_URL each worker gets its own fakeredis, so caches are
+not shared between workers.
+"""
+
+import os
+from contextlib import asynccontextmanager
+
+from app import dependencies
+from app.main import app
+
+from .environment import BenchEnvironment
+
+
+@asynccontextmanager
+async def bench_lifespan(app):
+    env = await BenchEnvironment(
+        spotify_url=os.environ["BENCH_SPOTIFY_URL"],
+        reccobeats_url=os.environ["BENCH_RECCOBEATS_URL"],
+        redis_url=os.getenv("BENCH_REDIS_URL") or None,
+        hedge=os.getenv("BENCH_HEDGE", "false").lower() in ("1", "true", "yes"),
+    ).start(flush=False)
+
+    app.dependency_overrides.update(
+        {
+            dependencies.get_redis_client: lambda: env.redis_client,
+            dependencies.get_spotify_client: lambda: env.spotify_client,
+            dependencies.get_reccobeats_client: lambda: env.reccobeats_client,
+            dependencies.get_negative_cache: lambda: env.negative_cache,
+            dependencies.get_entity_cache: lambda: env.entity_cache,
+            dependencies.get_rate_limiter: lambda: env.rate_limiter,
+        }
+    )
+    app.state.redis_client = env.redis_client
+    app.state.spotify_client = env.spotify_client
+    app.state.reccobeats_client = env.reccobeats_client
+    try:
+        yield
+    finally:
+        await env.close()
+
+
+# Skip the production lifespan, which would authenticate against real Spotify
+app.router.lifespan_context = bench_lifespan
+
+__all__ = ["app"]
@@ -0,0 +1,139 @@
+from dataclasses import dataclass, field
+
+import spotipy
+
+from app.db.redis import RedisClient
+from app.integrations.reccobeats import ReccoBeatsClient, ReccoBeatsConfig
+from app.integrations.spotify import SpotifyClient, SpotifyConfig
+from app.observability.metrics import REDIS_COMMANDS
+from app.playlists import (
+    CacheConfig,
+    EntityCache,
+    NegativeCache,
+    PlaylistRepo,
+    PlaylistService,
+)
+from app.ratelimit import RateLimitConfig, RateLimiter
+
+from .fakes import FakeReccoBeats, FakeSpotify, FaultProfile
+
+
+def redis_round_trips() -> int:
+    """Total Redis round trips issued through RedisClient so far."""
+    return int(
+        sum(
+            sample.value
+            for metric in REDIS_COMMANDS.collect()
+            for sample in metric.samples
+            if sample.name.endswith("_total")
+        )
+    )
+
+
+@dataclass
+class Counters:
+    """Point-in-time upstream call and Redis round-trip counts."""
+
+    spotify: dict[str, int] = field(default_factory=dict)
+    reccobeats: dict[str, int] = field(default_factory=dict)
+    redis: int = 0
+
+    def since(self, earlier: "Counters") -> dict[str, int]:
+        return {
+            "spotify_calls": sum(self.spotify.values()) - sum(earlier.spotify.values()),
+            "reccobeats_calls": sum(self.reccobeats.values())
+            - sum(earlier.reccobeats.values()),
+            "redis_round_trips": self.redis - earlier.redis,
+        }
+
+
+class BenchEnvironment:
+    """
+    Local stand-ins for every dependency of PlaylistService: fake Spotify and
+    ReccoBeats HTTP servers, and either fakeredis or a real Redis database.
+    """
+
+    def __init__(
+        self,
+        spotify_faults: FaultProfile | None = None,
+        reccobeats_faults: FaultProfile | None = None,
+        redis_url: str | None = None,
+        hedge: bool = False,
+        spotify_url: str | None = None,
+        reccobeats_url: str | None = None,
+    ):
+        # Start our own stand-ins unless pointed at already running ones
+        self.spotify = None if spotify_url else FakeSpotify(spotify_faults).start()
+        self.reccobeats = (
+            None if reccobeats_url else FakeReccoBeats(reccobeats_faults).start()
+        )
+        spotify_url = spotify_url or self.spotify.base_url
+        reccobeats_url = reccobeats_url or self.reccobeats.base_url
+        self.redis_url = redis_url
+        self.redis_client = RedisClient(redis_url or "redis://fake")
+        self.cache_config = CacheConfig()
+        self.negative_cache = NegativeCache(self.cache_config)
+        self.entity_cache = EntityCache(self.cache_config.entity_cache_size)
+        # Every benchmark request comes from one client, so limits would
+        # measure the limiter rather than the service
+        self.rate_limiter = RateLimiter(
+            RateLimitConfig(enabled=False), self.redis_client
+        )
+
+        self.spotify_client = SpotifyClient(
+            SpotifyConfig(client_id="bench", client_secret="bench")
+        )
+        self.spotify_client.sp = spotipy.Spotify(
+            auth="bench-token", retries=2, status_retries=2, backoff_factor=0.01
+        )
+        self.spotify_client.sp.prefix = f"{spotify_url}/v1/"
+        self.spotify_client.user_id = "bench-user"
+
+        self.reccobeats_client = ReccoBeatsClient(
+            ReccoBeatsConfig(base_url=reccobeats_url, hedge_enabled=hedge)
+        )
+
+    async def start(self, flush: bool = True) -> "BenchEnvironment":
+        if self.redis_url:
+            await self.redis_client.connect()
+        else:
+            import fakeredis
+
+            self.redis_client._redis = fakeredis.FakeAsyncRedis()
+        if flush:
+            await self.flush()
+        return self
+
+    async def close(self) -> None:
+        await self.redis_client.disconnect()
+        for upstream in (self.spotify, self.reccobeats):
+            if upstream is not None:
+                upstream.stop()
+
+    async def flush(self) -> None:
+        """Drop all cached state: the Redis database and in-process caches."""
+        await self.redis_client.redis.flushdb()
+        self.reccobeats_client.clear_cache()
+        self.negative_cache = NegativeCache(self.cache_config)
+        self.entity_cache = EntityCache(self.cache_config.entity_cache_size)
+
+    async def delete(self, pattern: str) -> None:
+        """Delete Redis keys matching a pattern."""
+        keys = await self.redis_client.redis.keys(pattern)
+        if keys:
+            await self.redis_client.redis.delete(*keys)
+
+    def repo(self) -> PlaylistRepo:
+        return PlaylistRepo(
+            self.redis_client, self.negative_cache, self.cache_config, self.entity_cache
+        )
+
+    def service(self) -> PlaylistService:
+        return PlaylistService(self.spotify_client, self.reccobeats_client, self.repo())
+
+    def counters(self) -> Counters:
+        return Counters(
+            spotify=dict(self.spotify.calls) if self.spotify else {},
+            reccobeats=dict(self.reccobeats.calls) if self.reccobeats else {},
+            redis=redis_round_trips(),
+        )
@@ -0,0 +1,299 @@
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import urllib.parse
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+
+@dataclass
+class FaultProfile:
+    """Latency and error injection for a fake upstream."""
+
+    latency_ms: float = 20.0
+    jitter_ms: float = 10.0
+    # Probability that a request is slow, and how slow it is
+    tail_probability: float = 0.02
+    tail_latency_ms: float = 500.0
+    error_rate: float = 0.0
+    seed: int = 42
+
+    def __post_init__(self):
+        self._random = random.Random(self.seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> tuple[float, bool]:
+        """Get (delay in seconds, whether to fail) for one request."""
+        with self._lock:
+            delay = self.latency_ms + self._random.uniform(0, self.jitter_ms)
+            if self._random.random() < self.tail_probability:
+                delay = self.tail_latency_ms
+            fail = self._random.random() < self.error_rate
+        return delay / 1000, fail
+
+
+def _stable_hash(*parts: Any) -> int:
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class FakeUpstream:
+    """
+    Base class for a threaded local HTTP server standing in for an upstream API.
+    Subclasses implement `route(method, path, query, body)`.
+    """
+
+    name = "upstream"
+
+    def __init__(self, faults: FaultProfile | None = None):
+        self.faults = faults or FaultProfile()
+        self.calls: dict[str, int] = {}
+        self._calls_lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self._server.server_port
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self) -> "FakeUpstream":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_calls(self) -> None:
+        with self._calls_lock:
+            self.calls.clear()
+
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def _count(self, route: str) -> None:
+        with self._calls_lock:
+            self.calls[route] = self.calls.get(route, 0) + 1
+
+    def route(
+        self, method: str, path: str, query: dict[str, str], body: bytes
+    ) -> tuple[str, int, Any]:
+        """Return (route name, status, JSON body)."""
+        raise NotImplementedError
+
+    def _handler_class(self):
+        upstream = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def _handle(self):
+                parsed = urllib.parse.urlparse(self.path)
+                query = dict(urllib.parse.parse_qsl(parsed.query))
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+
+                route, status, payload = upstream.route(
+                    self.command, parsed.path, query, body
+                )
+                upstream._count(route)
+
+                delay, fail = upstream.faults.sample()
+                time.sleep(delay)
+                if fail:
+                    status, payload = 503, {"error": "injected failure"}
+
+                data = json.dumps(payload).encode()
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up on the request, e.g. a hedge won
+                    self.close_connection = True
+
+            do_GET = do_POST = do_PUT = _handle
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+class FakeSpotify(FakeUpstream):
+    """
+    Fake Spotify Web API serving a deterministic synthetic catalog.
+    Search results for a query are drawn from a catalog of `catalog_size`
+    tracks, so different queries overlap the way real searches do.
+    """
+
+    name = "spotify"
+
+    def __init__(self, faults: FaultProfile | None = None, catalog_size: int = 5000):
+        self.catalog_size = catalog_size
+        self._playlists: dict[str, dict[str, Any]] = {}
+        self._playlists_lock = threading.Lock()
+        super().__init__(faults)
+
+    @staticmethod
+    def track(index: int) -> dict[str, Any]:
+        """Build the synthetic Spotify track at a catalog index."""
+        track_id = f"sp{index:07d}"
+        album_id = f"al{index // 12:06d}"
+        artist = {
+            "id": f"ar{index // 40:05d}",
+            "name": f"Artist {index // 40}",
+            "type": "artist",
+            "uri": f"spotify:artist:ar{index // 40:05d}",
+            "href": "",
+            "external_urls": {"spotify": ""},
+        }
+        return {
+            "id": track_id,
+            "name": f"Track {index}",
+            "artists": [artist],
+            "album": {
+                "id": album_id,
+                "name": f"Album {index // 12}",
+                "album_type": "album",
+                "artists": [artist],
+                "available_markets": ["US", "GB", "DE", "FR", "NL", "SE"],
+                "external_urls": {
+                    "spotify": f"https://open.spotify.com/album/{album_id}"
+                },
+                "href": f"https://api.spotify.com/v1/albums/{album_id}",
+                "images": [
+                    {
+                        "height": size,
+                        "width": size,
+                        "url": f"https://i.scdn.co/image/{album_id}-{size}",
+                    }
+                    for size in (640, 300, 64)
+                ],
+                "release_date": "2020-01-01",
+                "release_date_precision": "day",
+                "total_tracks": 12,
+                "type": "album",
+                "uri": f"spotify:album:{album_id}",
+            },
+            "duration_ms": 150_000 + _stable_hash("duration", index) % 150_000,
+            "external_urls": {"spotify": f"https://open.spotify.com/track/{track_id}"},
+            "preview_url": None,
+            "uri": f"spotify:track:{track_id}",
+        }
+
+    def route(self, method, path, query, body):
+        if path == "/v1/me" or path == "/v1/me/":
+            return "me", 200, {"id": "bench-user"}
+
+        if path == "/v1/search":
+            q = query.get("q", "")
+            limit = int(query.get("limit", 10))
+            offset = int(query.get("offset", 0))
+            start = _stable_hash("search", q) % self.catalog_size
+            items = [
+                self.track((start + (offset + i) * 7) % self.catalog_size)
+                for i in range(limit)
+            ]
+            return "search", 200, {"tracks": {"items": items}}
+
+        if method == "POST" and re.fullmatch(r"/v1/users/[^/]+/playlists", path):
+            payload = json.loads(body or b"{}")
+            with self._playlists_lock:
+                playlist_id = (
+                    f"pl{len(self._playlists):08d}{random.randrange(1 << 20):05x}"
+                )
+                playlist = {
+                    "id": playlist_id,
+                    "name": payload.get("name", ""),
+                    "description": payload.get("description", ""),
+                    "external_urls": {
+                        "spotify": f"https://open.spotify.com/playlist/{playlist_id}"
+                    },
+                    "images": [],
+                }
+                self._playlists[playlist_id] = playlist
+            return "create_playlist", 201, playlist
+
+        match = re.fullmatch(r"/v1/playlists/([^/]+)(/items|/tracks|/images)?", path)
+        if match:
+            playlist_id, sub = match.groups()
+            with self._playlists_lock:
+                playlist = self._playlists.get(playlist_id)
+            if playlist is None:
+                return "playlist", 404, {"error": "not found"}
+            if sub in ("/items", "/tracks"):
+                return "add_tracks", 201, {"snapshot_id": "bench"}
+            if sub == "/images":
+                playlist["images"] = [
+                    {
+                        "url": f"https://mosaic.scdn.co/{playlist_id}",
+                        "height": 300,
+                        "width": 300,
+                    }
+                ]
+                return "upload_cover", 202, {}
+            return "playlist", 200, playlist
+
+        return "unknown", 404, {"error": "not found"}
+
+
+class FakeReccoBeats(FakeUpstream):
+    """
+    Fake ReccoBeats API. A fraction of Spotify IDs are unknown and a
+    fraction of known tracks have no audio features, as in production.
+    """
+
+    name = "reccobeats"
+
+    def __init__(
+        self,
+        faults: FaultProfile | None = None,
+        unknown_rate: float = 0.1,
+        featureless_rate: float = 0.05,
+    ):
+        self.unknown_rate = unknown_rate
+        self.featureless_rate = featureless_rate
+        super().__init__(faults)
+
+    def _fraction(self, *parts: Any) -> float:
+        return (_stable_hash(*parts) % 10_000) / 10_000
+
+    def route(self, method, path, query, body):
+        match = re.fullmatch(r"/tracks/spotify/([^/]+)", path)
+        if match:
+            spotify_id = urllib.parse.unquote(match.group(1))
+            if self._fraction("unknown", spotify_id) < self.unknown_rate:
+                return "metadata", 404, {"success": False}
+            track = {
+                "id": f"rb-{spotify_id}",
+                "href": f"https://open.spotify.com/track/{spotify_id}",
+            }
+            return "metadata", 200, {"success": True, "track": track}
+
+        match = re.fullmatch(r"/audio-features/([^/]+)", path)
+        if match:
+            reccobeats_id = urllib.parse.unquote(match.group(1))
+            if self._fraction("featureless", reccobeats_id) < self.featureless_rate:
+                return "audio_features", 200, {"success": True, "audioFeatures": None}
+            features = {
+                "energy": self._fraction("energy", reccobeats_id),
+                "valence": self._fraction("valence", reccobeats_id),
+                "tempo": 60 + 120 * self._fraction("tempo", reccobeats_id),
+                "danceability": self._fraction("danceability", reccobeats_id),
+            }
+            return "audio_features", 200, {"success": True, "audioFeatures": features}
+
+        return "unknown", 404, {"success": False}
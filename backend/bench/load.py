@@ -0,0 +1,319 @@
+import asyncio
+import itertools
+import os
+import random
+import subprocess
+import sys
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+from .stats import latency_summary, percentile
+
+MIXES = ("zipf", "share-burst", "cold-start")
+
+# A wider spread than the service benchmark; popularity follows list order
+ACTIVITIES = [
+    "working out",
+    "studying",
+    "running",
+    "cooking",
+    "driving",
+    "cleaning",
+    "yoga",
+    "reading",
+    "coding",
+    "relaxing",
+    "party",
+    "walking",
+    "gaming",
+    "sleeping",
+    "cycling",
+    "meditating",
+    "commuting",
+    "hiking",
+    "dancing",
+    "writing",
+]
+VIBES = [
+    "upbeat",
+    "chill",
+    "focused",
+    "energetic",
+    "calm",
+    "happy",
+    "motivational",
+    "dark",
+]
+DURATIONS = [30, 15, 60, 45, 90]
+
+
+@dataclass
+class Request:
+    kind: str
+    method: str
+    path: str
+    body: dict[str, Any] | None = None
+
+
+@dataclass
+class Sample:
+    kind: str
+    latency: float
+    status: int
+
+
+class Workload:
+    """
+    Generates requests for one mix.
+
+    - zipf: generations with Zipf-distributed activity/vibe/duration (so most
+      hit the cache once warm), interleaved with reads of generated playlists
+    - share-burst: every client reads the same few shared playlists
+    - cold-start: every generation is for parameters never seen before
+    """
+
+    def __init__(
+        self, mix: str, zipf_s: float = 1.1, read_ratio: float = 0.5, seed: int = 42
+    ):
+        self.mix = mix
+        self.read_ratio = read_ratio
+        self.random = random.Random(seed)
+        self.combos = list(itertools.product(ACTIVITIES, VIBES, DURATIONS))
+        # Popularity is the product of each dimension's rank, so the head is
+        # dominated by popular activities with popular vibes
+        weights = [
+            1
+            / (
+                (ACTIVITIES.index(a) + 1)
+                * (VIBES.index(v) + 1)
+                * (DURATIONS.index(d) + 1)
+            )
+            ** zipf_s
+            for a, v, d in self.combos
+        ]
+        self.cumulative = list(itertools.accumulate(weights))
+        self.playlist_ids: list[str] = []
+        self.shared_ids: list[str] = []
+        self._cold_counter = itertools.count()
+        self._run_id = f"{os.getpid()}-{int(time.time())}"
+
+    @staticmethod
+    def _generate(activity: str, vibe: str, duration: int) -> Request:
+        return Request(
+            "generate",
+            "POST",
+            "/api/v1/generate-playlist",
+            {"activity": activity, "vibe": vibe, "duration": duration},
+        )
+
+    def zipf_generate(self) -> Request:
+        return self._generate(
+            *self.random.choices(self.combos, cum_weights=self.cumulative)[0]
+        )
+
+    def next(self) -> Request:
+        if self.mix == "share-burst" and self.shared_ids:
+            return Request(
+                "read", "GET", f"/api/v1/playlist/{self.random.choice(self.shared_ids)}"
+            )
+        if self.mix == "cold-start":
+            n = next(self._cold_counter)
+            return self._generate(
+                f"storm {self._run_id} {n}", self.random.choice(VIBES), 30
+            )
+        if self.playlist_ids and self.random.random() < self.read_ratio:
+            return Request(
+                "read",
+                "GET",
+                f"/api/v1/playlist/{self.random.choice(self.playlist_ids)}",
+            )
+        return self.zipf_generate()
+
+    def record(self, request: Request, response: httpx.Response) -> None:
+        if request.kind == "generate" and response.status_code == 200:
+            if len(self.playlist_ids) < 10_000:
+                self.playlist_ids.append(response.json()["id"])
+
+
+@dataclass
+class StepResult:
+    concurrency: int
+    targets: int
+    duration: float
+    samples: list[Sample] = field(default_factory=list)
+    transport_errors: int = 0
+
+    def summary(self) -> dict[str, Any]:
+        total = len(self.samples) + self.transport_errors
+        errors = self.transport_errors + sum(s.status >= 400 for s in self.samples)
+        row = {
+            "targets": self.targets,
+            "concurrency": self.concurrency,
+            "requests": total,
+            "rps": round(len(self.samples) / self.duration, 1) if self.duration else 0,
+            "error_rate": f"{errors / total * 100:.2f}%" if total else "-",
+            **latency_summary([s.latency for s in self.samples]),
+        }
+        for kind in ("generate", "read"):
+            latencies = [s.latency for s in self.samples if s.kind == kind]
+            if latencies:
+                row[f"{kind}_p99_ms"] = round(percentile(latencies, 99) * 1000, 1)
+        return row
+
+
+async def run_step(
+    urls: list[str],
+    workload: Workload,
+    concurrency: int,
+    duration: float,
+    timeout: float,
+) -> StepResult:
+    """Closed-loop load: `concurrency` workers, each sending back-to-back requests."""
+    result = StepResult(concurrency=concurrency, targets=len(urls), duration=duration)
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+    clients = [
+        httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits) for url in urls
+    ]
+    deadline = time.perf_counter() + duration
+
+    async def worker(index: int) -> None:
+        client = clients[index % len(clients)]
+        while time.perf_counter() < deadline:
+            request = workload.next()
+            start = time.perf_counter()
+            try:
+                response = await client.request(
+                    request.method, request.path, json=request.body
+                )
+            except httpx.HTTPError:
+                result.transport_errors += 1
+                continue
+            result.samples.append(
+                Sample(request.kind, time.perf_counter() - start, response.status_code)
+            )
+            workload.record(request, response)
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    finally:
+        for client in clients:
+            await client.aclose()
+    result.duration = time.perf_counter() - started
+    return result
+
+
+async def prepare(urls: list[str], workload: Workload, timeout: float) -> None:
+    """Generate the playlists the reads of a mix will hit."""
+    async with httpx.AsyncClient(base_url=urls[0], timeout=timeout) as client:
+        if workload.mix == "share-burst":
+            for _ in range(3):
+                request = workload.zipf_generate()
+                response = await client.post(request.path, json=request.body)
+                if response.status_code == 200:
+                    workload.shared_ids.append(response.json()["id"])
+        elif workload.mix == "zipf":
+            for _ in range(20):
+                request = workload.zipf_generate()
+                response = await client.post(request.path, json=request.body)
+                workload.record(request, response)
+
+
+def find_saturation(rows: list[dict[str, Any]]) -> dict[str, Any] | None:
+    """
+    First step after which adding concurrency stops paying off: throughput
+    grows less than 10% while p99 latency grows more than 50%, or errors appear.
+    """
+    for previous, current in itertools.pairwise(rows):
+        gain = (
+            (current["rps"] - previous["rps"]) / previous["rps"]
+            if previous["rps"]
+            else 0
+        )
+        p99_growth = (
+            current["p99_ms"] / previous["p99_ms"]
+            if previous["p99_ms"] and current["p99_ms"]
+            else 1
+        )
+        if (gain < 0.10 and p99_growth > 1.5) or current["error_rate"] not in (
+            "0.00%",
+            "-",
+        ):
+            return previous
+    return None
+
+
+class LocalWorkers:
+    """Spawns uvicorn workers serving bench.app against shared upstream stand-ins."""
+
+    def __init__(
+        self,
+        count: int,
+        spotify_url: str,
+        reccobeats_url: str,
+        redis_url: str | None,
+        base_port: int = 18000,
+        quiet: bool = True,
+    ):
+        self.urls = [f"http://127.0.0.1:{base_port + i}" for i in range(count)]
+        env = {
+            **os.environ,
+            "BENCH_SPOTIFY_URL": spotify_url,
+            "BENCH_RECCOBEATS_URL": reccobeats_url,
+            "BENCH_REDIS_URL": redis_url or "",
+            "SPOTIFY_CLIENT_ID": os.getenv("SPOTIFY_CLIENT_ID", "bench"),
+            "SPOTIFY_CLIENT_SECRET": os.getenv("SPOTIFY_CLIENT_SECRET", "bench"),
+        }
+        self.processes = [
+            subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "uvicorn",
+                    "bench.app:app",
+                    "--host",
+                    "127.0.0.1",
+                    "--port",
+                    str(base_port + i),
+                    "--workers",
+                    "1",
+                    "--log-level",
+                    "warning",
+                    "--no-access-log",
+                ],
+                env=env,
+                stdout=subprocess.DEVNULL if quiet else None,
+                stderr=subprocess.DEVNULL if quiet else None,
+            )
+            for i in range(count)
+        ]
+
+    async def wait_ready(self, timeout: float = 30.0) -> None:
+        deadline = time.monotonic() + timeout
+        async with httpx.AsyncClient(timeout=1.0) as client:
+            for url in self.urls:
+                while True:
+                    try:
+                        if (await client.get(f"{url}/")).status_code == 200:
+                            break
+                    except httpx.HTTPError:
+                        pass
+                    if time.monotonic() > deadline:
+                        raise RuntimeError(f"Worker at {url} did not become ready")
+                    await asyncio.sleep(0.2)
+
+    def stop(self) -> None:
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.wait(timeout=10)
+
+
+def sweep(concurrency: str) -> Iterator[int]:
+    return (int(c) for c in concurrency.split(","))
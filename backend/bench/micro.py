@@ -0,0 +1,209 @@
+"""
+Microbenchmarks for the pure functions on the generation and read paths.
+
+Each benchmark runs over synthetic track sets of increasing size. They are
+timed by the pytest-benchmark suite in tests/benchmarks, which compares the
+median time per call against bench/baselines/micro.json with a margin taken
+from the spread (IQR) of both runs, so an unchanged tree doesn't fail.
+"""
+
+import math
+import random
+import statistics
+import timeit
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from app.playlists.models import PlaylistResponse
+from app.playlists.repo import PlaylistRepo
+from app.playlists.service import PlaylistService
+
+from .fakes import FakeSpotify
+
+# Activity/vibe pairs covering known terms, unknown terms and genre extras
+QUERY_INPUTS = [
+    ("working out", "upbeat"),
+    ("studying", "chill"),
+    ("cooking", "happy"),
+    ("underwater basket weaving", "dark"),
+]
+
+
+@dataclass
+class Benchmark:
+    name: str
+    # Builds the callable to time for a size; None means size-independent
+    setup: Callable[[int | None], Callable[[], Any]]
+    sized: bool = True
+
+
+def synthetic_tracks(n: int) -> list[dict[str, Any]]:
+    """Spotify-shaped tracks, as returned by search."""
+    return [FakeSpotify.track(i) for i in range(n)]
+
+
+def synthetic_features(n: int, seed: int = 7) -> list[dict[str, Any]]:
+    """ReccoBeats-shaped audio features, with a few missing values."""
+    rng = random.Random(seed)
+    features = []
+    for _ in range(n):
+        item = {
+            "energy": rng.random(),
+            "valence": rng.random(),
+            "tempo": 60 + 120 * rng.random(),
+            "danceability": rng.random(),
+        }
+        if rng.random() < 0.05:
+            item["tempo"] = None
+        features.append(item)
+    return features
+
+
+def _service() -> PlaylistService:
+    # The benchmarked methods don't touch the clients or the repo
+    return PlaylistService(None, None, None)
+
+
+def _repo() -> PlaylistRepo:
+    return PlaylistRepo(None)
+
+
+def bench_search_queries(_: int | None) -> Callable[[], Any]:
+    service = _service()
+
+    def run():
+        for activity, vibe in QUERY_INPUTS:
+            service._generate_search_queries(activity, vibe)
+
+    return run
+
+
+def bench_track_matches_vibe(n: int) -> Callable[[], Any]:
+    service = _service()
+    features = synthetic_features(n)
+
+    def run():
+        for vibe in ("chill", "upbeat", "focused"):
+            for item in features:
+                service._track_matches_vibe(item, vibe)
+
+    return run
+
+
+def bench_select_tracks_for_duration(n: int) -> Callable[[], Any]:
+    service = _service()
+    tracks = synthetic_tracks(n)
+
+    def run():
+        # Same shuffle every call, so the selection stops at the same point
+        random.seed(42)
+        service._select_tracks_for_duration(tracks, 60)
+
+    return run
+
+
+def bench_format_tracks_for_response(n: int) -> Callable[[], Any]:
+    service = _service()
+    tracks = synthetic_tracks(n)
+    return lambda: service._format_tracks_for_response(tracks)
+
+
+def bench_generate_cache_key(n: int) -> Callable[[], Any]:
+    repo = _repo()
+    ids = [f"tr{i:08d}" for i in range(n)]
+
+    def run():
+        for spotify_id in ids:
+            repo._generate_cache_key("reccobeats_metadata", spotify_id=spotify_id)
+
+    return run
+
+
+def bench_playlist_response(n: int) -> Callable[[], Any]:
+    tracks = _service()._format_tracks_for_response(synthetic_tracks(n))
+    data = {
+        "id": "pl0000000000001",
+        "name": "Upbeat Working Out",
+        "description": "Benchmark playlist",
+        "spotifyUrl": "https://open.spotify.com/playlist/pl0000000000001",
+        "imageUrl": "https://i.scdn.co/image/pl0000000000001",
+        "tracks": tracks,
+        "duration": 60,
+        "createdAt": "2025-07-01T00:00:00",
+        "activity": "working out",
+        "vibe": "upbeat",
+    }
+    return lambda: PlaylistResponse(**data)
+
+
+BENCHMARKS = [
+    Benchmark("generate_search_queries", bench_search_queries, sized=False),
+    Benchmark("track_matches_vibe", bench_track_matches_vibe),
+    Benchmark("select_tracks_for_duration", bench_select_tracks_for_duration),
+    Benchmark("format_tracks_for_response", bench_format_tracks_for_response),
+    Benchmark("generate_cache_key", bench_generate_cache_key),
+    Benchmark("playlist_response_validation", bench_playlist_response),
+]
+
+
+REFERENCE_KEY = "_reference"
+# Sizes of the synthetic track sets the sized benchmarks run over
+SIZES = [100, 1_000, 10_000]
+# Rounds each benchmark is timed for; results compare by median
+ROUNDS = 30
+# Target duration of one round, reached by calling the function repeatedly
+ROUND_SECONDS = 0.02
+
+# A benchmark regresses when its median exceeds the (speed-scaled) baseline
+# median by more than SPREAD_FACTOR times the combined relative IQRs of both
+# runs, and by at least MIN_CHANGE, so noisy benchmarks get a wider margin
+SPREAD_FACTOR = 3.0
+MIN_CHANGE = 0.10
+
+
+def reference_workload() -> None:
+    """Fixed pure-Python work used to normalise results across machines."""
+    data = {f"key{i}": i * 3 % 101 for i in range(2_000)}
+    sorted(data.items(), key=lambda item: (item[1], item[0]))
+
+
+def result_key(name: str, size: int | None) -> str:
+    return name if size is None else f"{name}[{size}]"
+
+
+def iterations_per_round(func: Callable[[], Any]) -> int:
+    """How many calls make one round last about ROUND_SECONDS."""
+    seconds = min(timeit.repeat(func, number=1, repeat=3))
+    return max(1, math.ceil(ROUND_SECONDS / max(seconds, 1e-9)))
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Median and interquartile range, in microseconds per call."""
+    q1, median, q3 = statistics.quantiles(samples, n=4, method="inclusive")
+    return {"median_us": round(median * 1e6, 3), "iqr_us": round((q3 - q1) * 1e6, 3)}
+
+
+def speed_factor(current: dict[str, float], baseline: dict[str, float]) -> float:
+    """How much slower this machine runs the reference workload than the baseline's."""
+    return current["median_us"] / baseline["median_us"]
+
+
+def allowed_change(current: dict[str, float], baseline: dict[str, float]) -> float:
+    """Largest relative slowdown attributable to the noise both runs measured."""
+    spread = (
+        current["iqr_us"] / current["median_us"]
+        + baseline["iqr_us"] / baseline["median_us"]
+    )
+    return max(MIN_CHANGE, SPREAD_FACTOR * spread)
+
+
+def compare(
+    current: dict[str, float], baseline: dict[str, float], speed: float
+) -> tuple[float, float]:
+    """
+    Relative change of the current median against the baseline median scaled
+    by `speed`, and the change allowed before it counts as a regression.
+    """
+    change = current["median_us"] / (baseline["median_us"] * speed) - 1
+    return change, allowed_change(current, baseline)
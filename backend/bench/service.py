@@ -0,0 +1,148 @@
+import itertools
+import time
+from typing import Any
+
+import httpx
+
+from .environment import BenchEnvironment
+
+SCENARIOS = ("cold", "warm", "partial-warm", "read")
+
+ACTIVITIES = [
+    "yoga",
+    "running",
+    "studying",
+    "cooking",
+    "driving",
+    "cleaning",
+    "gaming",
+    "reading",
+]
+VIBES = ["chill", "upbeat", "focused", "energetic"]
+DURATIONS = [15, 30, 60]
+
+
+def request_matrix() -> list[tuple[str, str, int]]:
+    """Deterministic list of distinct (activity, vibe, duration) requests."""
+    return list(itertools.product(ACTIVITIES, VIBES, DURATIONS))
+
+
+class ServiceTarget:
+    """Drives PlaylistService directly."""
+
+    mode = "service"
+
+    def __init__(self, env: BenchEnvironment):
+        self.env = env
+
+    async def generate(self, activity: str, vibe: str, duration: int) -> str | None:
+        data = await self.env.service().create_activity_playlist(
+            activity, vibe, duration
+        )
+        return None if "error" in data else data["id"]
+
+    async def read(self, playlist_id: str) -> bool:
+        body, _ = await self.env.service().get_playlist_representation(playlist_id)
+        return body is not None
+
+    async def close(self) -> None:
+        pass
+
+
+class ApiTarget:
+    """Drives the FastAPI app in-process, with dependencies pointed at the environment."""
+
+    mode = "api"
+
+    def __init__(self, env: BenchEnvironment):
+        from app import dependencies
+        from app.main import app
+
+        self.env = env
+        self.app = app
+        app.dependency_overrides.update(
+            {
+                dependencies.get_redis_client: lambda: env.redis_client,
+                dependencies.get_spotify_client: lambda: env.spotify_client,
+                dependencies.get_reccobeats_client: lambda: env.reccobeats_client,
+                dependencies.get_negative_cache: lambda: env.negative_cache,
+                dependencies.get_entity_cache: lambda: env.entity_cache,
+                dependencies.get_rate_limiter: lambda: env.rate_limiter,
+            }
+        )
+        self.client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bench"
+        )
+
+    async def generate(self, activity: str, vibe: str, duration: int) -> str | None:
+        response = await self.client.post(
+            "/api/v1/generate-playlist",
+            json={"activity": activity, "vibe": vibe, "duration": duration},
+        )
+        return response.json()["id"] if response.status_code == 200 else None
+
+    async def read(self, playlist_id: str) -> bool:
+        response = await self.client.get(f"/api/v1/playlist/{playlist_id}")
+        return response.status_code == 200
+
+    async def close(self) -> None:
+        await self.client.aclose()
+        self.app.dependency_overrides.clear()
+
+
+async def run_scenario(
+    env: BenchEnvironment,
+    target: ServiceTarget | ApiTarget,
+    scenario: str,
+    iterations: int,
+) -> dict[str, Any]:
+    """
+    Run one scenario and collect latency, upstream calls and Redis round trips.
+
+    - cold: every iteration starts from an empty cache
+    - warm: the same request repeated, served from the generated-playlist cache
+    - partial-warm: search, metadata and feature caches are warm but the
+      generated playlist is not, so selection and publishing run again
+    - read: GET of a stored playlist by ID
+    """
+    requests = request_matrix()
+    await env.flush()
+
+    playlist_id = None
+    if scenario == "warm" or scenario == "read":
+        playlist_id = await target.generate(*requests[0])
+    elif scenario == "partial-warm":
+        for request in requests[: min(iterations, len(requests))]:
+            await target.generate(*request)
+
+    latencies: list[float] = []
+    errors = 0
+    before = env.counters()
+
+    for i in range(iterations):
+        request = requests[0] if scenario == "warm" else requests[i % len(requests)]
+        if scenario == "cold":
+            await env.flush()
+        elif scenario == "partial-warm":
+            await env.delete("generated_playlist:*")
+
+        start = time.perf_counter()
+        if scenario == "read":
+            ok = playlist_id is not None and await target.read(playlist_id)
+        else:
+            ok = await target.generate(*request) is not None
+        latencies.append(time.perf_counter() - start)
+        errors += not ok
+
+    counts = env.counters().since(before)
+    return {
+        "scenario": scenario,
+        "mode": target.mode,
+        "iterations": iterations,
+        "errors": errors,
+        "latencies": latencies,
+        **{
+            f"{key}_per_op": round(value / iterations, 1)
+            for key, value in counts.items()
+        },
+    }
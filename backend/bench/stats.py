@@ -0,0 +1,67 @@
+import json
+import math
+from typing import Any
+
+
+def percentile(samples: list[float], pct: float) -> float | None:
+    """Nearest-rank percentile (0-100) of a list of samples."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(len(ordered) * pct / 100))
+    return ordered[rank - 1]
+
+
+def latency_summary(samples: list[float]) -> dict[str, float | None]:
+    """p50/p95/p99/mean/max in milliseconds for samples in seconds."""
+
+    def ms(value: float | None) -> float | None:
+        return None if value is None else round(value * 1000, 2)
+
+    return {
+        "p50_ms": ms(percentile(samples, 50)),
+        "p95_ms": ms(percentile(samples, 95)),
+        "p99_ms": ms(percentile(samples, 99)),
+        "mean_ms": ms(sum(samples) / len(samples)) if samples else None,
+        "max_ms": ms(max(samples)) if samples else None,
+    }
+
+
+def format_table(rows: list[dict[str, Any]], columns: list[str]) -> str:
+    """Render rows as a fixed-width text table."""
+    cells = [
+        [str(row.get(col, "")) if row.get(col) is not None else "-" for col in columns]
+        for row in rows
+    ]
+    widths = [
+        max(len(col), *(len(r[i]) for r in cells)) for i, col in enumerate(columns)
+    ]
+    lines = ["  ".join(col.ljust(w) for col, w in zip(columns, widths, strict=True))]
+    lines.append("  ".join("-" * w for w in widths))
+    lines.extend(
+        "  ".join(c.ljust(w) for c, w in zip(r, widths, strict=True)) for r in cells
+    )
+    return "\n".join(lines)
+
+
+def compare(
+    current: dict[str, Any], baseline: dict[str, Any], keys: list[str]
+) -> dict[str, str]:
+    """Relative change of numeric keys against a baseline result."""
+    deltas = {}
+    for key in keys:
+        new, old = current.get(key), baseline.get(key)
+        if isinstance(new, (int, float)) and isinstance(old, (int, float)) and old:
+            deltas[key] = f"{(new - old) / old * 100:+.1f}%"
+    return deltas
+
+
+def load_json(path: str) -> Any:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_json(path: str, data: Any) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
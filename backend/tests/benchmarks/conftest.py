@@ -0,0 +1,56 @@
+import json
+import os
+import timeit
+
+import pytest
+
+from bench.micro import (
+    REFERENCE_KEY,
+    ROUNDS,
+    iterations_per_round,
+    reference_workload,
+    summarize,
+)
+
+MICRO_BASELINE = os.path.join(
+    os.path.dirname(__file__), "..", "..", "bench", "baselines", "micro.json"
+)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--micro-save",
+        action="store_true",
+        help="Write this run's medians to bench/baselines/micro.json",
+    )
+
+
+@pytest.fixture(scope="session")
+def micro_baseline() -> dict[str, dict[str, float]]:
+    if not os.path.exists(MICRO_BASELINE):
+        return {}
+    with open(MICRO_BASELINE) as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="session")
+def micro_results(request, micro_baseline):
+    """Summaries of this run, saved as the new baseline with --micro-save."""
+    results: dict[str, dict[str, float]] = {}
+    yield results
+    if request.config.getoption("--micro-save") and results:
+        baseline = {**micro_baseline, **results}
+        with open(MICRO_BASELINE, "w") as f:
+            json.dump(dict(sorted(baseline.items())), f, indent=2)
+            f.write("\n")
+
+
+@pytest.fixture(scope="session")
+def reference(micro_results) -> dict[str, float]:
+    """This machine's timing of the reference workload."""
+    number = iterations_per_round(reference_workload)
+    samples = [
+        timeit.timeit(reference_workload, number=number) / number for _ in range(ROUNDS)
+    ]
+    micro_results[REFERENCE_KEY] = summarize(samples)
+    return micro_results[REFERENCE_KEY]
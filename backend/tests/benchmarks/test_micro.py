@@ -0,0 +1,48 @@
+import pytest
+
+from bench.micro import (
+    BENCHMARKS,
+    REFERENCE_KEY,
+    ROUNDS,
+    SIZES,
+    compare,
+    iterations_per_round,
+    result_key,
+    speed_factor,
+    summarize,
+)
+
+CASES = [
+    pytest.param(benchmark, size, id=result_key(benchmark.name, size))
+    for benchmark in BENCHMARKS
+    for size in (SIZES if benchmark.sized else [None])
+]
+
+
+@pytest.mark.parametrize(("case", "size"), CASES)
+def test_micro(
+    request, benchmark, case, size, reference, micro_baseline, micro_results
+):
+    func = case.setup(size)
+    # Without --benchmark-enable this runs once, just to check it still works
+    iterations = 1 if benchmark.disabled else iterations_per_round(func)
+    benchmark.pedantic(func, iterations=iterations, rounds=ROUNDS, warmup_rounds=1)
+    if benchmark.disabled:
+        return
+
+    key = result_key(case.name, size)
+    current = micro_results[key] = summarize(benchmark.stats.stats.data)
+    if request.config.getoption("--micro-save"):
+        return
+
+    baseline = micro_baseline.get(key)
+    if baseline is None or REFERENCE_KEY not in micro_baseline:
+        pytest.skip(f"No baseline for {key}")
+    change, allowed = compare(
+        current, baseline, speed_factor(reference, micro_baseline[REFERENCE_KEY])
+    )
+    benchmark.extra_info.update(change=round(change, 3), allowed=round(allowed, 3))
+    assert change <= allowed, (
+        f"{key} median is {change:+.1%} against the baseline, "
+        f"more than the {allowed:.1%} its spread allows"
+    )
@@ -0,0 +1,99 @@
+from typing import Any
+
+import fakeredis
+import httpx
+import pytest
+
+from app import dependencies
+from app.db.redis import RedisClient
+from app.main import app
+from app.playlists import CacheConfig, EntityCache, NegativeCache, PlaylistRepo
+from app.ratelimit import RateLimitConfig, RateLimiter
+from bench.environment import BenchEnvironment
+from bench.fakes import FaultProfile
+
+
+@pytest.fixture
+async def redis_client():
+    """A RedisClient backed by an in-process fakeredis server."""
+    client = RedisClient("redis://fake")
+    client._redis = fakeredis.FakeAsyncRedis()
+    yield client
+    await client.disconnect()
+
+
+def make_playlist(playlist_id: str = "pl1", n_tracks: int = 3) -> dict[str, Any]:
+    """A stored-playlist dict shaped like PlaylistResponse."""
+    tracks = [
+        {
+            "id": f"tr{i}",
+            "name": f"Track {i}",
+            "artist": f"Artist {i}",
+            "album": {
+                "id": f"al{i % 2}",
+                "name": f"Album {i % 2}",
+                "images": [
+                    {"url": f"https://img/{i % 2}/640", "width": 640},
+                    {"url": f"https://img/{i % 2}/64", "width": 64},
+                ],
+            },
+            "duration": 180_000 + i,
+            "spotifyUrl": f"https://open.spotify.com/track/tr{i}",
+            "previewUrl": None,
+        }
+        for i in range(n_tracks)
+    ]
+    return {
+        "id": playlist_id,
+        "name": "Upbeat Working Out",
+        "description": "A test playlist",
+        "spotifyUrl": f"https://open.spotify.com/playlist/{playlist_id}",
+        "imageUrl": f"https://i.scdn.co/image/{playlist_id}",
+        "tracks": tracks,
+        "duration": 9,
+        "createdAt": "2025-07-01T00:00:00",
+        "activity": "working out",
+        "vibe": "upbeat",
+    }
+
+
+@pytest.fixture
+def playlist_repo(redis_client) -> PlaylistRepo:
+    return PlaylistRepo(
+        redis_client, NegativeCache(CacheConfig()), CacheConfig(), EntityCache(1000)
+    )
+
+
+@pytest.fixture
+async def api(redis_client, playlist_repo):
+    """An HTTP client for the app, reading from fakeredis, without upstreams."""
+    overrides = {
+        dependencies.get_redis_client: lambda: redis_client,
+        dependencies.get_spotify_client: lambda: None,
+        dependencies.get_reccobeats_client: lambda: None,
+        dependencies.get_playlist_repo: lambda: playlist_repo,
+        dependencies.get_rate_limiter: lambda: RateLimiter(
+            RateLimitConfig(enabled=False), redis_client
+        ),
+    }
+    app.dependency_overrides.update(overrides)
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            yield client
+    finally:
+        for dependency in overrides:
+            app.dependency_overrides.pop(dependency, None)
+
+
+@pytest.fixture
+async def bench_env():
+    """Spotify and ReccoBeats stand-ins without latency, over fakeredis."""
+    faults = FaultProfile(latency_ms=0, jitter_ms=0, tail_probability=0)
+    env = await BenchEnvironment(
+        spotify_faults=faults, reccobeats_faults=faults
+    ).start()
+    yield env
+    await env.close()
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from app.playlists import AdmissionConfig, AdmissionController, AdmissionRejected
+
+
+def _controller(**overrides) -> AdmissionController:
+    return AdmissionController(AdmissionConfig(max_concurrent=1, **overrides))
+
+
+async def _hold(admission: AdmissionController, release: asyncio.Event) -> None:
+    async with admission.admit():
+        await release.wait()
+
+
+async def test_generation_beyond_the_queue_is_rejected_with_429():
+    admission = _controller(max_queue=1)
+    release = asyncio.Event()
+    running = asyncio.create_task(_hold(admission, release))
+    queued = asyncio.create_task(_hold(admission, release))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        async with admission.admit():
+            pass
+
+    assert rejected.value.status_code == 429
+    assert rejected.value.retry_after >= 1
+    release.set()
+    await asyncio.gather(running, queued)
+    assert admission.waiting == 0
+
+
+async def test_generation_waiting_past_the_timeout_is_rejected_with_503():
+    admission = _controller(max_queue=1, queue_timeout_seconds=0.01)
+    release = asyncio.Event()
+    running = asyncio.create_task(_hold(admission, release))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        async with admission.admit():
+            pass
+
+    assert rejected.value.status_code == 503
+    # Gave up waiting, so it no longer counts against the queue
+    assert admission.waiting == 0
+    release.set()
+    await running
+
+
+async def test_slot_is_released_when_the_generation_fails():
+    admission = _controller(max_queue=0, queue_timeout_seconds=0.01)
+
+    with pytest.raises(RuntimeError):
+        async with admission.admit():
+            raise RuntimeError("upstream down")
+
+    async with admission.admit():
+        pass
@@ -0,0 +1,144 @@
+import time
+
+import pytest
+
+from app.playlists import (
+    ArchiveConfig,
+    CacheConfig,
+    EntityCache,
+    NegativeCache,
+    PlaylistArchive,
+    PlaylistRepo,
+)
+from app.playlists.sweeper import ArchiveSweeper
+
+from .conftest import make_playlist
+
+
+@pytest.fixture
+def archive_config(tmp_path) -> ArchiveConfig:
+    return ArchiveConfig(
+        enabled=True, path=str(tmp_path / "archive.sqlite3"), idle_days=0
+    )
+
+
+@pytest.fixture
+def archiving_repo(redis_client, archive_config) -> PlaylistRepo:
+    return PlaylistRepo(
+        redis_client,
+        NegativeCache(CacheConfig()),
+        CacheConfig(),
+        EntityCache(1000),
+        PlaylistArchive(archive_config),
+    )
+
+
+async def test_archive_round_trip(archive_config):
+    archive = PlaylistArchive(archive_config)
+    playlist = make_playlist("pl1")
+
+    await archive.put_many({"pl1": playlist})
+
+    assert await archive.get_many(["pl1", "pl2"]) == {"pl1": (playlist, False)}
+    # The second read within the window makes it hot enough to move back
+    assert await archive.get_many(["pl1"]) == {"pl1": (playlist, True)}
+
+
+async def test_idle_playlist_is_archived_and_restored(archiving_repo, archive_config):
+    await archiving_repo.store_playlist_by_id("pl1", make_playlist("pl1"))
+    body, etag = await archiving_repo.get_playlist_representation("pl1")
+
+    assert await ArchiveSweeper(archive_config, archiving_repo).sweep() == 1
+    assert not await archiving_repo.redis_client.exists(
+        archiving_repo._record_key("pl1")
+    )
+
+    # Served from the archive, then moved back on the second read
+    assert await archiving_repo.get_playlist_representation("pl1") == (body, etag)
+    assert await archiving_repo.get_playlist_representation("pl1") == (body, etag)
+    assert await archiving_repo.redis_client.exists(archiving_repo._record_key("pl1"))
+    assert await archiving_repo.archive.get_many(["pl1"]) == {}
+
+
+async def test_seed_tracks_playlists_stored_before_reads_were(archiving_repo):
+    await archiving_repo.store_playlist_by_id("pl1", make_playlist("pl1"))
+    await archiving_repo.store_playlist_by_id("pl2", make_playlist("pl2"))
+    await archiving_repo.redis_client.delete("playlist_last_read")
+
+    await archiving_repo.seed_last_read()
+
+    members = await archiving_repo.redis_client.zrangebyscore(
+        "playlist_last_read", "-inf", "+inf"
+    )
+    assert sorted(members) == ["pl1", "pl2"]
+
+
+async def test_archiving_deletes_entities_only_it_referred_to(
+    archiving_repo, archive_config
+):
+    await archiving_repo.store_playlist_by_id("pl1", make_playlist("pl1"))
+    shared = make_playlist("pl2")
+    shared["tracks"][0]["name"] = "Track 0 (Remastered)"
+    await archiving_repo.store_playlist_by_id("pl2", shared)
+    redis_client = archiving_repo.redis_client
+    await redis_client.zadd("playlist_last_read", {"pl2": 1e12})
+    albums = await redis_client.keys("album:*")
+
+    assert await ArchiveSweeper(archive_config, archiving_repo).sweep() == 1
+
+    # pl1's own version of tr0 is gone; tr1, tr2 and the albums are pl2's too
+    assert len(await redis_client.keys("track:tr0:*")) == 1
+    assert len(await redis_client.keys("track:*")) == 3
+    assert sorted(await redis_client.keys("album:*")) == sorted(albums)
+    pl2 = await archiving_repo.get_playlist_by_id("pl2")
+    assert [t["id"] for t in pl2["tracks"]] == ["tr0", "tr1", "tr2"]
+
+
+async def test_restored_playlist_stores_its_entities_again(
+    archiving_repo, archive_config
+):
+    await archiving_repo.store_playlist_by_id("pl1", make_playlist("pl1"))
+    body, etag = await archiving_repo.get_playlist_representation("pl1")
+    await ArchiveSweeper(archive_config, archiving_repo).sweep()
+    assert await archiving_repo.redis_client.keys("track:*") == []
+
+    await archiving_repo.get_playlist_representation("pl1")
+    await archiving_repo.get_playlist_representation("pl1")
+    await archiving_repo.redis_client.delete(
+        *archiving_repo._representation_keys("pl1")
+    )
+    archiving_repo.entities.cache = EntityCache(1000)
+
+    assert await archiving_repo.get_playlist_representation("pl1") == (body, etag)
+
+
+async def test_playlist_missing_entities_stays_tracked(archiving_repo):
+    await archiving_repo.store_playlist_by_id("pl1", make_playlist("pl1"))
+    await archiving_repo.store_playlist_by_id("pl2", make_playlist("pl2", n_tracks=1))
+    await archiving_repo.redis_client.delete(
+        *await archiving_repo.redis_client.keys("track:tr1:*")
+    )
+    archiving_repo.entities.cache = EntityCache(1000)
+
+    assert await archiving_repo.archive_idle_playlists(time.time(), 10) == 2
+
+    assert await archiving_repo.redis_client.zrangebyscore(
+        "playlist_last_read", "-inf", "+inf"
+    ) == ["pl1"]
+    assert await archiving_repo.archive.get_many(["pl1"]) == {}
+    assert await archiving_repo.redis_client.exists(archiving_repo._record_key("pl1"))
+
+
+async def test_playlists_stored_before_referrers_keep_their_entities(
+    archiving_repo, archive_config
+):
+    await archiving_repo.store_playlist_by_id("pl1", make_playlist("pl1"))
+    await archiving_repo.redis_client.delete(
+        *await archiving_repo.redis_client.keys("referrers:*")
+    )
+    await archiving_repo.store_playlist_by_id("pl2", make_playlist("pl2"))
+    await archiving_repo.redis_client.zadd("playlist_last_read", {"pl1": 1e12})
+
+    assert await ArchiveSweeper(archive_config, archiving_repo).sweep() == 1
+
+    assert len(await archiving_repo.redis_client.keys("track:*")) == 3
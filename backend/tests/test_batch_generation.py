@@ -0,0 +1,45 @@
+import asyncio
+
+from app.playlists import AdmissionConfig, AdmissionController, PlaylistService
+from bench.environment import BenchEnvironment
+
+REQUESTS = [("working out", "upbeat", 10), ("studying", "chill", 10)]
+
+
+def _service(env: BenchEnvironment, admission=None) -> PlaylistService:
+    return PlaylistService(
+        env.spotify_client, env.reccobeats_client, env.repo(), admission
+    )
+
+
+async def test_batch_generates_each_request(bench_env):
+    service = _service(bench_env)
+
+    results = dict(
+        [item async for item in service.create_activity_playlists(REQUESTS * 2)]
+    )
+
+    assert sorted(results) == [0, 1, 2, 3]
+    for index, (activity, vibe, _) in enumerate(REQUESTS * 2):
+        assert results[index]["activity"] == activity
+        assert results[index]["vibe"] == vibe
+        assert results[index]["tracks"]
+    # Identical requests share one generation
+    assert results[0]["id"] == results[2]["id"]
+
+
+async def test_slow_reader_does_not_hold_a_generation_slot(bench_env):
+    admission = AdmissionController(AdmissionConfig(max_concurrent=1))
+    service = _service(bench_env, admission)
+
+    stream = service.create_activity_playlists(REQUESTS)
+    first = await anext(stream)
+    # The reader stalls; generation finishes and frees the slot regardless
+    for _ in range(200):
+        if not admission._slots.locked():
+            break
+        await asyncio.sleep(0.01)
+
+    assert not admission._slots.locked()
+    rest = [item async for item in stream]
+    assert sorted(index for index, _ in [first, *rest]) == [0, 1]
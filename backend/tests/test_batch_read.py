@@ -0,0 +1,59 @@
+from app import dependencies
+from app.main import app
+from app.playlists import CacheConfig
+
+from .conftest import make_playlist
+
+
+async def _store(playlist_repo, *playlist_ids: str) -> None:
+    for playlist_id in playlist_ids:
+        await playlist_repo.store_playlist_by_id(
+            playlist_id, make_playlist(playlist_id)
+        )
+
+
+async def test_found_playlists_in_request_order_and_missing_listed(api, playlist_repo):
+    await _store(playlist_repo, "pl1", "pl2", "pl3")
+
+    response = await api.get(
+        "/api/v1/playlists",
+        params=[("ids", "pl3,nope"), ("ids", "pl1"), ("ids", "pl3")],
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [p["id"] for p in body["playlists"]] == ["pl3", "pl1"]
+    assert body["missing"] == ["nope"]
+    assert body["playlists"][0] == make_playlist("pl3")
+
+
+async def test_summary_view(api, playlist_repo):
+    await _store(playlist_repo, "pl1")
+
+    response = await api.get(
+        "/api/v1/playlists", params={"ids": "pl1", "view": "summary"}
+    )
+
+    [playlist] = response.json()["playlists"]
+    assert "album" not in playlist["tracks"][0]
+    assert playlist["tracks"][0]["coverUrl"] == "https://img/0/64"
+
+
+async def test_all_missing(api):
+    response = await api.get("/api/v1/playlists", params={"ids": "a,b"})
+
+    assert response.status_code == 200
+    assert response.json() == {"playlists": [], "missing": ["a", "b"]}
+
+
+async def test_empty_and_oversized_batches_are_rejected(api):
+    config = CacheConfig(batch_max_ids=2)
+    app.dependency_overrides[dependencies.get_cache_config] = lambda: config
+    try:
+        empty = await api.get("/api/v1/playlists", params={"ids": " , "})
+        too_many = await api.get("/api/v1/playlists", params={"ids": "a,b,c"})
+    finally:
+        app.dependency_overrides.pop(dependencies.get_cache_config)
+
+    assert empty.status_code == 400
+    assert too_many.status_code == 400
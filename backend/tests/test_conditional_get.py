@@ -0,0 +1,86 @@
+import pytest
+
+from .conftest import make_playlist
+
+URL = "/api/v1/playlist/pl1"
+
+
+@pytest.fixture
+async def stored(playlist_repo):
+    await playlist_repo.store_playlist_by_id("pl1", make_playlist("pl1"))
+
+
+async def test_playlist_is_served_with_validators(api, stored):
+    response = await api.get(URL, headers={"Accept-Encoding": "identity"})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"].startswith('"')
+    assert "max-age=" in response.headers["Cache-Control"]
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert "Content-Encoding" not in response.headers
+
+
+@pytest.mark.parametrize(
+    "if_none_match",
+    ["{etag}", "W/{etag}", '"other", {etag}', "*"],
+)
+async def test_matching_if_none_match_answers_304(api, stored, if_none_match):
+    headers = {"Accept-Encoding": "identity"}
+    etag = (await api.get(URL, headers=headers)).headers["ETag"]
+
+    response = await api.get(
+        URL, headers={**headers, "If-None-Match": if_none_match.format(etag=etag)}
+    )
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    assert "Accept-Encoding" in response.headers["Vary"]
+
+
+async def test_stale_if_none_match_gets_the_body(api, stored):
+    response = await api.get(
+        URL, headers={"Accept-Encoding": "identity", "If-None-Match": '"stale"'}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["id"] == "pl1"
+
+
+async def test_each_encoding_has_its_own_etag(api, stored):
+    identity = await api.get(URL, headers={"Accept-Encoding": "identity"})
+    gzipped = await api.get(URL, headers={"Accept-Encoding": "gzip"})
+
+    assert gzipped.headers["Content-Encoding"] == "gzip"
+    assert gzipped.headers["ETag"] != identity.headers["ETag"]
+    assert gzipped.content == identity.content
+    # The identity ETag doesn't validate the gzip representation
+    response = await api.get(
+        URL,
+        headers={
+            "Accept-Encoding": "gzip",
+            "If-None-Match": identity.headers["ETag"],
+        },
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("gzip, br", "br"),
+        ("br;q=0.5, gzip;q=1.0", "gzip"),
+        ("br;q=0, gzip", "gzip"),
+        ("*;q=0.1", "br"),
+        ("br;q=0, *;q=0.2", "gzip"),
+        ("br;q=0, gzip;q=0", None),
+        ("deflate", None),
+        ("identity", None),
+    ],
+)
+async def test_accept_encoding_is_negotiated(api, stored, accept_encoding, expected):
+    response = await api.get(URL, headers={"Accept-Encoding": accept_encoding})
+
+    assert response.status_code == 200
+    assert response.headers.get("Content-Encoding") == expected
+    assert response.json()["id"] == "pl1"
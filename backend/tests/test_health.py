@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from app.lifecycle import HealthConfig, HealthMonitor
+from app.main import app
+
+
+def _monitor(**config) -> HealthMonitor:
+    return HealthMonitor(HealthConfig(**config))
+
+
+async def test_probes_run_in_the_background_on_their_interval():
+    monitor = _monitor()
+    calls = []
+
+    async def probe() -> bool:
+        calls.append(1)
+        return True
+
+    monitor.register("upstream", probe, interval_seconds=0.01)
+    assert monitor.snapshot()["upstream"]["status"] == "unknown"
+
+    monitor.start()
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+
+    assert len(calls) > 1
+    assert monitor.is_healthy("upstream")
+    assert monitor.snapshot()["upstream"]["latency_ms"] is not None
+
+
+@pytest.mark.parametrize(
+    ("probe_result", "error"),
+    [(False, None), (RuntimeError("disconnected"), "disconnected")],
+)
+async def test_failing_probe_is_unhealthy(probe_result, error):
+    monitor = _monitor()
+
+    async def probe() -> bool:
+        if isinstance(probe_result, Exception):
+            raise probe_result
+        return probe_result
+
+    monitor.register("upstream", probe, interval_seconds=60)
+    await monitor.probe("upstream")
+
+    assert not monitor.is_healthy("upstream")
+    assert monitor.snapshot()["upstream"]["error"] == error
+
+
+async def test_hanging_probe_times_out():
+    monitor = _monitor(probe_timeout_seconds=0.01)
+
+    async def probe() -> bool:
+        await asyncio.sleep(60)
+        return True
+
+    monitor.register("upstream", probe, interval_seconds=60)
+    state = await monitor.probe("upstream")
+
+    assert (state.status, state.error) == ("unhealthy", "timeout")
+
+
+async def test_health_endpoint_answers_from_the_last_probes(api, redis_client):
+    monitor = _monitor()
+    monitor.watch_dependencies(redis_client, None, None)
+    await monitor.probe("redis")
+    app.state.health_monitor = monitor
+    try:
+        body = (await api.get("/health")).json()
+    finally:
+        del app.state.health_monitor
+
+    assert body["status"] == "healthy"
+    assert body["redis_connected"] is True
+    assert body["checks"]["redis"]["status"] == "healthy"
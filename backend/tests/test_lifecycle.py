@@ -0,0 +1,103 @@
+import asyncio
+import time
+
+import fakeredis
+import pytest
+
+from app.db.redis import RedisClient
+from app.lifecycle import Startup, StartupConfig
+from app.main import app
+
+
+class SlowRedis(RedisClient):
+    """A fakeredis-backed client whose connect() waits until allowed to."""
+
+    def __init__(self):
+        super().__init__("redis://fake")
+        self.reachable = asyncio.Event()
+
+    async def connect(self) -> None:
+        await self.reachable.wait()
+        self._redis = fakeredis.FakeAsyncRedis()
+
+
+class SlowSpotify:
+    """Stands in for SpotifyClient, taking a while to authenticate."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.reconnecting = False
+
+    async def connect(self) -> bool:
+        await asyncio.sleep(self.seconds)
+        return True
+
+    def ensure_reconnecting(self) -> None:
+        self.reconnecting = True
+
+
+@pytest.fixture
+async def slow_redis():
+    client = SlowRedis()
+    yield client
+    await client.disconnect()
+
+
+def _startup(redis_client, spotify_client=None, **config) -> Startup:
+    return Startup(StartupConfig(**config), redis_client, spotify_client, None)
+
+
+async def test_startup_waits_only_briefly_for_redis(slow_redis):
+    spotify = SlowSpotify(seconds=0.5)
+    slow_redis.reachable.set()
+    startup = _startup(slow_redis, spotify)
+
+    began = time.monotonic()
+    await startup.start()
+
+    # Serving starts once Redis is up, without waiting for Spotify
+    assert time.monotonic() - began < 0.3
+    assert startup.snapshot()["redis"]["status"] == "ok"
+    assert startup.snapshot()["spotify"] == {"status": "pending"}
+    await startup._tasks["spotify"]
+    assert startup.snapshot()["spotify"]["status"] == "ok"
+    await startup.stop()
+
+
+async def test_slow_spotify_is_left_reconnecting(slow_redis):
+    spotify = SlowSpotify(seconds=1)
+    slow_redis.reachable.set()
+    startup = _startup(slow_redis, spotify, spotify_timeout_seconds=0.05)
+
+    await startup.start()
+    await startup._tasks["spotify"]
+
+    assert startup.snapshot()["spotify"]["status"] == "timeout"
+    assert spotify.reconnecting
+
+
+@pytest.fixture
+def probes(api):
+    yield api
+    del app.state.startup
+
+
+async def test_readiness_follows_redis_while_liveness_stays_up(probes, slow_redis):
+    startup = _startup(slow_redis, redis_timeout_seconds=0.05)
+    app.state.startup = startup
+    await startup.start()
+
+    assert (await probes.get("/livez")).status_code == 200
+    not_ready = await probes.get("/readyz")
+    assert not_ready.status_code == 503
+    assert not_ready.json()["status"] == "not ready"
+
+    # Connects on the next retry
+    slow_redis.reachable.set()
+    await startup._tasks["redis"]
+
+    ready = await probes.get("/readyz")
+    assert ready.status_code == 200
+    assert ready.json()["startup"]["redis"]["status"] == "ok"
+    assert (await probes.get("/livez")).status_code == 200
+    await startup.stop()
@@ -0,0 +1,93 @@
+import pytest
+from prometheus_client import REGISTRY
+
+from app.observability.metrics import HedgeStatsCollector, observe_upstream
+
+from .conftest import make_playlist
+
+
+def sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def lookups(result: str) -> float:
+    return sample(
+        "playlist_cache_lookups_total", namespace="playlist_by_id", result=result
+    )
+
+
+async def test_cache_lookups_are_counted(playlist_repo):
+    hits, misses = lookups("hit"), lookups("miss")
+    await playlist_repo.store_playlist_by_id("pl1", make_playlist("pl1"))
+
+    await playlist_repo.get_playlist_representation("pl1")
+    await playlist_repo.get_playlist_representation("nope")
+
+    assert (lookups("hit"), lookups("miss")) == (hits + 1, misses + 1)
+
+
+def test_upstream_calls_are_counted_by_outcome():
+    labels = {"client": "test", "method": "lookup"}
+    ok = sample("upstream_calls_total", outcome="ok", **labels)
+    errors = sample("upstream_calls_total", outcome="error", **labels)
+    timed = sample("upstream_call_seconds_count", **labels)
+
+    with observe_upstream("test", "lookup"):
+        pass
+    with pytest.raises(RuntimeError), observe_upstream("test", "lookup"):
+        raise RuntimeError("down")
+
+    assert sample("upstream_calls_total", outcome="ok", **labels) == ok + 1
+    assert sample("upstream_calls_total", outcome="error", **labels) == errors + 1
+    assert sample("upstream_call_seconds_count", **labels) == timed + 2
+
+
+async def test_cold_generation_times_each_stage(bench_env):
+    stages = ("cache_lookup", "search", "selection", "publish", "store")
+    before = {
+        stage: sample("playlist_generation_stage_seconds_count", stage=stage)
+        for stage in stages
+    }
+
+    playlist = await bench_env.service().create_activity_playlist(
+        "working out", "upbeat", 10
+    )
+
+    assert "error" not in playlist
+    for stage in stages:
+        assert (
+            sample("playlist_generation_stage_seconds_count", stage=stage)
+            > before[stage]
+        )
+    assert sample("playlist_generations_in_flight") == 0
+
+
+def test_hedge_stats_are_exported():
+    stats = {
+        "endpoints": {
+            "metadata": {
+                "requests": 10,
+                "hedges_sent": 2,
+                "hedges_won": 1,
+                "budget_exhausted": 0,
+                "attempt_latency": {"p50": 0.1, "p95": None, "p99": None},
+                "effective_latency": {"p50": 0.05, "p95": None, "p99": None},
+            }
+        }
+    }
+
+    families = {f.name: f for f in HedgeStatsCollector(lambda: stats).collect()}
+
+    [won] = families["reccobeats_hedge_hedges_won"].samples
+    assert (won.labels, won.value) == ({"endpoint": "metadata"}, 1)
+    latency = families["reccobeats_hedge_latency_seconds"].samples
+    # Percentiles without samples yet are left out
+    assert len(latency) == 2
+
+
+async def test_metrics_endpoint_renders_prometheus_text(api):
+    response = await api.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "playlist_cache_lookups_total" in response.text
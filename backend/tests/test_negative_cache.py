@@ -0,0 +1,75 @@
+from app.playlists.config import CacheConfig
+from app.playlists.negative_cache import BloomFilter, NegativeCache
+
+
+def _cache(**overrides) -> NegativeCache:
+    return NegativeCache(CacheConfig(**overrides))
+
+
+async def test_recorded_negatives_are_partitioned_out(redis_client):
+    cache = _cache()
+    await cache.add(redis_client, "metadata", {"gone-1", "gone-2"})
+
+    negative, remaining = await cache.partition(
+        redis_client, "metadata", ["gone-1", "ok-1", "gone-2"]
+    )
+
+    assert sorted(negative) == ["gone-1", "gone-2"]
+    assert remaining == ["ok-1"]
+
+
+async def test_filter_false_positives_are_not_dropped(redis_client):
+    cache = _cache()
+    await cache.add(redis_client, "metadata", {"gone"})
+    # Simulate a Bloom false positive: in the filter but not in Redis
+    cache._filters["metadata"].add("valid")
+
+    negative, remaining = await cache.partition(
+        redis_client, "metadata", ["valid", "gone"]
+    )
+
+    assert negative == ["gone"]
+    assert remaining == ["valid"]
+
+
+async def test_expired_negatives_are_not_dropped(redis_client):
+    cache = _cache(negative_ttl_seconds=-1)
+    await cache.add(redis_client, "metadata", {"expired"})
+
+    negative, remaining = await cache.partition(redis_client, "metadata", ["expired"])
+
+    assert negative == []
+    assert remaining == ["expired"]
+
+
+async def test_lookup_finds_negatives_recorded_by_another_worker(redis_client):
+    await _cache().add(redis_client, "audio_features", {"gone"})
+
+    other_worker = _cache()
+    found = await other_worker.lookup(
+        redis_client, "audio_features", ["gone", "unknown"]
+    )
+
+    assert found == {"gone"}
+
+
+async def test_filter_is_rebuilt_once_full(redis_client):
+    cache = _cache(bloom_capacity=10)
+    await cache.add(redis_client, "metadata", {f"gone-{i}" for i in range(10)})
+
+    bloom = cache._filters["metadata"]
+    assert not bloom.full
+    assert bloom.capacity >= 20
+    negative, _ = await cache.partition(
+        redis_client, "metadata", [f"gone-{i}" for i in range(10)]
+    )
+    assert len(negative) == 10
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"id-{i}")
+
+    assert all(f"id-{i}" in bloom for i in range(1000))
+    assert bloom.full
@@ -0,0 +1,106 @@
+import json
+
+from app.playlists import EntityCache, encoding
+from app.playlists.entities import album_key, track_key
+from app.playlists.projections import VIEWS
+
+from .conftest import make_playlist
+
+
+async def expire_bodies(playlist_repo, playlist_id: str) -> None:
+    """Drop a playlist's cached bodies, so reads render it from its record."""
+    await playlist_repo.redis_client.delete(
+        *playlist_repo._representation_keys(playlist_id)
+    )
+
+
+async def test_changed_shared_track_leaves_stored_playlist_alone(playlist_repo):
+    await playlist_repo.store_playlist_by_id("pl1", make_playlist("pl1"))
+    body, etag = await playlist_repo.get_playlist_representation("pl1")
+
+    # Another playlist stores newer metadata for the same track and album
+    changed = make_playlist("pl2")
+    changed["tracks"][0]["name"] = "Track 0 (Remastered)"
+    changed["tracks"][0]["album"]["name"] = "Album 0 (Deluxe)"
+    await playlist_repo.store_playlist_by_id("pl2", changed)
+    await expire_bodies(playlist_repo, "pl1")
+    playlist_repo.entities.cache = EntityCache(1000)
+
+    assert await playlist_repo.get_playlist_representation("pl1") == (body, etag)
+    pl2 = await playlist_repo.get_playlist_by_id("pl2")
+    assert pl2["tracks"][0]["name"] == "Track 0 (Remastered)"
+
+
+async def test_unchanged_entities_are_shared(playlist_repo):
+    await playlist_repo.store_playlist_by_id("pl1", make_playlist("pl1"))
+    await playlist_repo.store_playlist_by_id("pl2", make_playlist("pl2"))
+
+    keys = await playlist_repo.redis_client.keys("track:*")
+
+    assert len(keys) == 3
+
+
+async def test_missing_entities_render_the_tracks_left(playlist_repo):
+    await playlist_repo.store_playlist_by_id("pl1", make_playlist("pl1"))
+    _, etag = await playlist_repo.get_playlist_representation("pl1")
+    await expire_bodies(playlist_repo, "pl1")
+    playlist_repo.entities.cache = EntityCache(1000)
+    await playlist_repo.redis_client.delete(
+        *await playlist_repo.redis_client.keys("track:tr1:*")
+    )
+
+    body, partial_etag = await playlist_repo.get_playlist_representation("pl1")
+
+    assert [t["id"] for t in json.loads(body)["tracks"]] == ["tr0", "tr2"]
+    assert partial_etag != etag
+    # Neither the partial body nor its ETag replace the stored ones
+    assert await playlist_repo.get_playlist_etag("pl1") == etag
+    assert not await playlist_repo.redis_client.exists(
+        playlist_repo._representation_key("pl1")
+    )
+
+
+async def test_unversioned_record_is_stored_again_versioned(playlist_repo):
+    playlist = make_playlist("pl1", n_tracks=1)
+    track = playlist["tracks"][0]
+    record = {k: v for k, v in playlist.items() if k != "tracks"}
+    record["trackIds"] = [track["id"]]
+    entity = {k: v for k, v in track.items() if k != "album"}
+    entity["albumId"] = track["album"]["id"]
+    await playlist_repo.redis_client.mset_bytes(
+        {
+            playlist_repo._record_key("pl1"): json.dumps(record),
+            track_key(track["id"]): json.dumps(entity),
+            album_key(track["album"]["id"]): json.dumps(track["album"]),
+        }
+    )
+
+    loaded = await playlist_repo.get_playlist_by_id("pl1")
+
+    assert loaded["tracks"][0]["album"]["name"] == "Album 0"
+    stored = json.loads(
+        await playlist_repo.redis_client.get_bytes(playlist_repo._record_key("pl1"))
+    )
+    assert stored["trackKeys"][0].startswith("track:tr0:")
+    assert await playlist_repo.get_playlist_etag("pl1") is not None
+
+
+async def test_expired_body_is_compressed_once_per_variant(playlist_repo, monkeypatch):
+    await playlist_repo.store_playlist_by_id("pl1", make_playlist("pl1"))
+    stored, etag = await playlist_repo.get_playlist_representation("pl1", "br")
+    await expire_bodies(playlist_repo, "pl1")
+    calls = []
+    original = encoding.compress
+
+    def counting_compress(body, coding):
+        calls.append(coding)
+        return original(body, coding)
+
+    monkeypatch.setattr(encoding, "compress", counting_compress)
+
+    assert await playlist_repo.get_playlist_representation("pl1", "br") == (
+        stored,
+        etag,
+    )
+    # Each view's variants once, for the cache; the response reuses one
+    assert len(calls) == len(VIEWS) * len(encoding.ENCODINGS)
@@ -0,0 +1,62 @@
+import json
+
+from .conftest import make_playlist
+
+
+async def store_legacy(playlist_repo, playlist, duration_minutes=30) -> str:
+    """Store a playlist whole under its parameter key, as before pointers."""
+    key = playlist_repo._generated_playlist_key(
+        playlist["activity"], playlist["vibe"], duration_minutes
+    )
+    await playlist_repo.redis_client.set_bytes(key, json.dumps(playlist).encode())
+    return key
+
+
+async def test_parameter_key_stores_only_the_playlist_id(playlist_repo):
+    playlist = make_playlist("pl1")
+    await playlist_repo.store_playlist_by_id("pl1", playlist)
+
+    await playlist_repo.store_generated_playlist("working out", "upbeat", 30, "pl1")
+
+    key = playlist_repo._generated_playlist_key("working out", "upbeat", 30)
+    assert await playlist_repo.redis_client.get(key) == "pl1"
+    cached = await playlist_repo.get_generated_playlist("working out", "upbeat", 30)
+    assert cached["id"] == "pl1"
+    assert [t["id"] for t in cached["tracks"]] == ["tr0", "tr1", "tr2"]
+
+
+async def test_pointer_falls_back_to_record_when_body_expired(playlist_repo):
+    await playlist_repo.store_playlist_by_id("pl1", make_playlist("pl1"))
+    await playlist_repo.store_generated_playlist("working out", "upbeat", 30, "pl1")
+    await playlist_repo.redis_client.delete(*playlist_repo._representation_keys("pl1"))
+
+    cached = await playlist_repo.get_generated_playlist("working out", "upbeat", 30)
+
+    assert cached["id"] == "pl1"
+
+
+async def test_legacy_value_is_rewritten_as_pointer_on_read(playlist_repo):
+    key = await store_legacy(playlist_repo, make_playlist("pl1"))
+
+    cached = await playlist_repo.get_generated_playlist("working out", "upbeat", 30)
+
+    assert cached["id"] == "pl1"
+    assert await playlist_repo.redis_client.get(key) == "pl1"
+    assert await playlist_repo.get_playlist_by_id("pl1") is not None
+
+
+async def test_migration_rewrites_unread_legacy_values(playlist_repo):
+    legacy = [
+        await store_legacy(playlist_repo, make_playlist(f"pl{i}"), duration_minutes=i)
+        for i in range(5)
+    ]
+    await playlist_repo.store_playlist_by_id("pl9", make_playlist("pl9"))
+    await playlist_repo.store_generated_playlist("working out", "upbeat", 99, "pl9")
+
+    assert await playlist_repo.migrate_generated_playlists(batch_size=2) == 5
+
+    for i, key in enumerate(legacy):
+        assert await playlist_repo.redis_client.get(key) == f"pl{i}"
+        assert await playlist_repo.get_playlist_etag(f"pl{i}") is not None
+    # Already migrated, so running again finds nothing to do
+    assert await playlist_repo.migrate_generated_playlists() == 0
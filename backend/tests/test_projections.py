@@ -0,0 +1,111 @@
+import json
+
+import pytest
+
+from app.playlists.models import PlaylistResponse
+from app.playlists.projections import (
+    InvalidFieldsError,
+    parse_fields,
+    project,
+    render_views,
+    source_view,
+)
+
+from .conftest import make_playlist
+
+
+@pytest.fixture
+def views() -> dict[str, bytes]:
+    return render_views(PlaylistResponse(**make_playlist()))
+
+
+def test_parse_fields_splits_playlist_and_track_fields():
+    assert parse_fields("name, tracks.name,tracks.artist") == (
+        ["name", "tracks"],
+        ["name", "artist"],
+    )
+    assert parse_fields("id,tracks") == (["id", "tracks"], None)
+
+
+@pytest.mark.parametrize("fields", ["nope", "tracks.nope", " , "])
+def test_parse_fields_rejects_unknown_or_empty_selections(fields):
+    with pytest.raises(InvalidFieldsError):
+        parse_fields(fields)
+
+
+@pytest.mark.parametrize(
+    ("fields", "view"),
+    [
+        ("name", "summary"),
+        ("tracks.name,tracks.coverUrl", "summary"),
+        ("tracks", "full"),
+        ("tracks.album", "full"),
+        ("tracks.album,tracks.coverUrl", "full"),
+    ],
+)
+def test_source_view_is_the_smallest_covering_view(fields, view):
+    assert source_view(*parse_fields(fields)) == view
+
+
+def test_summary_fields_are_derived_from_the_full_view(views):
+    playlist_fields, track_fields = parse_fields("tracks.album,tracks.coverUrl")
+    projected = json.loads(project(views["full"], playlist_fields, track_fields))
+
+    assert [track["coverUrl"] for track in projected["tracks"]] == [
+        "https://img/0/64",
+        "https://img/1/64",
+        "https://img/0/64",
+    ]
+    assert all(track["album"]["id"] for track in projected["tracks"])
+
+
+def test_projection_matches_the_summary_view(views):
+    summary = json.loads(views["summary"])
+    playlist_fields, track_fields = parse_fields("name,tracks.id,tracks.coverUrl")
+
+    from_full = json.loads(project(views["full"], playlist_fields, track_fields))
+    from_summary = json.loads(project(views["summary"], playlist_fields, track_fields))
+
+    assert from_full == from_summary
+    assert from_full["tracks"][0] == {
+        "id": summary["tracks"][0]["id"],
+        "coverUrl": summary["tracks"][0]["coverUrl"],
+    }
+
+
+async def test_get_playlist_with_mixed_fields(api, playlist_repo):
+    await playlist_repo.store_playlist_by_id("pl1", make_playlist("pl1"))
+
+    response = await api.get(
+        "/api/v1/playlist/pl1", params={"fields": "name,tracks.album,tracks.coverUrl"}
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body) == {"name", "tracks"}
+    assert set(body["tracks"][0]) == {"album", "coverUrl"}
+    assert body["tracks"][0]["coverUrl"] == "https://img/0/64"
+
+
+async def test_get_playlist_with_unknown_fields_is_rejected(api):
+    response = await api.get("/api/v1/playlist/pl1", params={"fields": "nope"})
+
+    assert response.status_code == 400
+
+
+async def test_batch_fields_apply_to_every_playlist(api, playlist_repo):
+    for playlist_id in ("pl1", "pl2"):
+        await playlist_repo.store_playlist_by_id(
+            playlist_id, make_playlist(playlist_id)
+        )
+
+    response = await api.get(
+        "/api/v1/playlists", params={"ids": "pl1,nope,pl2", "fields": "id,tracks.name"}
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [p["id"] for p in body["playlists"]] == ["pl1", "pl2"]
+    assert all(set(p) == {"id", "tracks"} for p in body["playlists"])
+    assert set(body["playlists"][0]["tracks"][0]) == {"name"}
+    assert body["missing"] == ["nope"]
@@ -0,0 +1,218 @@
+import json
+
+import httpx
+import pytest
+from starlette.requests import Request
+
+from app import dependencies
+from app.main import app
+from app.playlists import (
+    AdmissionConfig,
+    AdmissionController,
+    AdmissionRejected,
+    PlaylistService,
+)
+from app.ratelimit import CostExceedsBurst, RateLimitConfig, RateLimited, RateLimiter
+from app.ratelimit.config import EndpointLimit
+
+
+def _request(client_ip: str = "10.0.0.1", **headers: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+            "client": (client_ip, 1234),
+        }
+    )
+
+
+def _limiter(redis_client, **overrides) -> RateLimiter:
+    config = RateLimitConfig(read=EndpointLimit(per_minute=60, burst=3), **overrides)
+    return RateLimiter(config, redis_client)
+
+
+async def test_burst_is_allowed_then_limited(redis_client):
+    rate_limit = _limiter(redis_client).for_client("read", _request())
+
+    for _ in range(3):
+        await rate_limit.charge(1)
+    with pytest.raises(RateLimited) as exc_info:
+        await rate_limit.charge(1)
+
+    assert exc_info.value.retry_after >= 1
+
+
+async def test_clients_have_separate_budgets(redis_client):
+    limiter = _limiter(redis_client)
+    await limiter.for_client("read", _request("10.0.0.1")).charge(3)
+
+    assert await limiter.for_client("read", _request("10.0.0.2")).try_charge(1) is None
+    assert await limiter.for_client("read", _request("10.0.0.1")).try_charge(1)
+
+
+async def test_charge_above_the_burst_is_rejected(redis_client):
+    rate_limit = _limiter(redis_client).for_client("read", _request())
+
+    with pytest.raises(CostExceedsBurst):
+        await rate_limit.try_charge(4)
+    # Nothing was charged
+    assert await rate_limit.try_charge(3) is None
+
+
+async def test_disabled_limiter_allows_everything(redis_client):
+    rate_limit = _limiter(redis_client, enabled=False).for_client("read", _request())
+
+    for _ in range(10):
+        await rate_limit.charge(1)
+
+
+def test_forwarded_for_is_only_trusted_when_configured(redis_client):
+    request = _request("10.0.0.254", **{"X-Forwarded-For": "203.0.113.7, 10.0.0.254"})
+
+    assert _limiter(redis_client).client_id(request) == "ip:10.0.0.254"
+    trusting = _limiter(redis_client, trust_forwarded_for=True)
+    assert trusting.client_id(request) == "ip:203.0.113.7"
+
+
+def test_listed_api_keys_get_their_own_budget(redis_client):
+    limiter = _limiter(redis_client, api_keys=["secret"])
+
+    assert limiter.client_id(_request(**{"X-API-Key": "secret"})).startswith("key:")
+    assert limiter.client_id(_request(**{"X-API-Key": "other"})) == "ip:10.0.0.1"
+
+
+async def test_read_endpoint_answers_429_with_retry_after(api, redis_client):
+    limiter = _limiter(redis_client)
+    app.dependency_overrides[dependencies.get_rate_limiter] = lambda: limiter
+
+    statuses = [(await api.get("/api/v1/playlist/nope")).status_code for _ in range(4)]
+    limited = await api.get("/api/v1/playlist/nope")
+
+    assert statuses[:3] == [404, 404, 404]
+    assert limited.status_code == 429
+    assert int(limited.headers["Retry-After"]) >= 1
+
+
+@pytest.fixture
+async def generate_api(bench_env):
+    """
+    An HTTP client for the app generating against the upstream stand-ins,
+    with a rate limiter each test configures through bench_env.rate_limiter.
+    """
+    bench_env.rate_limiter = RateLimiter(RateLimitConfig(), bench_env.redis_client)
+    overrides = {
+        dependencies.get_redis_client: lambda: bench_env.redis_client,
+        dependencies.get_spotify_client: lambda: bench_env.spotify_client,
+        dependencies.get_reccobeats_client: lambda: bench_env.reccobeats_client,
+        dependencies.get_negative_cache: lambda: bench_env.negative_cache,
+        dependencies.get_entity_cache: lambda: bench_env.entity_cache,
+        dependencies.get_rate_limiter: lambda: bench_env.rate_limiter,
+    }
+    app.dependency_overrides.update(overrides)
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            yield client
+    finally:
+        for dependency in overrides:
+            app.dependency_overrides.pop(dependency, None)
+
+
+def _batch(n: int) -> dict:
+    return {
+        "requests": [
+            {"activity": "working out", "vibe": "upbeat", "duration": 10 + i}
+            for i in range(n)
+        ]
+    }
+
+
+def _lines(response: httpx.Response) -> list[dict]:
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+async def test_cold_batch_passes_default_limits(generate_api):
+    response = await generate_api.post("/api/v1/generate-playlists", json=_batch(5))
+
+    assert response.status_code == 200
+    lines = _lines(response)
+    assert sorted(line["index"] for line in lines) == list(range(5))
+    assert all("playlist" in line for line in lines)
+
+
+async def test_full_cold_batch_fits_the_default_burst(redis_client):
+    rate_limit = RateLimiter(RateLimitConfig(), redis_client).for_client(
+        "batch", _request()
+    )
+
+    await rate_limit.charge_batch(0, 25)
+
+
+async def test_batch_over_its_limit_answers_429_before_streaming(
+    generate_api, bench_env
+):
+    bench_env.rate_limiter = RateLimiter(
+        RateLimitConfig(batch=EndpointLimit(per_minute=60, burst=25)),
+        bench_env.redis_client,
+    )
+
+    first = await generate_api.post("/api/v1/generate-playlists", json=_batch(5))
+    # Cached now, so it costs 5 cache hits on top of the 20 for cold ones
+    cached = await generate_api.post("/api/v1/generate-playlists", json=_batch(5))
+    limited = await generate_api.post("/api/v1/generate-playlists", json=_batch(5))
+
+    assert first.status_code == 200
+    assert cached.status_code == 200
+    assert all("playlist" in line for line in _lines(cached))
+    assert limited.status_code == 429
+    assert int(limited.headers["Retry-After"]) >= 1
+
+
+async def test_batch_costing_more_than_the_burst_answers_400(generate_api, bench_env):
+    bench_env.rate_limiter = RateLimiter(
+        RateLimitConfig(batch=EndpointLimit(per_minute=60, burst=10)),
+        bench_env.redis_client,
+    )
+
+    response = await generate_api.post("/api/v1/generate-playlists", json=_batch(5))
+
+    assert response.status_code == 400
+    assert "burst of 10" in response.json()["detail"]
+
+
+async def test_refund_gives_units_back(redis_client):
+    rate_limit = _limiter(redis_client).for_client("read", _request())
+    await rate_limit.charge(3)
+
+    await rate_limit.refund(2)
+
+    assert await rate_limit.try_charge(2) is None
+    assert await rate_limit.try_charge(1)
+
+
+async def test_generation_shed_by_admission_is_refunded(bench_env):
+    limiter = RateLimiter(
+        RateLimitConfig(generate=EndpointLimit(per_minute=60, burst=10)),
+        bench_env.redis_client,
+    )
+    rate_limit = limiter.for_client("generate", _request())
+    admission = AdmissionController(AdmissionConfig(max_concurrent=1, max_queue=0))
+    service = PlaylistService(
+        bench_env.spotify_client,
+        bench_env.reccobeats_client,
+        bench_env.repo(),
+        admission,
+    )
+
+    async with admission.admit():
+        with pytest.raises(AdmissionRejected):
+            await service.create_activity_playlist(
+                "working out", "upbeat", 10, cold_gate=rate_limit
+            )
+
+    # The cold generation's 9 extra units came back
+    assert await rate_limit.try_charge(10) is None
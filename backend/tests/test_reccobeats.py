@@ -0,0 +1,135 @@
+import asyncio
+import time
+from collections import deque
+
+import pytest
+
+from app.integrations.reccobeats import ReccoBeatsClient, ReccoBeatsConfig
+from bench.fakes import FakeReccoBeats, FaultProfile
+
+
+class ScriptedFaults(FaultProfile):
+    """Delays and failures for requests in the order they arrive, then none."""
+
+    def __init__(self):
+        super().__init__()
+        self.script: deque[tuple[float, bool]] = deque()
+
+    def sample(self) -> tuple[float, bool]:
+        return self.script.popleft() if self.script else (0.0, False)
+
+
+@pytest.fixture
+def upstream():
+    upstream = FakeReccoBeats(ScriptedFaults(), unknown_rate=0).start()
+    yield upstream
+    upstream.stop()
+
+
+def hedging_client(upstream, delay: float = 0.05, **overrides) -> ReccoBeatsClient:
+    """A client that hedges after delay, its latency window already filled."""
+    config = ReccoBeatsConfig(
+        base_url=upstream.base_url,
+        timeout=2,
+        hedge_enabled=True,
+        hedge_min_samples=1,
+        **overrides,
+    )
+    client = ReccoBeatsClient(config)
+    client._hedge_stats["metadata"].attempt_latency.record(delay)
+    return client
+
+
+def metadata(client: ReccoBeatsClient) -> tuple[int, bytes]:
+    return client._get("metadata", "/tracks/spotify/abc")
+
+
+def test_fast_response_is_not_hedged(upstream):
+    client = hedging_client(upstream, delay=1.0)
+
+    status, _ = metadata(client)
+
+    assert status == 200
+    assert upstream.calls == {"metadata": 1}
+    assert client._hedge_stats["metadata"].hedges_sent == 0
+
+
+def test_hedge_answers_for_a_slow_primary(upstream):
+    client = hedging_client(upstream)
+    upstream.faults.script.append((1.0, False))
+
+    start = time.perf_counter()
+    status, body = metadata(client)
+
+    assert time.perf_counter() - start < 0.5
+    assert status == 200 and b"rb-abc" in body
+    stats = client._hedge_stats["metadata"]
+    assert (stats.hedges_sent, stats.hedges_won) == (1, 1)
+    # The loser's connection still has its response coming, so it's dropped
+    assert client._local.conn is None
+
+
+def test_primary_answering_first_beats_a_slower_hedge(upstream):
+    client = hedging_client(upstream)
+    upstream.faults.script.extend([(0.2, False), (1.0, False)])
+
+    status, _ = metadata(client)
+
+    assert status == 200
+    stats = client._hedge_stats["metadata"]
+    assert (stats.hedges_sent, stats.hedges_won) == (1, 0)
+    # The primary's connection is read to the end, so it's kept alive
+    assert client._local.conn is not None
+
+
+def test_failed_hedge_waits_for_the_primary(upstream):
+    client = hedging_client(upstream)
+    upstream.faults.script.extend([(0.3, False), (0.0, True)])
+
+    status, _ = metadata(client)
+
+    assert status == 200
+    assert client._hedge_stats["metadata"].hedges_won == 0
+
+
+def test_primary_timing_out_after_hedge_sent_raises(upstream):
+    client = hedging_client(upstream)
+    upstream.faults.script.extend([(3.0, False), (3.0, False)])
+
+    with pytest.raises(TimeoutError):
+        metadata(client)
+
+    assert client._hedge_stats["metadata"].hedges_sent == 1
+
+
+def test_exhausted_budget_sends_no_hedge(upstream):
+    client = hedging_client(upstream, hedge_budget_burst=0)
+    upstream.faults.script.append((0.2, False))
+
+    status, _ = metadata(client)
+
+    assert status == 200
+    stats = client._hedge_stats["metadata"]
+    assert (stats.hedges_sent, stats.budget_exhausted) == (0, 1)
+    assert upstream.calls == {"metadata": 1}
+
+
+async def test_metadata_fetch_leaves_the_event_loop_running(upstream, playlist_repo):
+    client = ReccoBeatsClient(ReccoBeatsConfig(base_url=upstream.base_url))
+    upstream.faults.script.append((0.3, False))
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker = asyncio.create_task(tick())
+    fetched = await playlist_repo.get_or_fetch_reccobeats_metadata(
+        ["abc"], client.fetch_metadata_batch
+    )
+    ticker.cancel()
+
+    assert fetched["abc"]["reccobeats_id"] == "rb-abc"
+    assert ticks >= 10
@@ -0,0 +1,188 @@
+import time
+
+import fakeredis
+import pytest
+from fakeredis.aioredis import FakeAsyncRedisConnection
+from prometheus_client import REGISTRY
+from redis.exceptions import ConnectionError
+
+from app.db.redis import RedisClient
+from app.db.redis.client import InstrumentedConnectionPool
+from app.db.redis.config import RedisConfig
+from app.db.redis.sharding import HashRing
+
+OLD = "redis://old:6379"
+NEW = "redis://new:6379"
+
+
+@pytest.fixture
+async def scaled_out():
+    """
+    A sharded client after scaling out from OLD to OLD + NEW, and a client
+    on each node's fakeredis server to inspect what is stored where.
+    """
+    servers = {OLD: fakeredis.FakeServer(), NEW: fakeredis.FakeServer()}
+    config = RedisConfig(
+        url=OLD, mode="sharded", shard_urls=[OLD, NEW], previous_urls=[OLD]
+    )
+    client = RedisClient(OLD, config)
+    client._shards = [
+        fakeredis.FakeAsyncRedis(server=servers[url]) for url in config.shard_urls
+    ]
+    client._ring = HashRing(config.shard_urls)
+    client._previous = [fakeredis.FakeAsyncRedis(server=servers[OLD])]
+    client._previous_ring = HashRing(config.previous_urls)
+    nodes = {
+        url: fakeredis.FakeAsyncRedis(server=server) for url, server in servers.items()
+    }
+    yield client, nodes
+    await client.disconnect()
+
+
+def moved_key(client: RedisClient, prefix: str) -> str:
+    """A key that NEW owns after the scale-out."""
+    for i in range(1000):
+        key = f"{prefix}{i}"
+        if client.config.shard_urls[client._ring.shard_for(key)] == NEW:
+            return key
+    raise AssertionError("no key moved to the new shard")
+
+
+async def test_string_key_is_copied_from_previous_owner(scaled_out):
+    client, nodes = scaled_out
+    key = moved_key(client, "playlist_by_id:")
+    await nodes[OLD].set(key, b"stored")
+
+    assert await client.get_bytes(key) == b"stored"
+    assert await nodes[NEW].get(key) == b"stored"
+
+
+async def test_sorted_set_is_merged_from_previous_owner(scaled_out):
+    client, nodes = scaled_out
+    key = moved_key(client, "negative:")
+    await nodes[OLD].zadd(key, {"a": 1.0, "b": 2.0})
+    # Written on the new owner after the scale-out; its score wins
+    await nodes[NEW].zadd(key, {"b": 5.0})
+
+    assert await client.zmscore(key, "a", "b", "c") == [1.0, 5.0, None]
+    assert await nodes[NEW].zrange(key, 0, -1, withscores=True) == [
+        (b"a", 1.0),
+        (b"b", 5.0),
+    ]
+
+
+async def test_sorted_set_is_merged_once_per_worker(scaled_out):
+    client, nodes = scaled_out
+    key = moved_key(client, "playlist_last_read")
+    await nodes[OLD].zadd(key, {"pl1": 1.0})
+
+    await client.zrem(key, "pl1")
+    # Removed after the merge, so it must not come back from the old node
+    assert await client.zrangebyscore(key, "-inf", "+inf") == []
+
+
+async def test_scan_covers_every_shard(scaled_out):
+    client, nodes = scaled_out
+    await nodes[OLD].set("playlist_by_id:{a}", b"1")
+    await nodes[NEW].set("playlist_by_id:{b}", b"1")
+    await nodes[NEW].set("other", b"1")
+
+    keys = [key async for key in client.scan("playlist_by_id:*", count=1)]
+
+    assert sorted(keys) == ["playlist_by_id:{a}", "playlist_by_id:{b}"]
+
+
+def test_pool_stats_reports_each_node():
+    client = RedisClient(OLD)
+    client._pools = [
+        InstrumentedConnectionPool.from_url(url, max_connections=10)
+        for url in (OLD, NEW)
+    ]
+
+    stats = client.pool_stats()
+
+    assert stats["max_connections"] == 20
+    assert stats["in_use"] == 0
+    assert set(stats["nodes"]) == {"old:6379", "new:6379"}
+    assert stats["nodes"]["old:6379"]["max_connections"] == 10
+
+
+def test_pool_stats_before_connect_is_none():
+    assert RedisClient(OLD).pool_stats() is None
+
+
+@pytest.fixture
+async def with_replica():
+    """
+    A single-node client with one replica that never catches up, so reads
+    show which node answered.
+    """
+    config = RedisConfig(url=OLD, replica_urls=[NEW])
+    client = RedisClient(OLD, config)
+    client._redis = fakeredis.FakeAsyncRedis()
+    replica = fakeredis.FakeAsyncRedis()
+    client._replicas = {NEW: replica}
+    client._fresh_replicas = [replica]
+    client._replicas_checked_at = time.monotonic()
+    yield client, replica
+    await client.disconnect()
+
+
+async def test_reads_go_to_replica(with_replica):
+    client, replica = with_replica
+    await replica.set("key", b"replica")
+
+    assert await client.get_bytes("key") == b"replica"
+
+
+async def test_recent_write_is_read_from_primary(with_replica):
+    client, replica = with_replica
+    await replica.set("key", b"stale")
+
+    await client.set_bytes("key", b"fresh")
+
+    assert await client.get_bytes("key") == b"fresh"
+
+
+def pool_metrics() -> tuple[float, float, float]:
+    """Pool timeouts so far, and the count and sum of observed waits."""
+    return (
+        REGISTRY.get_sample_value("redis_pool_timeouts_total"),
+        REGISTRY.get_sample_value("redis_pool_wait_seconds_count"),
+        REGISTRY.get_sample_value("redis_pool_wait_seconds_sum"),
+    )
+
+
+async def test_pool_timeout_is_counted_with_its_wait():
+    pool = InstrumentedConnectionPool(
+        connection_class=FakeAsyncRedisConnection,
+        server=fakeredis.FakeServer(),
+        max_connections=1,
+        timeout=0.05,
+    )
+    held = await pool.get_connection()
+    timeouts, waits, waited = pool_metrics()
+
+    with pytest.raises(ConnectionError):
+        await pool.get_connection()
+
+    after = pool_metrics()
+    assert (after[0] - timeouts, after[1] - waits) == (1, 1)
+    assert after[2] - waited >= 0.05
+    await pool.release(held)
+    await pool.disconnect()
+
+
+async def test_connect_failure_is_not_a_pool_timeout():
+    # Nothing listens on port 1, so connecting fails once a slot is taken
+    pool = InstrumentedConnectionPool.from_url(
+        "redis://127.0.0.1:1", max_connections=1, timeout=5
+    )
+    timeouts, waits, _ = pool_metrics()
+
+    with pytest.raises(ConnectionError):
+        await pool.get_connection()
+
+    after = pool_metrics()
+    assert (after[0] - timeouts, after[1] - waits) == (0, 1)
+    await pool.disconnect()
@@ -0,0 +1,95 @@
+import httpx
+import pytest
+
+from app import dependencies
+from app.main import app
+from app.ratelimit import RateLimitConfig, RateLimiter
+
+WARM = {"activity": "working out", "vibe": "upbeat", "duration": 10}
+COLD = {"activity": "studying", "vibe": "calm", "duration": 20}
+
+
+@pytest.fixture
+async def outage_api(bench_env):
+    """
+    An HTTP client for the app generating against the upstream stand-ins,
+    whose Spotify client tests disconnect with outage().
+    """
+    overrides = {
+        dependencies.get_redis_client: lambda: bench_env.redis_client,
+        dependencies.get_spotify_client: lambda: bench_env.spotify_client,
+        dependencies.get_reccobeats_client: lambda: bench_env.reccobeats_client,
+        dependencies.get_negative_cache: lambda: bench_env.negative_cache,
+        dependencies.get_entity_cache: lambda: bench_env.entity_cache,
+        dependencies.get_rate_limiter: lambda: RateLimiter(
+            RateLimitConfig(enabled=False), bench_env.redis_client
+        ),
+    }
+    app.dependency_overrides.update(overrides)
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            yield client
+    finally:
+        for dependency in overrides:
+            app.dependency_overrides.pop(dependency, None)
+        await bench_env.spotify_client.close()
+
+
+def outage(spotify_client, recovers_after: int | None = None) -> list[int]:
+    """
+    Disconnect a Spotify client so its reconnects fail, or succeed from the
+    given attempt on. Returns the list of attempts made.
+    """
+    session = spotify_client.sp, spotify_client.user_id
+    spotify_client.sp = spotify_client.user_id = None
+    attempts = []
+
+    async def connect() -> bool:
+        attempts.append(len(attempts) + 1)
+        if recovers_after is not None and len(attempts) >= recovers_after:
+            spotify_client.sp, spotify_client.user_id = session
+            return True
+        return False
+
+    spotify_client.connect = connect
+    return attempts
+
+
+async def test_cached_generation_is_served_while_spotify_is_down(outage_api, bench_env):
+    warm = await outage_api.post("/api/v1/generate-playlist", json=WARM)
+    assert warm.status_code == 200
+    outage(bench_env.spotify_client)
+
+    response = await outage_api.post("/api/v1/generate-playlist", json=WARM)
+
+    assert response.status_code == 200
+    assert response.json()["id"] == warm.json()["id"]
+
+
+async def test_cold_generation_fails_fast_while_spotify_is_down(outage_api, bench_env):
+    bench_env.spotify_client.config.reconnect_initial_backoff_seconds = 30
+    attempts = outage(bench_env.spotify_client)
+
+    response = await outage_api.post("/api/v1/generate-playlist", json=COLD)
+
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+    # Reconnecting in the background, once, however many requests arrive
+    await outage_api.post("/api/v1/generate-playlist", json=COLD)
+    assert bench_env.spotify_client.is_reconnecting()
+    assert attempts == [1]
+
+
+async def test_reconnects_in_the_background_with_backoff(bench_env):
+    spotify_client = bench_env.spotify_client
+    spotify_client.config.reconnect_initial_backoff_seconds = 0.01
+    attempts = outage(spotify_client, recovers_after=3)
+
+    spotify_client.ensure_reconnecting()
+    await spotify_client._reconnect_task
+
+    assert attempts == [1, 2, 3]
+    assert spotify_client.is_connected()
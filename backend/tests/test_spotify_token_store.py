@@ -0,0 +1,95 @@
+import asyncio
+import threading
+import time
+
+from app.integrations.spotify import RedisTokenStore, SharedTokenManager
+from app.integrations.spotify.token_store import LOCK_KEY, TOKEN_KEY
+
+
+def token(name: str, expires_in: float = 3600) -> dict:
+    return {
+        "access_token": f"access-{name}",
+        "refresh_token": f"refresh-{name}",
+        "expires_at": int(time.time() + expires_in),
+    }
+
+
+class FakeOAuth:
+    """Stands in for spotipy's SpotifyOAuth, counting refreshes."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.refreshed_with: list[str] = []
+        self._lock = threading.Lock()
+
+    def refresh_access_token(self, refresh_token: str) -> dict:
+        time.sleep(self.delay)
+        with self._lock:
+            self.refreshed_with.append(refresh_token)
+            return token(f"new{len(self.refreshed_with)}")
+
+
+def manager(redis_client, oauth: FakeOAuth, **kwargs) -> SharedTokenManager:
+    return SharedTokenManager(
+        RedisTokenStore(redis_client), oauth, FakeOAuth(), lock_ttl_seconds=2, **kwargs
+    )
+
+
+async def test_expired_shared_token_is_refreshed_and_published(redis_client):
+    await RedisTokenStore(redis_client).save(token("old", expires_in=-60))
+    oauth = FakeOAuth()
+    tokens = manager(redis_client, oauth)
+
+    assert await tokens.start()
+    await tokens.close()
+
+    assert oauth.refreshed_with == ["refresh-old"]
+    assert tokens.get_access_token() == "access-new1"
+    shared = await redis_client.get_json(TOKEN_KEY)
+    assert shared["access_token"] == "access-new1"
+    # Released once the refreshed token is published
+    assert not await redis_client.exists(LOCK_KEY)
+
+
+async def test_only_one_worker_refreshes_under_the_lock(redis_client):
+    await RedisTokenStore(redis_client).save(token("old", expires_in=-60))
+    oauth = FakeOAuth(delay=0.1)
+    workers = [manager(redis_client, oauth) for _ in range(3)]
+    for worker in workers:
+        worker.token_info = token("old", expires_in=-60)
+
+    await asyncio.gather(*(worker._refresh_if_due() for worker in workers))
+
+    assert oauth.refreshed_with == ["refresh-old"]
+    assert {worker.get_access_token() for worker in workers} == {"access-new1"}
+
+
+async def test_waits_for_the_worker_holding_the_lock(redis_client):
+    store = RedisTokenStore(redis_client)
+    await store.save(token("old", expires_in=-60))
+    holder = await store.acquire_refresh_lock(30)
+    oauth = FakeOAuth()
+    tokens = manager(redis_client, oauth)
+    tokens.token_info = token("old", expires_in=-60)
+
+    async def other_worker_refreshes():
+        await asyncio.sleep(0.2)
+        await store.save(token("theirs"))
+        await store.release_refresh_lock(holder)
+
+    await asyncio.gather(tokens._refresh_if_due(), other_worker_refreshes())
+
+    assert oauth.refreshed_with == []
+    assert tokens.get_access_token() == "access-theirs"
+
+
+async def test_fresh_shared_token_is_picked_up_without_refreshing(redis_client):
+    await RedisTokenStore(redis_client).save(token("shared"))
+    oauth = FakeOAuth()
+    tokens = manager(redis_client, oauth)
+    tokens.token_info = token("mine", expires_in=60)
+
+    await tokens._refresh_if_due()
+
+    assert oauth.refreshed_with == []
+    assert tokens.get_access_token() == "access-shared"
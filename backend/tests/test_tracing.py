@@ -0,0 +1,57 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+from app.observability import tracing
+from app.observability.tracing import BatchExporter, Span, Tracer, TracingMiddleware
+
+
+class ListExporter:
+    def __init__(self):
+        self.spans: list[Span] = []
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    exporter = ListExporter()
+    monkeypatch.setattr(tracing, "_tracer", Tracer(exporter))
+    return exporter
+
+
+def _streaming_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(TracingMiddleware)
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                await asyncio.sleep(0.05)
+                yield f"{i}\n"
+
+        return StreamingResponse(chunks())
+
+    return app
+
+
+async def test_root_span_covers_the_streamed_body(exporter):
+    transport = httpx.ASGITransport(app=_streaming_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/stream")
+
+    assert response.text == "0\n1\n2\n"
+    [span] = exporter.spans
+    assert span.name == "GET /stream"
+    assert span.attributes["http_status"] == 200
+    assert (span.end_ns - span.start_ns) / 1e9 >= 0.15
+
+
+def test_batch_exporter_requires_flush():
+    with pytest.raises(TypeError):
+        BatchExporter()
@@ -1,6 +1,6 @@
 import { useMutation, useQuery } from '@tanstack/react-query'
 import { apiClient } from '@/lib/api'
-import type { PlaylistRequest, PlaylistResponse } from '@/types/api'
+import type { PlaylistRequest, PlaylistResponse, PlaylistView } from '@/types/api'
 
 export const useGeneratePlaylist = () => {
   return useMutation<PlaylistResponse, Error, PlaylistRequest>({
@@ -22,4 +22,18 @@ export const useGetPlaylist = (playlistId: string, enabled: boolean = true) => {
     staleTime: 5 * 60 * 1000, // 5 minutes
     retry: 1, // Only retry once for shared playlists
   })
-}
\ No newline at end of file
+}
+
+// Resolve several saved playlists in one request (the summary view skips album data)
+export const useGetPlaylists = (
+  playlistIds: string[],
+  view: PlaylistView = 'summary',
+  enabled: boolean = true
+) => {
+  return useQuery({
+    queryKey: ['playlist-batch', view, playlistIds],
+    queryFn: () => apiClient.getPlaylistsByIds(playlistIds, view),
+    enabled: enabled && playlistIds.length > 0,
+    staleTime: 5 * 60 * 1000, // 5 minutes
+  })
+}
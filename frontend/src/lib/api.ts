@@ -1,4 +1,9 @@
-import type { PlaylistRequest, PlaylistResponse } from '@/types/api'
+import type {
+  PlaylistBatchResponse,
+  PlaylistRequest,
+  PlaylistResponse,
+  PlaylistView,
+} from '@/types/api'
 
 const API_BASE_URL = import.meta.env?.VITE_API_URL || 'http://localhost:8000'
 
@@ -39,6 +44,14 @@ class ApiClient {
   async getPlaylistById(playlistId: string): Promise<PlaylistResponse> {
     return this.request<PlaylistResponse>(`${this.apiRouteV1}/playlist/${playlistId}`)
   }
+
+  async getPlaylistsByIds(
+    playlistIds: string[],
+    view: PlaylistView = 'summary'
+  ): Promise<PlaylistBatchResponse> {
+    const params = new URLSearchParams({ ids: playlistIds.join(','), view })
+    return this.request<PlaylistBatchResponse>(`${this.apiRouteV1}/playlists?${params}`)
+  }
 }
 
 export const apiClient = new ApiClient()
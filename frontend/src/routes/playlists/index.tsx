@@ -5,6 +5,7 @@ import { Input } from '@/components/ui/input'
 import { ArrowLeft, Search, Music } from 'lucide-react'
 import { Link } from '@tanstack/react-router'
 import { PlaylistSummaryCard } from '@/components/PlaylistSummaryCard'
+import { useGetPlaylists } from '@/hooks/api/usePlaylist'
 import { usePlaylistStorage } from '@/hooks/usePlaylistStorage'
 import { useState } from 'react'
 
@@ -16,8 +17,16 @@ function PlaylistsIndex() {
   const { playlists, removePlaylist, hasPlaylists } = usePlaylistStorage()
   const [searchTerm, setSearchTerm] = useState('')
 
+  // Refresh every saved playlist in one request, keeping the stored copy for any the server no longer has
+  const { data: batch } = useGetPlaylists(playlists.map(playlist => playlist.id))
+  const summaries = new Map(batch?.playlists.map(summary => [summary.id, summary]))
+  const currentPlaylists = playlists.map(playlist => {
+    const summary = summaries.get(playlist.id)
+    return summary ? { ...playlist, ...summary, tracks: playlist.tracks } : playlist
+  })
+
   // Filter playlists based on search term
-  const filteredPlaylists = playlists.filter(
+  const filteredPlaylists = currentPlaylists.filter(
     playlist =>
       playlist.name.toLowerCase().includes(searchTerm.toLowerCase()) ||
       playlist.activity.toLowerCase().includes(searchTerm.toLowerCase()) ||
@@ -65,6 +65,27 @@ export interface Track {
   previewUrl?: string
 }
 
+// Slim track without the album object, returned by the summary view
+export interface TrackSummary {
+  id: string
+  name: string
+  artist: string
+  duration: number
+  spotifyUrl: string
+  coverUrl?: string | null
+}
+
+export interface PlaylistSummary extends Omit<PlaylistResponse, 'tracks'> {
+  tracks: TrackSummary[]
+}
+
+export type PlaylistView = 'full' | 'summary'
+
+export interface PlaylistBatchResponse<T = PlaylistResponse | PlaylistSummary> {
+  playlists: T[]
+  missing: string[]
+}
+
 export interface ApiError {
   message: string
   code?: string